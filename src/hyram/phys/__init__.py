@@ -8,8 +8,10 @@ If not, see https://www.gnu.org/licenses/.
 
 from ._jet import Jet
 from ._indoor_release import IndoorRelease
-from ._flame import Flame
+from ._flame import Flame, RadiationSource
 from ._comps import Fluid, Orifice, NozzleFlow, Source, Enclosure, Vent
 from ._unconfined_overpressure import BST_method, TNT_method, Bauwens_method
 from ._fuel_props import FuelProperties
+from ._therm import property_cache, combustion_cache, combustion_registry, TabulatedWrapper
+from ._kernels import compiled_kernels
 from . import api
@@ -6,20 +6,29 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 
+import multiprocessing as mp
 import warnings
+from dataclasses import dataclass
+from functools import lru_cache
 
 import numpy as np
 from scipy import constants as const
 from scipy import integrate, interpolate, optimize
 
 from ._jet import DevelopingFlow
-from ._therm import Combustion
+from ._therm import combustion_registry
 from ._comps import Fluid
 from ._plots import plot_sliced_contour, plot_contour
-from ._utils import get_distance_to_effect
+from ._utils import get_distance_to_effect, get_effect_field
+from . import _kernels
+from ._kernels import compiled_kernels
 from ..utilities.custom_warnings import PhysicsWarning
 
 
+# maximum number of source-observer pairs evaluated at once by RadiationSource.flux
+_QRAD_MAX_ELEMENTS = 2**20
+
+
 class Flame:
     def __init__(self, fluid, orifice, ambient, mdot=None,
                  theta0=0, x0=0, y0=0,
@@ -29,7 +38,7 @@ class Flame:
                  T_establish_min=-1, verbose=False,
                  Smax=np.inf, dS=None, tol=1e-6,
                  numB=5, n_pts_integral=100,
-                 wind_speed = 0, developing_flow=None):
+                 wind_speed = 0, developing_flow=None, length_only=False):
         '''
         class for calculating the characteristics of a 2-D flame, without wind
         see Ekoto et al. International Journal of Hydrogen Energy, 39, 2014 (20570-20577)
@@ -62,7 +71,8 @@ class Flame:
             Birch2 - conserve_momentum = True, T = T0
             Molkov - conserve_momentum = False, T = 'solve_energy'
         chem : chemistry class (see hc_therm for usage), optional
-            if none given, will initialize new chemistry class
+            if none given (or not at ambient conditions), the shared chemistry class
+            for ambient conditions is used (see combustion_registry)
         lamf : float
             spreading ratio for mixture fraction Gaussian profile
         lamv : float
@@ -91,6 +101,9 @@ class Flame:
             ambient wind speed (m/s)
         developing_flow: DevelopingFlow object, optional
             speeds up calculation by only initialzing the object once
+        length_only: bool, optional
+            if True, the flame is not integrated - the length and radiant power come from the correlations
+            and the flame is estimated as a straight line (see solve_straight_line), for quick screening
         '''
         self.x, self.y, self.S = [], [], []
         if developing_flow is None:
@@ -114,7 +127,10 @@ class Flame:
         self.chem = chem
         self.verbose = verbose
         self.wind_speed = wind_speed
-        self.solve(Smax, dS, tol, numB, n_pts_integral)
+        if length_only:
+            self.solve_straight_line()
+        else:
+            self.solve(Smax, dS, tol, numB, n_pts_integral)
 
     @classmethod
     def from_developed_flow(cls, developing_flow,
@@ -123,7 +139,7 @@ class Flame:
                             verbose=False,
                             Smax=np.inf, dS=None, tol=1e-6,
                             numB=5, n_pts_integral=100,
-                            wind_speed = 0):
+                            wind_speed = 0, length_only=False):
         '''
         Initialization of a Flame when the DevelopingFlow calculations have already been made.
         These calculations can be slow for a blend, so if both a Jet and Flame are to be created for the same
@@ -144,7 +160,91 @@ class Flame:
                    verbose=verbose,
                    Smax=Smax, dS=dS, tol=tol,
                    numB=numB, n_pts_integral=n_pts_integral,
-                   wind_speed = wind_speed, developing_flow = developing_flow)
+                   wind_speed = wind_speed, developing_flow = developing_flow,
+                   length_only = length_only)
+
+    @classmethod
+    def solve_batch(cls, fluid, orifices, ambient, mdots=None, locations=None, rel_humid=0.89,
+                    n_workers=1, **kwargs):
+        '''
+        Solves the flames for several orifices (e.g., the leak sizes of a QRA) from the same fluid into the
+        same ambient, along with the heat flux from each flame at a set of locations.
+        The flames are independent, so they are solved in a pool of processes when n_workers is more than 1.
+
+        Parameters
+        ----------
+        fluid : hyram.phys.Fluid object
+            fluid that is being released
+        orifices : list of hyram.phys.Orifice objects
+            orifice through which each flame is released
+        ambient : hyram.phys.Fluid object
+            fluid into which the fluid is being released
+        mdots : list of floats (optional)
+            mass flow rate (kg/s) of each flame, or None to calculate it from the orifice flow
+        locations : list of locations (optional)
+            locations at which to calculate heat flux from each flame,
+            each location is a tuple of 3 coordinates (m): [(x1, y1, z1), (x2, y2, z2), ...]
+        rel_humid : float (optional)
+            relative humidity
+        n_workers : int or None (optional)
+            number of processes to use, where None uses all CPUs and 1 solves the flames in this process
+        **kwargs : keyword arguments (optional)
+            passed to Flame for each orifice
+
+        Returns
+        -------
+        flames : list of Flame objects
+            flame for each orifice
+        fluxes : ndarray
+            heat flux (W/m^2) from each flame (rows) at each location (columns)
+        '''
+        if mdots is None:
+            mdots = [None] * len(orifices)
+        if locations is None:
+            locations = []
+        inputs = [(fluid, orifice, ambient, mdot, locations, rel_humid, kwargs)
+                  for orifice, mdot in zip(orifices, mdots)]
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        n_workers = min(n_workers, len(inputs))
+        if n_workers > 1:
+            with mp.Pool(n_workers) as pool:
+                results = pool.map(_solve_flame, inputs, chunksize=1)
+        else:
+            results = [_solve_flame(args) for args in inputs]
+        flames = [flame for flame, _ in results]
+        fluxes = np.reshape([flux for _, flux in results], (len(inputs), len(locations)))
+        return flames, fluxes
+
+    def _integration_grid(self, numB, n_pts_integral):
+        '''
+        Radial grid used to integrate the governing equations, normalized by the half-width B
+        (0, then logarithmically spaced from 0.003 to numB), with its trapezoidal weights,
+        the Gaussian profile shapes on that grid, and a work array for the integrands.
+        The grid does not depend on B, so it is computed once when the flame is solved
+        and reused by every call to _govEqns.
+        '''
+        grid = self.__dict__.get('_grid')
+        if grid is not None and grid['key'] == (numB, n_pts_integral, self.lamf, self.lamv):
+            return grid
+        rhat = np.zeros(n_pts_integral)
+        rhat[1:] = np.geomspace(0.003, numB, n_pts_integral - 1)
+        dr = np.diff(rhat)
+        w = np.zeros(n_pts_integral)
+        w[:-1] = dr
+        w[1:] += dr
+        w *= 0.5
+        rhat2 = rhat * rhat
+        Gf = np.exp(rhat2 * (-1 / self.lamf ** 2))
+        GV = Gf if self.lamv == self.lamf else np.exp(rhat2 * (-1 / self.lamv ** 2))
+        grid = dict(key=(numB, n_pts_integral, self.lamf, self.lamv),
+                    w=w, wr=w * rhat,
+                    Gf=Gf, GV=GV,
+                    Hf=(2 / self.lamf ** 2) * rhat2 * Gf,  # B * d(f/f_cl)/dB
+                    HV=(2 / self.lamv ** 2) * rhat2 * GV,  # B * d(V/V_cl)/dB
+                    work=np.empty((11, n_pts_integral)))
+        self._grid = grid
+        return grid
 
     def _govEqns(self, S, ind_vars, numB=5, n_pts_integral=100):
         '''
@@ -152,59 +252,93 @@ class Flame:
 
         A matrix soluition to the continuity, x-momentum, y-mometum and mixture fraction equations
         solves for d/dS of the dependent variables V_cl, B, theta, and f_cl.  Numerically integrated
-        to infinity = numB * B(S) using numpts discrete points.
+        to infinity = numB * B(S) using n_pts_integral discrete points.
+
+        Integrals are evaluated on the grid normalized by B (see _integration_grid) and scaled by B, so that
+        integral(g * r * dr) = B**2 * sum(wr * g) and integral(g * dr) = B * sum(w * g).
         '''
         # break independent variables out of ind_vars
         [V_cl, B, theta, f_cl, x, y] = ind_vars
-
-        # needed to integrate to infinity (numB*B):
-        r = np.zeros(n_pts_integral)
-        r[1:] = np.logspace(-7, np.log10(numB * B), n_pts_integral - 1)
+        grid = self._integration_grid(numB, n_pts_integral)
+        Gf, GV, P = grid['Gf'], grid['GV'], grid['work']
 
         # mixture fraction and velocity have Gaussian shapes
-        f = f_cl * np.exp(-(r / (self.lamf * B)) ** 2)
-        V = V_cl * np.exp(-(r / (self.lamv * B)) ** 2)
-
-        # density isn't a nice Gaussian, due to combustion
-        try:
-            rho = self.chem.rho_prod(f)
-            drhodf = self.chem.drhodf(f)
-        except:
-            warnings.warn('Clipping f - something has gone wrong.', category=PhysicsWarning)
+        if not 0 <= f_cl <= 1:
+            warnings.warn('Clipping f - centerline mixture fraction of %g is outside of [0, 1].' % f_cl,
+                          category=PhysicsWarning)
+
+        if compiled_kernels.enabled:
+            chem = self.chem
+            eta_coeff = 1 / (chem.xO2stoich * (chem.MW['O2'] + 3.76 * chem.MW['N2']))
+            return _kernels.flame_govEqns(V_cl, B, theta, f_cl, Gf, GV, grid['Hf'], grid['HV'], grid['w'], grid['wr'],
+                                          chem._fvals, chem._T_vals, chem._drhodf_vals, chem._MW_rich, chem._MW_lean,
+                                          chem.MW[chem.reac], eta_coeff, chem.Preac,
+                                          self.ambient.rho, self.Emom, self.alpha_buoy,
+                                          self.developing_flow.fluid_exp.rho, float(self.wind_speed))
+
+        f = f_cl * Gf
+        if not 0 <= f_cl <= 1:
             f = np.clip(f, 0, 1)
-            rho = self.chem.rho_prod(f)
-            drhodf = self.chem.drhodf(f)
+        V = V_cl * GV
+        dfdB = f_cl / B * grid['Hf']
+        dVdB = V_cl / B * grid['HV']
 
-        rho_int = integrate.trapezoid(self.ambient.rho - rho, r)
-
-        Ebuoy = Ebuoy = (2 * np.pi * self.alpha_buoy * np.sin(theta) * const.g * rho_int /
-                         (B * V_cl * self.developing_flow.fluid_exp.rho))  # m**2/s
+        # density isn't a nice Gaussian, due to combustion
+        rho, drhodf = self.chem.rho_drhodf(f)
+
+        # integrands of the left-hand side, evaluated into the work array
+        drhodf_V = drhodf * V
+        rho_V = rho * V
+        np.multiply(rho, GV, out=P[0])
+        np.multiply(drhodf_V, dfdB, out=P[1])
+        P[1] += rho * dVdB
+        np.multiply(drhodf_V, Gf, out=P[2])
+        np.multiply(rho_V, GV, out=P[3])
+        np.multiply(P[1], V, out=P[4])
+        P[4] += rho_V * dVdB
+        np.multiply(rho_V, V, out=P[5])
+        np.multiply(P[2], V, out=P[6])
+        np.multiply(P[0], f, out=P[7])
+        np.multiply(P[1], f, out=P[8])
+        P[8] += rho_V * dfdB
+        np.multiply(P[2], f, out=P[9])
+        P[9] += rho_V * Gf
+        np.subtract(self.ambient.rho, rho, out=P[10])
+        I = B ** 2 * P.dot(grid['wr'])
+
+        rho_int = B * P[10].dot(grid['w'])
+
+        Ebuoy = (2 * np.pi * self.alpha_buoy * np.sin(theta) * const.g * rho_int /
+                 (B * V_cl * self.developing_flow.fluid_exp.rho))  # m**2/s
         E = self.Emom + Ebuoy
 
         # right-hand side of governing equations:
         RHS = np.array([self.ambient.rho * E / (2 * const.pi),  # continuity
                         self.wind_speed * self.ambient.rho * E / (2 * const.pi),  # x-momentum
-                        integrate.trapezoid((self.ambient.rho - rho) * const.g * r, r),  # y-momentum
+                        const.g * I[10],  # y-momentum
                         0])  # mixture fraction
 
-        zero = np.zeros_like(r)
-        dfdS = np.array([zero, 2 * r ** 2 / self.lamf ** 2 / B ** 3 * f, zero, f / f_cl])
-        dVdS = np.array([V / V_cl, 2 * r ** 2 / self.lamv ** 2 / B ** 3 * V, zero, zero])
-        drhodS = drhodf * dfdS
-        dthetadS = np.array([zero, zero, np.ones_like(r), zero])
-
-        # left-hand side of governing equations:
-        LHS = np.array([drhodS * V * r + rho * dVdS * r,  # continuity
-                        drhodS * V ** 2 * np.cos(theta) * r + 2 * rho * V * dVdS * np.cos(
-                            theta) * r + rho * V ** 2 * -np.sin(theta) * dthetadS * r,  # x-momentum
-                        drhodS * V ** 2 * np.sin(theta) * r + 2 * rho * V * dVdS * np.sin(
-                            theta) * r + rho * V ** 2 * np.cos(theta) * dthetadS * r,  # y-momentum
-                        drhodS * V * f * r + rho * dVdS * f * r + rho * V * dfdS * r])  # mixture fraction
-        LHS = integrate.trapezoid(LHS, r)
-
-        dz = np.append(np.linalg.solve(LHS, RHS), np.array([np.cos(theta), np.sin(theta)]), axis=0)
+        # left-hand side of governing equations (columns are V_cl, B, theta, f_cl):
+        cos, sin = np.cos(theta), np.sin(theta)
+        LHS = np.array([[I[0], I[1], 0, I[2]],  # continuity
+                        [2 * cos * I[3], cos * I[4], -sin * I[5], cos * I[6]],  # x-momentum
+                        [2 * sin * I[3], sin * I[4], cos * I[5], sin * I[6]],  # y-momentum
+                        [I[7], I[8], 0, I[9]]])  # mixture fraction
+
+        dz = np.append(np.linalg.solve(LHS, RHS), np.array([cos, sin]), axis=0)
         return dz
 
+    def _update_chem(self):
+        '''
+        uses the shared Combustion object for the fuel at ambient conditions,
+        unless the chemistry already matches them
+        '''
+        #ESH note: self.developing_flow.fluid_exp is at a much lower temperature than ambient and gives funky heat flux numbers if used in the Combustion object, hence initilization at ambient T and P - could be improved.
+        chem = self.chem
+        if (chem is None or chem.reac != self.fluid.species or chem.Treac != self.ambient.T
+                or abs(chem.Preac / self.ambient.P - 1) > 1e-10):
+            self.chem = combustion_registry.get(Fluid(species = self.fluid.species, T = self.ambient.T, P = self.ambient.P))
+
     def solve(self, Smax=np.inf, dS=None, tol=1e-6,
               numB=5, n_pts_integral=100):
         '''
@@ -220,12 +354,7 @@ class Flame:
         res : dict
             dictionary of flame results
         '''
-        #ESH note: self.developing_flow.fluid_exp is at a much lower temperature than ambient and gives funky heat flux numbers if used in the Combustion object, hence initilization at ambient T and P - could be improved.
-        try:
-            if self.chem.Treac != self.ambient.T or abs(self.chem.P / self.ambient.P - 1) > 1e-10:
-                self.chem.reinitilize(Fluid(species = self.fluid.species, T = self.ambient.T, P = self.ambient.P))
-        except:
-            self.chem = Combustion(Fluid(species = self.fluid.species, T = self.ambient.T, P = self.ambient.P))
+        self._update_chem()
 
         if self.verbose:
             print('solving for the flame...', end='')
@@ -241,6 +370,7 @@ class Flame:
         else:
             max_step = dS
             first_step = dS
+        self._integration_grid(numB, n_pts_integral)
         sol = integrate.solve_ivp(self._govEqns, [self.initial_node.S, Smax],
                                   np.array([self.initial_node.v_cl, self.initial_node.B, self.initial_node.theta, f_cl0,
                                             self.initial_node.x, self.initial_node.y]),
@@ -253,10 +383,39 @@ class Flame:
         result['S'] = sol.t
         for k, v in result.items():
             self.__dict__[k] = v
+        self._radiation_sources = {}
         if self.verbose:
             print('done.')
         return result
 
+    def solve_straight_line(self):
+        '''
+        Estimates the flame centerline as a straight line from the end of the developing flow along the release
+        angle to the visible flame length, using the correlations in length rather than integrating the
+        governing equations.  This neglects buoyant curvature of the flame, but is much faster than solve,
+        and the multi-source radiation model (e.g., Qrad_multi) can still be used for screening.
+        If the visible flame length is no longer than the developing flow, the line instead runs from the
+        orifice to the visible flame length.
+
+        Returns
+        -------
+        res : dict
+            dictionary of flame centerline results (S, x, y)
+        '''
+        Lvis = self.length()
+        S0 = self.initial_node.S
+        if Lvis > S0:
+            S = np.array([S0, Lvis])
+        else:
+            S = np.array([0, Lvis])
+        result = {'S': S,
+                  'x': self.initial_node.x + (S - S0) * np.cos(self.initial_node.theta),
+                  'y': self.initial_node.y + (S - S0) * np.sin(self.initial_node.theta)}
+        for k, v in result.items():
+            self.__dict__[k] = v
+        self._radiation_sources = {}
+        return result
+
     def length(self):
         '''
         These correlations come from Schefer et al. IJHE 31 (2006): 1332-1340
@@ -270,11 +429,7 @@ class Flame:
         .tauf (flame residence time)
         .Xrad (radiant fraction)
         '''
-        try:
-            if self.chem.Treac != self.ambient.T or abs(self.chem.P / self.ambient.P - 1) > 1e-10:
-                self.chem.reinitilize(Fluid(species = self.fluid.species, T = self.ambient.T, P = self.ambient.P))
-        except:
-            self.chem = Combustion(Fluid(species = self.fluid.species, T = self.ambient.T, P = self.ambient.P))
+        self._update_chem()
         fs, Tad = self.chem.fstoich, self.chem.T_prod(self.chem.fstoich)
         Tamb = self.ambient.T
         rhoair, rhof = self.ambient.rho, self.chem.rho_prod(self.chem.fstoich)
@@ -302,18 +457,19 @@ class Flame:
 
         return self.Lvis
 
-    def Qrad_multi(self, x, y, z, RH, WaistLoc=0.75, N=50):
+    def radiation_source(self, WaistLoc=0.75, N=50):
         '''
-        MultiSource radiation model
-        follows Hankinson & Lowesmith, CNF 159, 2012: 1165-1177
+        Returns the point sources of the multi-source radiation model (see RadiationSource) for this flame.
+        These are built once for each WaistLoc and N, and rebuilt when the flame is solved again.
         '''
-        obsOrg = np.array([x, y, z]).T
+        sources = self.__dict__.setdefault('_radiation_sources', {})
+        if (WaistLoc, N) in sources:
+            return sources[(WaistLoc, N)]
 
         try:
             Lvis = self.Lvis  # length of visible flame [m]
-        except:
+        except AttributeError:
             Lvis = self.length()
-        T = self.ambient.T
 
         n = int(WaistLoc * N)
         w = np.arange(1, N + 1, dtype=float)
@@ -324,39 +480,26 @@ class Flame:
             S = np.linspace(self.S[0], min([self.S[-1], self.Lvis]), N)
             X = interpolate.interp1d(self.S, self.x)(S)
             Y = interpolate.interp1d(self.S, self.y)(S)
-        except:
+        except AttributeError:  # flame has not been solved
             warnings.warn('Running flame model with default parameters.', category=PhysicsWarning)
             self.solve()
             S = np.linspace(self.S[0], min([self.S[-1], self.Lvis]), N)
             X = interpolate.interp1d(self.S, self.x)(S)
             Y = interpolate.interp1d(self.S, self.y)(S)
 
-        sourceOrg = np.array([X, Y, np.zeros_like(X)]).T
+        source = RadiationSource(np.array([X, Y, np.zeros_like(X)]), w, self.Srad, self.ambient.T)
+        self._radiation_sources[(WaistLoc, N)] = source
+        return source
 
-        Qrad = np.zeros(obsOrg.shape[:-1])
+    def Qrad_multi(self, x, y, z, RH, WaistLoc=0.75, N=50):
+        '''
+        MultiSource radiation model
+        follows Hankinson & Lowesmith, CNF 159, 2012: 1165-1177
 
-        for j in range(len(w)):
-            v = sourceOrg[j] - obsOrg
-            if obsOrg.ndim > 1:
-                obsNorm = v / (np.linalg.norm(v, axis=1) + 1e-99)[:, np.newaxis]
-            else:
-                obsNorm = v / (np.linalg.norm(v) + 1e-99)
-
-            if obsOrg.ndim == 4:
-                len_v = np.linalg.norm(v, axis=3)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=3) / len_v)
-            elif obsOrg.ndim == 3:
-                len_v = np.linalg.norm(v, axis=2)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=2) / len_v)
-            elif obsOrg.ndim == 2:
-                len_v = np.linalg.norm(v, axis=1)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v), axis=1) / len_v)
-            elif obsOrg.ndim == 1:
-                len_v = np.linalg.norm(v)
-                phi = np.arcsin(np.linalg.norm(np.cross(obsNorm, v)) / len_v)
-            Qrad += w[j] / (4 * const.pi * len_v ** 2) * np.cos(phi) * self.Srad * calc_transmissivity(len_v, T, RH)
-
-        return Qrad.T
+        x, y, z can be scalars or arrays of any, matching, shape; returns the heat flux (W/m^2) in that shape
+        '''
+        x, y, z = np.broadcast_arrays(x, y, z)
+        return self.radiation_source(WaistLoc, N).flux(np.stack([x, y, z], axis=-1), RH)
 
     @property
     def _contourdata(self):
@@ -454,6 +597,45 @@ class Flame:
                                               RH=RH, WaistLoc=WaistLoc)
         return fig_or_filepath
 
+    def heat_flux_field(self, x, y, z, RH=0.89, contours=None, refinements=3, WaistLoc=0.75):
+        '''
+        calculates heat flux on a 2-D slice or 3-D box,
+        refining the grid around the contour levels
+
+        Parameters
+        ----------
+        x, y, z : float or array-like
+            coordinates (m) of the coarse grid along each axis;
+            a single coordinate makes a slice normal to that axis
+        RH : float
+            relative humidity
+        contours : ndarray or list (optional)
+            contour levels in kW/m^2 around which to refine the grid
+            (default values are the IFC exposure limits used by plot_heat_flux_sliced)
+        refinements : int (optional)
+            number of times to halve the grid spacing around the contours
+        WaistLoc : float (optional)
+            value between 0 and 1 along flame length at which the radiative heat flux is
+            calculated from for each point
+
+        Returns
+        -------
+        x, y, z : ndarray
+            coordinates (m) of the refined grid along each axis
+        flux : ndarray
+            heat flux (kW/m^2) on the refined grid, of shape (len(x), len(y), len(z))
+        calculated : ndarray
+            boolean array that is True where the heat flux was calculated rather than interpolated
+        '''
+        if contours is None:
+            contours = [1.577, 4.732, 25.237]  # kW/m2
+        source = self.radiation_source(WaistLoc)
+
+        def flux(x, y, z):
+            return source.flux(np.stack([x, y, z], axis=-1), RH) / const.kilo
+
+        return get_effect_field(flux, x, y, z, levels=contours, refinements=refinements)
+
     def generate_positional_flux(self, flux_coordinates, rel_humid):
         """ Calculate flux at positions according to radiative source model
 
@@ -464,8 +646,8 @@ class Flame:
             each location is a tuple of 3 coordinates (m):
             [(x1, y1, z1), (x2, y2, z2), ...]
 
-        rel_humid : flat
-            relative humitidy
+        rel_humid : float or array-like
+            relative humidity, for all locations or at each location
 
         Returns
         -------
@@ -473,10 +655,7 @@ class Flame:
             flux values at specified positions (W/m^2)
         """
 
-        x_values = [flux_coordinate[0] for flux_coordinate in flux_coordinates]
-        y_values = [flux_coordinate[1] for flux_coordinate in flux_coordinates]
-        z_values = [flux_coordinate[2] for flux_coordinate in flux_coordinates]
-        flux = self.Qrad_multi(x_values, y_values, z_values, rel_humid)
+        flux = self.radiation_source().flux(np.reshape(flux_coordinates, (-1, 3)), rel_humid)
         return flux
 
     def get_srad(self):
@@ -503,15 +682,15 @@ class Flame:
 
     def calc_distance_to_heatflux(self, heat_flux_level, direction='x',
                                   RH=0.89, WaistLoc=0.75,
-                                  max_distance=500, negative_direction=False):
+                                  max_distance=500, negative_direction=False, method='interpolation'):
         '''
         Calculate distance from leak point to a given heatflux
         in the direction specified
 
         Parameters
         ----------
-        heat_flux_level : float
-            heat flux level for which to get the distance to (W/m^2)
+        heat_flux_level : float or array-like
+            heat flux level(s) for which to get the distance to (W/m^2)
         direction : 'x', 'y', or 'z', optional
             direction for which to calculate the distance
             (default is 'x')
@@ -524,10 +703,13 @@ class Flame:
         negative_direction : Boolean (optional)
             whether or not to look in the negative direction instead of positive
             (default is False)
+        method : 'brent' or 'interpolation' (optional)
+            method used to find the distance (see get_distance_to_effect)
+            (default is 'interpolation')
 
         Returns
         -------
-        distance : float
+        distance : float or array-like
             distance to heat_flux_level (m)
         '''
         flame_center_streamline = self.Lvis * WaistLoc
@@ -551,10 +733,95 @@ class Flame:
                                           effect_func=self.Qrad_multi,
                                           max_distance=max_distance,
                                           negative_direction=negative_direction,
+                                          method=method,
                                           RH=RH)
         return distance
 
 
+def _solve_flame(args):
+    '''
+    Solves a flame and the heat flux at a set of locations, for Flame.solve_batch
+    '''
+    fluid, orifice, ambient, mdot, locations, rel_humid, kwargs = args
+    flame = Flame(fluid, orifice, ambient, mdot, **kwargs)
+    return flame, flame.generate_positional_flux(locations, rel_humid)
+
+
+@dataclass(frozen=True, eq=False)
+class RadiationSource:
+    '''
+    Point sources of the multi-source radiation model for a flame, from Flame.radiation_source.
+    Holds only arrays and numbers, so it is immutable and can be pickled (e.g., to send to worker processes).
+
+    Parameters
+    ----------
+    positions : ndarray
+        (x, y, z) locations of the N point sources (m), shape (3, N)
+    weights : ndarray
+        fraction of the radiative power emitted by each point source, shape (N,)
+    Srad : float
+        total emitted radiative power (W)
+    T_amb : float
+        ambient temperature (K), used for the atmospheric transmissivity
+    '''
+    positions: np.ndarray
+    weights: np.ndarray
+    Srad: float
+    T_amb: float
+
+    def __post_init__(self):
+        for name in ['positions', 'weights']:
+            value = np.array(getattr(self, name), dtype=float)
+            value.flags.writeable = False
+            object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()  # arrays are unpickled as writeable
+
+    def flux(self, points, rel_humid):
+        '''
+        Heat flux at observer points, taken to face the sources.
+        The flux from all sources to all points is evaluated at once, in chunks of points
+        to limit the memory used for large grids.
+        For a single relative humidity, the transmissivity is evaluated from its coefficients
+        (transmissivity_coefficients), which give exactly the same values as calc_transmissivity.
+
+        Parameters
+        ----------
+        points : array-like
+            (x, y, z) locations of the observers (m), shape (..., 3)
+        rel_humid : float or array-like
+            relative humidity (0-1), for all points or at each point (shape (...))
+
+        Returns
+        -------
+        flux : ndarray
+            heat flux at each point (W/m^2), shape (...)
+        '''
+        points = np.asarray(points, dtype=float)
+        shape = points.shape[:-1]
+        points = np.ascontiguousarray(points.reshape(-1, 3).T)
+        N = len(self.weights)
+        if np.size(rel_humid) == 1:
+            tau0, tau1, tau2 = transmissivity_coefficients(self.T_amb, rel_humid)
+        else:  # relative humidity at each point
+            rel_humid = np.broadcast_to(rel_humid, shape).ravel()
+        flux = np.empty(points.shape[1])
+        chunk = max(1, _QRAD_MAX_ELEMENTS // N)
+        for i in range(0, len(flux), chunk):
+            obs = points[:, i:i + chunk]
+            len_v_sq = ((self.positions[:, :, np.newaxis] - obs[:, np.newaxis, :])**2).sum(axis=0)  # (sources, points)
+            if np.size(rel_humid) == 1:
+                log_len_v = 0.5 * np.log10(len_v_sq)
+                tau = tau0 + log_len_v * (tau1 + tau2 * log_len_v)
+            else:
+                tau = calc_transmissivity(np.sqrt(len_v_sq), self.T_amb, rel_humid[np.newaxis, i:i + chunk])
+            flux[i:i + chunk] = self.weights.dot(tau / len_v_sq)
+        flux *= self.Srad / (4 * const.pi)
+        return flux.reshape(shape)
+
+
 def calc_transmissivity(path_length, ambient_temperature, relative_humidity, atmospheric_CO2_ppm=335):
     '''
     Calculates atmospheric transmissivity from:
@@ -581,8 +848,49 @@ def calc_transmissivity(path_length, ambient_temperature, relative_humidity, atm
         Atmospheric transmissivity
     '''
     sat_water_vap_pressure_mmHg = np.exp(20.386 - 5132 / ambient_temperature)  # mmHg, saturated vapor pressure from Wikipedia
-    XH2O = relative_humidity * path_length * sat_water_vap_pressure_mmHg * 2.88651e2 / ambient_temperature
-    XCO2 = path_length * 273. / ambient_temperature * atmospheric_CO2_ppm / 335.
-    transmissivity = (1.006 - 0.01171 * np.log10(XH2O) - 0.02368 * np.log10(XH2O) ** 2
-                       - 0.03188 * np.log10(XCO2) + 0.001164 * np.log10(XCO2) ** 2)
+    # XH2O and XCO2 are proportional to the path length, so only one logarithm of an array is needed
+    log_path_length = np.log10(path_length)
+    log_XH2O = np.log10(relative_humidity * sat_water_vap_pressure_mmHg * 2.88651e2 / ambient_temperature) + log_path_length
+    log_XCO2 = np.log10(273. / ambient_temperature * atmospheric_CO2_ppm / 335.) + log_path_length
+    transmissivity = (1.006 - 0.01171 * log_XH2O - 0.02368 * log_XH2O ** 2
+                       - 0.03188 * log_XCO2 + 0.001164 * log_XCO2 ** 2)
     return transmissivity
+
+
+def transmissivity_coefficients(ambient_temperature, relative_humidity, atmospheric_CO2_ppm=335):
+    '''
+    Coefficients of the atmospheric transmissivity (calc_transmissivity) as a function of path length.
+    The water vapor and CO2 path lengths are both proportional to the path length, so the transmissivity is
+    exactly a quadratic in log10(path length):
+        transmissivity = tau0 + tau1 * log10(path_length) + tau2 * log10(path_length)**2
+    and the coefficients are calculated once for each set of ambient conditions.
+
+    Parameters
+    ----------
+    ambient_temperature : float
+        Ambient temperature (K)
+
+    relative_humidity : float
+        Fractional relative humidity (0-1);
+        for several relative humidities, use calc_transmissivity directly
+
+    atmospheric_CO2_ppm : float
+        Atmospheric CO2 concentration (ppm),
+        default is 335 ppm
+
+    Returns
+    -------
+    (tau0, tau1, tau2) : tuple of floats
+        Coefficients of the transmissivity polynomial in log10(path length)
+    '''
+    # Inputs are converted to floats (e.g., from single-element arrays) so that they can be cached
+    return _transmissivity_coefficients(float(np.asarray(ambient_temperature).item()),
+                                        float(np.asarray(relative_humidity).item()),
+                                        float(np.asarray(atmospheric_CO2_ppm).item()))
+
+
+@lru_cache(maxsize=256)
+def _transmissivity_coefficients(ambient_temperature, relative_humidity, atmospheric_CO2_ppm):
+    tau_minus, tau_zero, tau_plus = calc_transmissivity(np.array([0.1, 1., 10.]), ambient_temperature,
+                                                        relative_humidity, atmospheric_CO2_ppm)
+    return float(tau_zero), float((tau_plus - tau_minus) / 2), float((tau_plus + tau_minus) / 2 - tau_zero)
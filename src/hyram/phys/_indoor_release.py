@@ -18,7 +18,7 @@ from scipy import interpolate
 from ._fuel_props import FuelProperties
 from ._comps import Fluid, Orifice, NozzleFlow
 from ._layer import LayeringJet
-from ._therm import Combustion
+from ._therm import combustion_registry
 from ..utilities import misc_utils
 from ..utilities.custom_warnings import PhysicsWarning
 
@@ -124,7 +124,7 @@ class IndoorRelease:
                     mdots = mdots[:i]
         # Source fluid at ambient conditions
         gas = Fluid(species = source.fluid.species, T = ambient.T, P = ambient.P)
-        self.comb = Combustion(gas)
+        self.comb = combustion_registry.get(gas)
         self.enclosure = enclosure
 
         if release_area is not None:
@@ -142,7 +142,8 @@ class IndoorRelease:
             jets.append(LayeringJet(g, orifice, ambient, theta0 = theta0, y0 = y0,
                                     nn_conserve_momentum=nn_conserve_momentum, nn_T=nn_T,
                                     x0 = x0, lam = lam, mdot = mdot, Smax = LIM, Ymin = Ymin,
-                                    max_steps = max_steps, tol = tol, suppressWarnings = True, verbose = verbose))
+                                    max_steps = max_steps, tol = tol, suppressWarnings = True, verbose = verbose,
+                                    stop_at_Ymin = False)) # layer model needs the jet up to the ceiling
             jets[-1].Q_jet = mdot/gas.rho # needed for layer model
         # Reshape jet if needed
         [jet.reshape(enclosure, showPlot=False) for jet in jets]
@@ -7,6 +7,8 @@ If not, see https://www.gnu.org/licenses/.
 """
 
 import copy
+from functools import lru_cache
+import warnings
 
 import matplotlib.pyplot as plt
 from contourpy import contour_generator
@@ -18,6 +20,23 @@ from ._fuel_props import FuelProperties
 from ._notional_nozzle import NotionalNozzle
 from ._comps import NozzleFlow
 from ._plots import plot_contour
+from . import _kernels
+from ._kernels import compiled_kernels
+from ..utilities.custom_warnings import PhysicsWarning
+
+
+@lru_cache(maxsize=None)
+def _laguerre_quadrature(n):
+    '''
+    Returns square roots of the n Gauss-Laguerre nodes and weights (multiplied by exp(node)), so that
+    integral from 0 to infinity of f(t) dt ~= sum(f(nodes)*weights)
+    '''
+    t, w = np.polynomial.laguerre.laggauss(n)
+    return np.sqrt(t), w*np.exp(t)
+
+
+# empty quadrature passed to the compiled jet kernel to select trapezoidal integration
+_NO_QUADRATURE = (np.zeros(0), np.zeros(0))
 
 
 class DevelopingFlow:
@@ -293,8 +312,8 @@ class Jet:
                  T_establish_min=-1,
                  Ymin=7e-4, dS=None, Smax=np.inf,
                  max_steps=5000, tol=1e-8,
-                 alpha=0.082, Yamb=0, numB=5, numpts=500,
-                 developing_flow = None,
+                 alpha=0.082, Yamb=0, numB=5, numpts=500, numquad=None,
+                 developing_flow = None, stop_at_Ymin=True,
                  suppressWarnings=False, verbose=False):
         '''
         Class for solving for a 2D jet.
@@ -352,6 +371,12 @@ class Jet:
             maximum number of halfwidths (B) considered to be infinity - for integration in energy equations
         numpts: int, optional
             maximum number of points in energy integration (from 0 to numB)
+        numquad: int, optional
+            number of Gauss-Laguerre quadrature points (e.g., 32) for energy integration, which is much faster
+            than the default (None) trapezoidal integration using numpts points from 0 to numB
+        stop_at_Ymin: boolean, optional
+            whether to stop integrating where the centerline mass fraction reaches Ymin (default), rather than
+            only at Smax (e.g., for a jet that must reach the ceiling of an enclosure)
         developing_flow: DevelopingFlow, optional
             specified DevelopingFlow object
         suppressWarnings: boolean, optional
@@ -411,15 +436,15 @@ class Jet:
         self._Cp_air, self._h_amb0 = ambient.therm.get_property(['C', 'H'], T = ambient.T, P = ambient.P)
 
         # Integrate in the zone of established flow
-        self.solve(Ymin, dS, Smax, max_steps, tol, alpha, Yamb, numB, numpts)
+        self.solve(Ymin, dS, Smax, max_steps, tol, alpha, Yamb, numB, numpts, numquad, stop_at_Ymin)
 
     @classmethod
     def from_developed_flow(cls, developing_flow,
                             lam=1.16, betaA=0.28,
                             Ymin=7e-4, dS=None, Smax=np.inf,
                             max_steps=5000, tol=1e-8,
-                            alpha=0.082, Yamb=0, numB=5, numpts=500,
-                            suppressWarnings=False, verbose=False):
+                            alpha=0.082, Yamb=0, numB=5, numpts=500, numquad=None,
+                            stop_at_Ymin=True, suppressWarnings=False, verbose=False):
         '''
         Initialization of a Jet when the DevelopingFlow calculations have already been made.
         These calculations can be slow for a blend, so if both a Jet and Flame are to be created for the same
@@ -437,45 +462,62 @@ class Jet:
                    T_establish_min=-1,
                    Ymin=Ymin, dS=dS, Smax=Smax,
                    max_steps=max_steps, tol=tol,
-                   alpha=alpha, Yamb=Yamb, numB=numB, numpts=numpts,
-                   developing_flow = developing_flow,
+                   alpha=alpha, Yamb=Yamb, numB=numB, numpts=numpts, numquad=numquad,
+                   developing_flow = developing_flow, stop_at_Ymin=stop_at_Ymin,
                    suppressWarnings=suppressWarnings, verbose=verbose)
 
     def solve(self, Ymin = 7e-4, dS = None, Smax = np.inf,
               max_steps = 5000, tol = 1e-8,
-              alpha = 0.082, Yamb = 0, numB = 5, numpts = 500):
+              alpha = 0.082, Yamb = 0, numB = 5, numpts = 500, numquad = None,
+              stop_at_Ymin = True):
         '''
         solves (integrates) the model equations from the initial node out to limit
+
+        The equations are integrated using solve_ivp (RK45) with steps no longer than dS, stopping exactly
+        where the centerline mass fraction reaches Ymin (if stop_at_Ymin) or the distance reaches Smax
+        (terminal events), or after a distance of max_steps*dS.  The dense output of the integrator is kept for interpolation
+        between solution points (see Jet.interpolate).
         '''
         if self.verbose:
             print('integrating... ', end='')
 
         if dS is None and Smax == np.inf:
             dS = 500*self.developing_flow.expanded_plug_node.d # somewhat arbitrary - solver will add points anyway
-                                        # may integrate past Ymin
         elif dS is None:
             dS = Smax
 
-        r = integrate.ode(self._govEqns).set_f_params(alpha, Yamb, numB, numpts)
-        r.set_integrator('dopri5', atol = tol, rtol = tol)
-
-        T, Y = [], []
-        def solout(t, y):
-            T.append(t)
-            Y.append(np.array(y))
-        r.set_solout(solout)
-        r.set_initial_value(self.initial_node.conditions, self.initial_node.S)
-
-        i = 0
-        while r.successful() and r.y[3] > Ymin and i < max_steps and r.t < Smax:
-            r.integrate(r.t + dS)
-            i += 1
-
-        Y = np.array(Y)
-
-        for key, val in zip(['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y'], Y.T):
+        def govEqns(S, ind_vars):
+            return self._govEqns(S, ind_vars, alpha, Yamb, numB, numpts, numquad)
+
+        # Set function attribute 'terminal' to end integration when one of these events is met
+        def eventAttr(direction=0):
+            def decorator(f):
+                f.terminal = True
+                f.direction = direction
+                return f
+            return decorator
+
+        @eventAttr(direction=-1)
+        def lean_limit(S, ind_vars):
+            return ind_vars[3] - Ymin
+
+        @eventAttr()
+        def max_distance(S, ind_vars):
+            return S - Smax
+
+        S0 = self.initial_node.S
+        sol = integrate.solve_ivp(govEqns, (S0, S0 + max_steps*dS), np.array(self.initial_node.conditions, dtype=float),
+                                  method='RK45', dense_output=True,
+                                  events=(lean_limit, max_distance) if stop_at_Ymin else (max_distance,),
+                                  max_step=dS, rtol=tol, atol=tol)
+        if sol.status == -1:
+            warnings.warn('Jet integration stopped at S = %f m: %s' % (sol.t[-1], sol.message),
+                          category=PhysicsWarning)
+
+        for key, val in zip(['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y'], sol.y):
             self.__dict__[key] = val
-        self.__dict__['S'] = np.array(T)
+        self.__dict__['S'] = sol.t
+        self._dense_output = sol.sol
 
         MW_fluid, MW_air = self.fluid.therm.MW, self.ambient.therm.MW
         MW_cl  = MW_air*MW_fluid/(self.Y_cl*(MW_air-MW_fluid) + MW_fluid)
@@ -487,14 +529,28 @@ class Jet:
 
         return self
 
-    def _govEqns(self, S, ind_vars, alpha = 0.082, Yamb = 0, numB = 5, numpts = 500):
+    def interpolate(self, S):
+        '''
+        Returns the integrated variables (V_cl, B, rho_cl, Y_cl, theta, x, and y) at distance(s) S along the jet,
+        as a dictionary.  Uses the dense output of the integrator, which is consistent with the accuracy of the
+        solution, unless the jet has been reshaped, in which case values are linearly interpolated.
+        '''
+        keys = ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y']
+        S = np.clip(S, self.S[0], self.S[-1])
+        if self.__dict__.get('_dense_output') is None:
+            return {k: np.interp(S, self.S, self.__dict__[k]) for k in keys}
+        return dict(zip(keys, self._dense_output(S)))
+
+    def _govEqns(self, S, ind_vars, alpha = 0.082, Yamb = 0, numB = 5, numpts = 500, numquad = None):
         '''
         Governing equations for a plume, written in terms of d/dS of (V_cl, B, rho_cl, Y_cl,
         theta, x, and y).
 
         A matrix solution to the continuity, x-momentum, y-momentum, species, and energy
         equations solves for d/dS of the dependent variables V_cl, B, rho_cl, Y_cl,  and Theta.
-        Numerically integrated to infinity = numB * B(S) using numpts discrete points.
+        Numerically integrated to infinity = numB * B(S) using numpts discrete points, or if numquad
+        is given, to infinity using numquad Gauss-Laguerre points in t = r^2/B^2 (every term of the
+        energy integral includes the velocity profile, exp(-t)).
         '''
         # break independent variables out of ind_vars, then put them into node_in
         [V_cl, B, rho_cl, Y_cl, theta, x, y] = ind_vars
@@ -508,8 +564,18 @@ class Jet:
         h_amb0 = Cp_air * self.ambient.T
         E = node_in.entrainment(self._Emom, rho_amb, self._alpha_buoy, alpha = alpha)
 
+        if compiled_kernels.enabled:
+            sqrt_t, weights = _NO_QUADRATURE if numquad is None else _laguerre_quadrature(numquad)
+            return _kernels.jet_govEqns(V_cl, B, rho_cl, Y_cl, theta, E, float(Yamb),
+                                        lam, rho_amb, MW_air, MW_fluid, Cp_fluid, Cp_air, Pamb, h_amb0,
+                                        float(numB), numpts, sqrt_t, weights)
+
         # some stuff needed to integrate to infinity (numB*B):
-        r = np.append(np.array([0]), np.logspace(-5, np.log10(numB*max(B, 1e-99)), numpts))
+        if numquad is None:
+            r = np.append(np.array([0]), np.logspace(-5, np.log10(numB*max(B, 1e-99)), numpts))
+        else:
+            sqrt_t, weights = _laguerre_quadrature(numquad)
+            r = B*sqrt_t
         zero = np.zeros_like(r)
         V       = V_cl*np.exp(-(r**2)/(B**2))
         dVdS = np.array([V/V_cl,                                                 #d/dS(V_cl)
@@ -564,7 +630,11 @@ class Jet:
                             ])*const.pi*lam**2*B/(lam**2 + 1)
         RHSspec = Yamb*RHScont
 
-        LHSener = 2*const.pi*integrate.trapezoid(V*drhohdS*r + rhoh*dVdS*r, r)
+        if numquad is None:
+            LHSener = 2*const.pi*integrate.trapezoid(V*drhohdS*r + rhoh*dVdS*r, r)
+        else:
+            # r dr = B^2/2 dt
+            LHSener = const.pi*B**2*np.dot(V*drhohdS + rhoh*dVdS, weights)
         LHSener += [const.pi/(6*lam**2 + 2)*(3*lam**2*rho_cl+rho_amb)*B**2*V_cl**2, #d/dS(V_cl)
                     const.pi/(9*lam**2 + 3)*(3*lam**2*rho_cl+rho_amb)*V_cl**3*B,    #d/dS(B)
                     const.pi/(6*lam**2 + 2)*lam**2*B**2*V_cl**3,                    #d/dS(rho_cl)
@@ -595,6 +665,7 @@ class Jet:
         and crops it so it stops at the ceiling
         '''
         if np.any(self.x > enclosure.Xwall):
+            self._dense_output = None
             iwall = np.argmax(self.x > enclosure.Xwall)
             for k in ['S', 'rho_cl', 'V_cl', 'Y_cl', 'B', 'theta', 'y', 'x']:
                 self.__dict__[k] = np.append(np.append(self.__dict__[k][:iwall],
@@ -664,13 +735,6 @@ class Jet:
             B = trim_below(Hmax, self.y, B)
             rho_cl = trim_below(Hmax, self.y, rho_cl)
 
-        def rho(r, i):
-            '''density at radius: r, for plume at node: i'''
-            return (rho_cl[i] - self.ambient.rho) * np.exp(-r**2 / (self.lam * B[i]**2)) + self.ambient.rho
-        def Y(r, i):
-            '''mass fraction at radius: r, for plume at node: i'''
-            return rho_cl[i] * Y_cl[i] * np.exp(-r**2 / (self.lam * B[i])**2) / rho(r, i)
-
         Slean = np.interp(Ylean, Y_cl[::-1], S[::-1])
         ivals = slice(0, np.argmax(Y_cl <= Ylean))
         def trim_cl_lean(var):
@@ -680,21 +744,23 @@ class Jet:
         rho_cl = trim_cl_lean(rho_cl)
         S = trim_cl_lean(S)
 
-        def rval_at_Yval(Yval):
-            if Y(0, i) <= Yval:
-                rval = 0
-            else:
-                rval = optimize.brentq(lambda r: Y(r, i) - Yval, 0, 100*B[i])
-            return rval
-        def mass_per_cylindrical_shell(r):
-            return Y(r, i) * rho(r, i) * 2 * const.pi * r
-        mass_per_len = []
-        # integrate to find the mass/length at each node
-        for i in range(len(S)):
-            r_lean_i = rval_at_Yval(Ylean)
-            r_rich_i = rval_at_Yval(Yrich)
-            mass_per_len_i = integrate.quad(mass_per_cylindrical_shell, r_rich_i, r_lean_i)[0]
-            mass_per_len.append(mass_per_len_i)
+        # Radial profiles are written in terms of z = exp(-r**2/(lam*B)**2), for which
+        #   rho*Y = rho_cl*Y_cl*z  and  rho = (rho_cl - rho_amb)*z**lam + rho_amb,
+        # so that the mass per length between radii is analytic, and the mass fraction equals a limit at
+        # a single z between 0 (r = infinity) and 1 (centerline), which is found by bisection
+        rho_amb = self.ambient.rho
+        def z_at_Yval(Yval):
+            '''z where the mass fraction is Yval at each node, or 1 if the centerline is below Yval'''
+            f = lambda z: rho_cl*Y_cl*z - Yval*((rho_cl - rho_amb)*z**self.lam + rho_amb)
+            lo, hi = np.zeros_like(Y_cl), np.ones_like(Y_cl)
+            for _ in range(60):  # bisection, to double precision in z
+                mid = (lo + hi)/2
+                below = f(mid) < 0
+                lo = np.where(below, mid, lo)
+                hi = np.where(below, hi, mid)
+            return np.where(Y_cl <= Yval, 1, (lo + hi)/2)
+        # integrate rho*Y*2*pi*r from the rich to the lean radius to find the mass/length at each node
+        mass_per_len = rho_cl*Y_cl*const.pi*(self.lam*B)**2*(z_at_Yval(Yrich) - z_at_Yval(Ylean))
 
         # integrate to find the total mass
         return integrate.trapezoid(mass_per_len, S)
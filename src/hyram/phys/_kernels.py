@@ -0,0 +1,264 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import math
+
+import numpy as np
+from scipy import constants as const
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+class CompiledKernels:
+    def __init__(self):
+        '''
+        Switch for the compiled versions of the jet, flame, and layer governing equations.
+
+        The kernels in this module are written as explicit loops over the radial integration points and are
+        compiled with numba when it is installed, avoiding the NumPy call overhead that dominates the governing
+        equations for the small arrays used.  They are disabled by default, so that the NumPy implementations in
+        Jet, Flame, and LayeringJet are used unless the kernels are enabled (which requires numba).
+
+        Contents
+        --------
+        self.available: bool
+            whether numba could be imported
+        self.enabled: bool
+            whether the governing equations use the compiled kernels
+        '''
+        self.available = numba is not None
+        self.enabled = False
+
+    def enable(self):
+        '''use the compiled kernels (requires numba)'''
+        if not self.available:
+            raise ImportError('numba is required to use the compiled governing equation kernels')
+        self.enabled = True
+
+    def disable(self):
+        '''use the NumPy implementations of the governing equations'''
+        self.enabled = False
+
+
+compiled_kernels = CompiledKernels()
+
+
+# module-level constants are frozen into the compiled kernels
+_PI, _R, _G = const.pi, const.R, const.g
+
+
+def _jit(func):
+    '''compiles func with numba if it is available, otherwise returns it unchanged'''
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@_jit
+def jet_govEqns(V_cl, B, rho_cl, Y_cl, theta, E, Yamb,
+                lam, rho_amb, MW_air, MW_fluid, Cp_fluid, Cp_air, Pamb, h_amb0,
+                numB, numpts, sqrt_t, weights):
+    '''
+    Jet._govEqns for the dependent variables (V_cl, B, rho_cl, Y_cl, theta, x, y), given the entrainment E.
+
+    The energy integral uses the trapezoidal rule on numpts logarithmically spaced points from 0 to numB*B,
+    unless Gauss-Laguerre points and weights in t = r^2/B^2 are given (sqrt_t, weights not empty).
+    '''
+    pi, R = _PI, _R
+    # energy integral of (V*drhohdS + rhoh*dVdS)*r over r, for d/dS of V_cl, B, rho_cl, and Y_cl
+    ener = np.zeros(4)
+    quad = weights.shape[0] > 0
+    n = weights.shape[0] if quad else numpts + 1
+    lnr0 = math.log(10.)*-5
+    lnr1 = math.log(numB*max(B, 1e-99))
+    r_prev = 0.
+    g_prev = np.zeros(4)
+    for i in range(n):
+        if quad:
+            r = B*sqrt_t[i]
+        elif i == 0:
+            r = 0.
+        else:
+            r = math.exp(lnr0 + (lnr1 - lnr0)*(i - 1)/(numpts - 1))
+        V = V_cl*math.exp(-r**2/B**2)
+        dVdS_V_cl = V/V_cl
+        dVdS_B = 2*V*r**2/B**3
+        gauss = math.exp(-r**2/(lam*B)**2)
+        rho = (rho_cl - rho_amb)*gauss + rho_amb
+        Y = Y_cl*rho_cl/rho*gauss
+        dYdS_B = 2*Y**2*rho_amb*r**2/gauss/(lam**2*B**3*Y_cl*rho_cl)
+        dYdS_rho_cl = Y**2*rho_amb*(1/gauss - 1)/(Y_cl*rho_cl**2)
+        dYdS_Y_cl = Y/Y_cl
+        MW = MW_air*MW_fluid/(Y*(MW_air - MW_fluid) + MW_fluid)
+        dMWdY = MW*(MW_air - MW_fluid)/(MW_fluid*(Y - 1) - MW_air*Y)
+        Cp = Y*(Cp_fluid - Cp_air) + Cp_air
+        rhoh = Pamb/R*MW*Cp
+        drhohdY = Pamb/R*(MW*(Cp_fluid - Cp_air) + Cp*dMWdY)
+        g0 = rhoh*dVdS_V_cl
+        g1 = V*drhohdY*dYdS_B + rhoh*dVdS_B
+        g2 = V*drhohdY*dYdS_rho_cl
+        g3 = V*drhohdY*dYdS_Y_cl
+        if quad:
+            # r dr = B^2/2 dt
+            w = B**2/2*weights[i]
+            ener[0] += w*g0
+            ener[1] += w*g1
+            ener[2] += w*g2
+            ener[3] += w*g3
+        else:
+            if i > 0:
+                dr = (r - r_prev)/2
+                ener[0] += dr*(g0*r + g_prev[0])
+                ener[1] += dr*(g1*r + g_prev[1])
+                ener[2] += dr*(g2*r + g_prev[2])
+                ener[3] += dr*(g3*r + g_prev[3])
+            g_prev[0], g_prev[1], g_prev[2], g_prev[3] = g0*r, g1*r, g2*r, g3*r
+            r_prev = r
+
+    cos, sin = math.cos(theta), math.sin(theta)
+    LHS = np.zeros((5, 5))
+    RHS = np.zeros(5)
+    # continuity
+    c = pi/(lam**2 + 1)
+    LHS[0, 0] = (lam**2*rho_cl + rho_amb)*B**2*c
+    LHS[0, 1] = 2*(lam**2*rho_cl + rho_amb)*B*V_cl*c
+    LHS[0, 2] = lam**2*B**2*V_cl*c
+    RHS[0] = rho_amb*E
+    # x-momentum
+    c = pi/(2*lam**2 + 1)
+    LHS[1, 0] = (2*lam**2*rho_cl + rho_amb)*B**2*V_cl*cos*c
+    LHS[1, 1] = (2*lam**2*rho_cl + rho_amb)*B*V_cl**2*cos*c
+    LHS[1, 2] = lam**2*B**2*V_cl**2*cos*c
+    LHS[1, 4] = -(2*lam**2*rho_cl + rho_amb)*(B*V_cl)**2*sin/2*c
+    # y-momentum
+    LHS[2, 0] = (2*lam**2*rho_cl + rho_amb)*B**2*V_cl*sin*c
+    LHS[2, 1] = (2*lam**2*rho_cl + rho_amb)*B*V_cl**2*sin*c
+    LHS[2, 2] = lam**2*B**2*V_cl**2*sin*c
+    LHS[2, 4] = (2*lam**2*rho_cl + rho_amb)*(B*V_cl)**2*cos/2*c
+    RHS[2] = -pi*lam**2*_G*(rho_cl - rho_amb)*B**2
+    # species
+    c = pi*lam**2*B/(lam**2 + 1)
+    LHS[3, 0] = B*Y_cl*rho_cl*c
+    LHS[3, 1] = 2*V_cl*Y_cl*rho_cl*c
+    LHS[3, 2] = B*V_cl*Y_cl*c
+    LHS[3, 3] = B*V_cl*rho_cl*c
+    RHS[3] = Yamb*RHS[0]
+    # energy
+    LHS[4, 0] = 2*pi*ener[0] + pi/(6*lam**2 + 2)*(3*lam**2*rho_cl + rho_amb)*B**2*V_cl**2
+    LHS[4, 1] = 2*pi*ener[1] + pi/(9*lam**2 + 3)*(3*lam**2*rho_cl + rho_amb)*V_cl**3*B
+    LHS[4, 2] = 2*pi*ener[2] + pi/(6*lam**2 + 2)*lam**2*B**2*V_cl**3
+    LHS[4, 3] = 2*pi*ener[3]
+    RHS[4] = h_amb0*RHS[0]
+
+    dz = np.empty(7)
+    dz[:5] = np.linalg.solve(LHS, RHS)
+    dz[5], dz[6] = cos, sin
+    return dz
+
+
+@_jit
+def flame_govEqns(V_cl, B, theta, f_cl, Gf, GV, Hf, HV, w, wr,
+                  fvals, T_vals, drhodf_vals, MW_rich, MW_lean, MW_reac, eta_coeff, Preac,
+                  rho_amb, Emom, alpha_buoy, rho_exp, wind_speed):
+    '''
+    Flame._govEqns for the dependent variables (V_cl, B, theta, f_cl, x, y).
+
+    Gf, GV, Hf, HV, w, and wr are the profile shapes and weights on the radial grid (normalized by B) from
+    Flame._integration_grid, and fvals through Preac are the product tables and constants of the
+    Combustion object used by Combustion.rho_drhodf.
+    '''
+    # integrals (times 1/B**2) of the left-hand side terms, and of (rho_amb - rho)*r (last entry)
+    I = np.zeros(11)
+    # integral (times 1/B) of (rho_amb - rho)
+    rho_int = 0.
+    n_f = fvals.shape[0]
+    for i in range(Gf.shape[0]):
+        f = min(max(f_cl*Gf[i], 0.), 1.)
+        V = V_cl*GV[i]
+        dfdB = f_cl/B*Hf[i]
+        dVdB = V_cl/B*HV[i]
+
+        # density and its derivative, as in Combustion.rho_drhodf
+        hi = min(np.searchsorted(fvals, f, side='right'), n_f - 1)
+        lo = hi - 1
+        x = (f - fvals[lo])/(fvals[hi] - fvals[lo])
+        T = T_vals[lo] + x*(T_vals[hi] - T_vals[lo])
+        drhodf = drhodf_vals[lo] + x*(drhodf_vals[hi] - drhodf_vals[lo])
+        eta = eta_coeff*(MW_reac/(1.e-99 + f) - MW_reac)
+        a = MW_lean if eta > 1 else MW_rich
+        rho = Preac*(a[0] + a[1]*eta)/(a[2] + a[3]*eta)/(_R*T)
+
+        drhodf_V = drhodf*V
+        rho_V = rho*V
+        p0 = rho*GV[i]
+        p1 = drhodf_V*dfdB + rho*dVdB
+        p2 = drhodf_V*Gf[i]
+        I[0] += wr[i]*p0
+        I[1] += wr[i]*p1
+        I[2] += wr[i]*p2
+        I[3] += wr[i]*rho_V*GV[i]
+        I[4] += wr[i]*(p1*V + rho_V*dVdB)
+        I[5] += wr[i]*rho_V*V
+        I[6] += wr[i]*p2*V
+        I[7] += wr[i]*p0*f
+        I[8] += wr[i]*(p1*f + rho_V*dfdB)
+        I[9] += wr[i]*(p2*f + rho_V*Gf[i])
+        I[10] += wr[i]*(rho_amb - rho)
+        rho_int += w[i]*(rho_amb - rho)
+    I *= B**2
+    rho_int *= B
+
+    cos, sin = math.cos(theta), math.sin(theta)
+    Ebuoy = 2*_PI*alpha_buoy*sin*_G*rho_int/(B*V_cl*rho_exp)
+    E = Emom + Ebuoy
+
+    # columns are V_cl, B, theta, f_cl
+    LHS = np.zeros((4, 4))
+    RHS = np.zeros(4)
+    LHS[0, 0], LHS[0, 1], LHS[0, 3] = I[0], I[1], I[2]
+    RHS[0] = rho_amb*E/(2*_PI)
+    LHS[1, 0], LHS[1, 1], LHS[1, 2], LHS[1, 3] = 2*cos*I[3], cos*I[4], -sin*I[5], cos*I[6]
+    RHS[1] = wind_speed*rho_amb*E/(2*_PI)
+    LHS[2, 0], LHS[2, 1], LHS[2, 2], LHS[2, 3] = 2*sin*I[3], sin*I[4], cos*I[5], sin*I[6]
+    RHS[2] = _G*I[10]
+    LHS[3, 0], LHS[3, 1], LHS[3, 3] = I[7], I[8], I[9]
+
+    dz = np.empty(6)
+    dz[:4] = np.linalg.solve(LHS, RHS)
+    dz[4], dz[5] = cos, sin
+    return dz
+
+
+@_jit
+def layer_gov_eqns(Vol, c, A, H, vent_H, vent_Cd, vent_A, Qw, y, B, V_cl, Q_jet, MW_ratio):
+    '''
+    LayeringJet._gov_eqns for the layer volume and concentration, where y, B, and V_cl are the jet trajectory,
+    half-width, and centerline velocity, and MW_ratio is the ratio of the fluid and air molecular weights.
+    '''
+    H_layer = min(Vol/A, H)
+    H_vent = H_layer - (H - vent_H)
+    y_layer = H - H_layer
+
+    Qj = _PI*np.interp(y_layer, y, B)**2*np.interp(y_layer, y, V_cl)
+    if H_vent > 0:
+        QB = vent_Cd*vent_A*math.sqrt(_G*c*(1 - MW_ratio)*H_vent)
+        dVdt = Qj - (math.sqrt(QB**2 + Qw**2) + Q_jet)
+        if H_layer == H:
+            dVdt = min(0., dVdt)
+    else:
+        dVdt = max(0., Qj - (abs(Qw) + Q_jet))
+
+    dcdt = (Q_jet - c*Qj)/Vol
+    if c >= 1:
+        dcdt = min(0., dcdt)
+    elif c <= 0:
+        dcdt = max(0., dcdt)
+    return np.array([dVdt, dcdt])
@@ -13,6 +13,8 @@ from scipy import integrate
 import scipy.constants as const
 
 from ._jet import Jet
+from . import _kernels
+from ._kernels import compiled_kernels
 
 
 class LayeringJet(Jet):
@@ -74,6 +76,13 @@ class LayeringJet(Jet):
         '''
         Vol, c = Vol_conc  # Layer Volume, Layer Volume fraction (or mole fraction)
 
+        if compiled_kernels.enabled:
+            vent = enclosure.ceiling_vent
+            return _kernels.layer_gov_eqns(Vol, c, float(enclosure.A), float(enclosure.H), float(vent.H),
+                                           float(vent.Cd), float(vent.A), float(enclosure.floor_vent.Qw),
+                                           self.y, self.B, self.V_cl, float(self.Q_jet),
+                                           self.fluid.therm.MW / self.ambient.therm.MW)
+
         H_layer = min(Vol/enclosure.A, enclosure.H)  # height of a uniform layer with volume Vol
         H_vent  = H_layer - (enclosure.H - enclosure.ceiling_vent.H) # amount of layer height being exhausted by ceiling vent
         y_layer = enclosure.H - H_layer  # y-coordinate of bottom of flammable layer
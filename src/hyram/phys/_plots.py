@@ -35,7 +35,7 @@ def plot_sliced_contour(contours, xlims, ylims, zlims, nx, ny, nz,
     ----------
     contours : list-like
         contour levels to show on plot;
-        only first value is used to determine furthest contour
+        axis limits that are not given are set by the furthest of them
     xlims : tuple/list or None
         x-limits for plot
         (if None, will be determined based on furthest contour)
@@ -52,9 +52,9 @@ def plot_sliced_contour(contours, xlims, ylims, zlims, nx, ny, nz,
     nz : int
         number of points to solve for in the z-direction
     distance_func : callable
-        function/method that will calculate the distance to furthest contour;
-        must accept an effect value as the first argument argument,
-        a keyword argument of direction,
+        function/method that will calculate the distances to the contours;
+        must accept an array of effect values as the first argument,
+        keyword arguments of direction, negative_direction, and method ('brent' is used),
         followed by whatever other arguments are used
     value_func : callable
         function/method that will calculate values for contour plot;
@@ -88,17 +88,19 @@ def plot_sliced_contour(contours, xlims, ylims, zlims, nx, ny, nz,
         If savefig is True, returns filename of the corresponding plot.
         If savefig is false, returns fig object.
     '''
-    furthest_contour = contours[0] * 1000  # convert from kilo
+    levels = np.asarray(contours, dtype=float) * 1000  # convert from kilo
     default_scaling = 1.1  # default scaling is 10% past furthest contour
 
     if xlims is None:
-        pos_x_distance_to_contour = distance_func(furthest_contour,
-                                                  direction='x',
-                                                  *args, **kwargs)
-        neg_x_distance_to_contour = distance_func(furthest_contour,
-                                                  direction='x',
-                                                  negative_direction=True,
-                                                  *args, **kwargs)
+        pos_x_distance_to_contour = np.max(distance_func(levels,
+                                                         direction='x',
+                                                         method='brent',
+                                                         *args, **kwargs))
+        neg_x_distance_to_contour = np.min(distance_func(levels,
+                                                         direction='x',
+                                                         negative_direction=True,
+                                                         method='brent',
+                                                         *args, **kwargs))
         padded_pos_x_distance = default_scaling * pos_x_distance_to_contour
         padded_neg_x_distance = default_scaling * neg_x_distance_to_contour
         dx = (padded_pos_x_distance - padded_neg_x_distance) / nx
@@ -108,9 +110,10 @@ def plot_sliced_contour(contours, xlims, ylims, zlims, nx, ny, nz,
         x0 = slice(xlims[0], xlims[1], dx)
 
     if ylims is None:
-        y_distance_to_contour = distance_func(furthest_contour,
-                                              direction='y',
-                                              *args, **kwargs)
+        y_distance_to_contour = np.max(distance_func(levels,
+                                                     direction='y',
+                                                     method='brent',
+                                                     *args, **kwargs))
         padded_y_distance = default_scaling * y_distance_to_contour
         dy = padded_y_distance / ny
         y0 = slice(0, padded_y_distance, dy)
@@ -119,9 +122,10 @@ def plot_sliced_contour(contours, xlims, ylims, zlims, nx, ny, nz,
         y0 = slice(ylims[0], ylims[1], dy)
 
     if zlims is None:
-        z_distance_to_contour = distance_func(furthest_contour,
-                                              direction='z',
-                                              *args, **kwargs)
+        z_distance_to_contour = np.max(distance_func(levels,
+                                                     direction='z',
+                                                     method='brent',
+                                                     *args, **kwargs))
         padded_z_distance = default_scaling * z_distance_to_contour
         dz = 2 * padded_z_distance / nz
         z0 = slice(-padded_z_distance, padded_z_distance, dz)
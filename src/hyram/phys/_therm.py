@@ -6,18 +6,225 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
 import warnings
+import zipfile
+from functools import lru_cache
 
 from CoolProp import CoolProp
 import numpy as np
 from scipy import optimize, interpolate
 from scipy import constants as const
 
+from .. import __version__
 from ._fuel_props import FuelProperties
 from ..utilities.custom_warnings import PhysicsWarning
 
 
 
+class PropertyCache:
+    def __init__(self, maxsize=4096, digits=12):
+        '''
+        Size-bounded, least-recently-used cache of equation of state results.
+
+        Shared by all CoolPropWrapper instances so that repeated lookups of the same
+        state (e.g., the upstream fluid of every leak size in a QRA) are only
+        calculated once.  The cache is disabled by default and must be turned on
+        using the enable method.
+
+        Parameters
+        ----------
+        maxsize : int
+            maximum number of states to keep, least recently used states are dropped first
+        digits : int
+            number of significant digits to which input values are rounded to form the key
+
+        Contents
+        --------
+        self.hits : int
+            number of lookups returned from the cache
+        self.misses : int
+            number of lookups that required an equation of state calculation
+        '''
+        self.maxsize, self.digits = maxsize, digits
+        self.enabled = False
+        self._data = OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def enable(self, maxsize=None, digits=None):
+        '''turns on caching, optionally changing the maximum size or number of significant digits'''
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if digits is not None:
+            self.digits = digits
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        self.enabled = True
+
+    def disable(self):
+        '''turns off caching and clears any stored values'''
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        '''removes all stored values and resets the hit/miss counters'''
+        self._data.clear()
+        self.hits, self.misses = 0, 0
+
+    def info(self):
+        '''returns dictionary of cache statistics'''
+        return {'enabled':self.enabled, 'hits':self.hits, 'misses':self.misses,
+                'size':len(self._data), 'maxsize':self.maxsize}
+
+    def make_key(self, species, output, inputs):
+        '''
+        Creates a hashable key from the species, output(s), and input parameters.
+        Returns None if the inputs cannot be cached (e.g., arrays of values).
+        '''
+        key_inputs = []
+        for k, v in inputs.items():
+            if k == 'phase':
+                key_inputs.append((k, v))
+                continue
+            if isinstance(v, (list, np.ndarray)):
+                if np.size(v) != 1:
+                    return None
+                v = np.ravel(v)[0]
+            try:
+                v = float(f'{float(v):.{self.digits}g}')
+            except (TypeError, ValueError):
+                return None
+            key_inputs.append((k, v))
+        if isinstance(output, (list, tuple)):
+            output = tuple(output)
+        return (species, output, tuple(key_inputs))
+
+    def lookup(self, key, calculate):
+        '''returns the stored value for key, calling calculate() and storing the result if not found'''
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            value = calculate()
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        if isinstance(value, list):
+            return list(value)
+        if isinstance(value, np.ndarray):
+            return value.copy()
+        return value
+
+
+property_cache = PropertyCache()
+
+
+class CombustionCache:
+    # version of the saved tables, part of the key so that files saved before the tables (or the way that they are
+    # calculated, e.g., Combustion._T_combustion) changed are not used - increment when they change
+    format_version = 1
+    table_names = ('fvals', 'T_prod', 'drhodf', 'MW_prod', 'absorption_coeff')
+
+    def __init__(self, directory=None, digits=12):
+        '''
+        On-disk cache of the tables calculated when initializing a Combustion object.
+
+        Tables (product temperature and density derivative at each mixture fraction, and
+        the absorption coefficient) are saved to a NumPy .npz file for each fuel species,
+        reactant temperature and pressure, number of points, and HyRAM+ and table format versions,
+        so that later runs (including new processes) load them rather than solving for the combustion
+        temperatures.  Files that cannot be read are treated as missing, and are replaced by newly calculated tables.
+        The cache is disabled by default and must be turned on using the enable method.
+
+        Parameters
+        ----------
+        directory : str or None
+            folder for the cache files, default of None uses a 'hyram_combustion_cache'
+            folder in the user's home directory
+        digits : int
+            number of significant digits to which reactant temperature and pressure are rounded to form the key
+
+        Contents
+        --------
+        self.hits : int
+            number of tables loaded from the cache
+        self.misses : int
+            number of tables that were calculated
+        '''
+        if directory is None:
+            directory = os.path.join(os.path.expanduser('~'), 'hyram_combustion_cache')
+        self.directory, self.digits = directory, digits
+        self.enabled = False
+        self.hits, self.misses = 0, 0
+
+    def enable(self, directory=None):
+        '''turns on caching, optionally changing the cache folder'''
+        if directory is not None:
+            self.directory = directory
+        self.enabled = True
+
+    def disable(self):
+        '''turns off caching (saved files are kept - see clear)'''
+        self.enabled = False
+
+    def clear(self):
+        '''deletes all saved tables and resets the hit/miss counters'''
+        if os.path.isdir(self.directory):
+            for filename in os.listdir(self.directory):
+                if filename.startswith('combustion_') and filename.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, filename))
+        self.hits, self.misses = 0, 0
+
+    def info(self):
+        '''returns dictionary of cache statistics'''
+        if os.path.isdir(self.directory):
+            size = len([filename for filename in os.listdir(self.directory)
+                        if filename.startswith('combustion_') and filename.endswith('.npz')])
+        else:
+            size = 0
+        return {'enabled':self.enabled, 'hits':self.hits, 'misses':self.misses,
+                'size':size, 'directory':self.directory}
+
+    def filename(self, species, Treac, Preac, numpoints):
+        '''returns the cache file path for the given Combustion inputs'''
+        key = '%s|%.*g|%.*g|%d|%s|%d' % (species, self.digits, Treac, self.digits, Preac, numpoints, __version__,
+                                         self.format_version)
+        return os.path.join(self.directory, 'combustion_%s.npz' % hashlib.sha1(key.encode()).hexdigest())
+
+    def load(self, filename):
+        '''returns dictionary of saved tables, or None if they have not been saved (or cannot be read)'''
+        try:
+            with np.load(filename) as data:
+                tables = {k:data[k] for k in self.table_names}
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tables
+
+    def save(self, filename, **tables):
+        '''saves tables (written to a temporary file first so that other processes never read a partial file)'''
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(suffix='.npz', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **tables)
+            os.replace(temp_filename, filename)
+        except OSError:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            warnings.warn('Unable to save combustion tables to %s' % self.directory, category=PhysicsWarning)
+
+
+combustion_cache = CombustionCache()
+
+
 class CoolPropWrapper:
     def __init__(self, species):
         '''
@@ -28,6 +235,79 @@ class CoolPropWrapper:
         self._cp = CoolProp
         self.spec = species
         self.MW = self._cp.PropsSI(self.spec, 'molemass')
+        self._init_blend_state()
+
+    def _init_blend_state(self):
+        '''
+        Creates a single AbstractState for a blend that is reused for every property calculation.
+        The last converged state is also stored so that it can be used as an initial guess.
+        '''
+        self._last_blend_state = None
+        if '&' not in self.spec:
+            self._eos = None
+            return
+        spec_names = '&'.join([s.split('[')[0] for s in self.spec.split('&')])
+        molefracs = [float(s.split('[')[1][:-1]) for s in self.spec.split('&')]
+        self._eos = self._cp.AbstractState('HEOS', spec_names)
+        self._eos.set_mole_fractions(molefracs)
+
+    def __getstate__(self):
+        # the CoolProp module and AbstractState objects cannot be pickled (e.g., to send to another process)
+        state = self.__dict__.copy()
+        del state['_cp']
+        state['_eos'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cp = CoolProp
+        last_state = self._last_blend_state
+        self._init_blend_state()
+        self._last_blend_state = last_state
+
+    def _update_blend_PT(self, P, T, guess_factors=range(2, 22, 2), warm_start_tol=0.1):
+        '''
+        Updates the blend AbstractState to pressure P and temperature T.
+
+        CoolProp's flash is tried first, followed by a set of ideal-gas density multiples (guess_factors).
+        When the flash failed for the last state and P and T are within warm_start_tol (relative) of it,
+        the last converged density (ideal-gas scaled) is used as a guess before either of these, as the
+        flash failing is slow.  The guessed solution skips the phase stability check, so it is not used
+        where the flash has been converging.  If nothing converges, the attempt is repeated
+        with a new AbstractState, as CoolProp's mixture solvers depend on the previous state of the object.
+        '''
+        guess = self._cp.PyGuessesStructure()
+        if self._last_blend_state is not None:
+            P_last, T_last, rhomolar_last = self._last_blend_state
+            if abs(P/P_last - 1) < warm_start_tol and abs(T/T_last - 1) < warm_start_tol:
+                guess.rhomolar = rhomolar_last*(P/P_last)*(T_last/T)
+                try:
+                    self._eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
+                    self._last_blend_state = (P, T, self._eos.rhomolar())
+                    return
+                except:
+                    pass
+
+        def update(eos):
+            try:
+                eos.update(self._cp.PT_INPUTS, P, T)
+                self._last_blend_state = None
+                return True
+            except:
+                pass
+            for factor in guess_factors:
+                guess.rhomolar = factor*P/(8.314*T) # unclear what the 'right' guess is (hence the loop)
+                try:
+                    eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
+                    self._last_blend_state = (P, T, eos.rhomolar())
+                    return True
+                except:
+                    pass
+            return False
+
+        if not update(self._eos):
+            self._init_blend_state()
+            update(self._eos)
 
     def _init_fluid_params(self, params):
         '''
@@ -162,6 +442,9 @@ class CoolPropWrapper:
         '''
         Wrapper on CoolProps PropsSI
 
+        If the module-level property_cache is enabled, results for previously
+        calculated states are returned from the cache.
+
         Parameters
         ----------
         output : list of strings
@@ -171,6 +454,16 @@ class CoolPropWrapper:
         -------
         Outputs from CoolProp listed within output (could be single value or list)
         '''
+        if property_cache.enabled and 'interp' not in self.__dict__:
+            key = property_cache.make_key(self.spec, output, kwargs)
+            if key is not None:
+                return property_cache.lookup(key, lambda: self._PropsSI(output, **kwargs))
+        return self._PropsSI(output, **kwargs)
+
+    def _PropsSI(self, output, **kwargs):
+        '''uncached equation of state calculation used by PropsSI'''
+        if any(np.size(val) > 1 for key, val in kwargs.items() if key != 'phase'):
+            return self._PropsSI_array(output, **kwargs)
         if 'phase' in kwargs:
             phase =  '|' + kwargs.pop('phase')
         else:
@@ -241,80 +534,39 @@ class CoolPropWrapper:
             if '&' not in self.spec:
                 return ValueError  # not a blend - some other issue
 
-            spec_names = '&'.join([s.split('[')[0] for s in self.spec.split('&')])
-            molefracs = [float(s.split('[')[1][:-1]) for s in self.spec.split('&')]
-            eos = self._cp.AbstractState('HEOS', spec_names)
-            eos.set_mole_fractions(molefracs)
-            guess = self._cp.PyGuessesStructure()
-
             def out(k):
+                eos = self._eos
                 if   k == 'D': return eos.rhomass()
                 elif k == 'S': return eos.smass()
                 elif k == 'H': return eos.hmass()
                 elif k == 'U': return eos.umass()
             if ('P' in kwargs) and ('T' in kwargs):
                 P = kwargs.pop('P'); T = kwargs.pop('T')
-                try:
-                    eos.update(self._cp.PT_INPUTS, P, T)
-                except:
-                    for i in range(10):
-                        guess.rhomolar = (i+1)*2*P/(8.314*T) # unclear what the 'right' guess is (hence the loop)
-                        try:
-                            eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
-                            break
-                        except:
-                            pass
+                self._update_blend_PT(P, T)
             elif ('T' in kwargs):
                 T = kwargs.pop('T')
                 k, v = list(kwargs.items())[0]
                 def err(P):
                     P = P[0]
-                    try:
-                        eos.update(self._cp.PT_INPUTS, P, T)
-                    except:
-                        for i in range(10):
-                            guess.rhomolar = (i+1)*2*P/(8.314*T) # unclear what the 'right' guess is (hence the loop)
-                            try:
-                                eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
-                                break
-                            except:
-                                pass
+                    self._update_blend_PT(P, T)
                     return v - out(k)
                 P = optimize.root(err, 101325.)['x'] # somewhat arbitrarily starts at 1 atm
             elif ('P' in kwargs):
                 P = kwargs.pop('P')
                 k, v = list(kwargs.items())[0]
                 def err(T):
-                    try:
-                        eos.update(self._cp.PT_INPUTS, P, T)
-                    except:
-                        for i in range(10):
-                            guess.rhomolar = (2*i+1)*P/(8.314*T) # unclear what the 'right' guess is (hence the loop)
-                            try:
-                                eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
-                                break
-                            except:
-                                pass
+                    self._update_blend_PT(P, T, guess_factors=range(1, 21, 2))
                     return v - out(k)
-                T = optimize.brentq(err, eos.Tmin(), eos.Tmax()) # not the most efficient here, but works
+                T = optimize.brentq(err, self._eos.Tmin(), self._eos.Tmax()) # not the most efficient here, but works
             else:
                 (k1, v1), (k2, v2) = list(kwargs.items())
                 warnings.warn('Only PT_inputs allowed for blends (this may not work) trying to solve for %s, %s inputs' % (k1, k2),
                               category=PhysicsWarning)
                 def err(TP):
                     T, P = TP
-                    try:
-                        eos.update(self._cp.PT_INPUTS, P, T)
-                    except:
-                        for i in range(10):
-                            guess.rhomolar = (i+1)*2*P/(8.314*T) # unclear what the 'right' guess is (hence the loop)
-                            try:
-                                eos.update_with_guesses(self._cp.PT_INPUTS, P, T, guess)
-                                break
-                            except:
-                                pass
+                    self._update_blend_PT(P, T)
                     return [v1 - out(k1), v2 - out(k2)]
-                T, P = optimize.root(err, [(eos.Tmin() + eos.Tmax())/2, 101325])['x']
+                T, P = optimize.root(err, [(self._eos.Tmin() + self._eos.Tmax())/2, 101325])['x']
 
             def map_outputs(key_or_keys, eos):
                 def out(k):
@@ -333,9 +585,42 @@ class CoolPropWrapper:
                     return [out(k) for k in key_or_keys]
                 else:
                     return out(key_or_keys)
-            return map_outputs(output, eos)
+            return map_outputs(output, self._eos)
         except:
             raise ValueError
+
+    def _PropsSI_array(self, output, **kwargs):
+        '''
+        Equation of state calculation for array inputs (broadcast together, of any shape)
+
+        Pure fluids use the CoolProp vector interface.  States that it cannot calculate, blends,
+        and isentropic interpolations are calculated one at a time (in C-order) by PropsSI.
+
+        Returns
+        -------
+        array (for a single output) or list of arrays (for a list of outputs) with the shape of the inputs
+        '''
+        phase = {'phase':kwargs.pop('phase')} if 'phase' in kwargs else {}
+        keys = list(kwargs.keys())
+        values = np.broadcast_arrays(*[np.asarray(val, dtype=float) for val in kwargs.values()])
+        outputs = [output] if isinstance(output, str) else list(output)
+        results = np.full((len(outputs),) + values[0].shape, np.nan)
+
+        if '&' not in self.spec and 'interp' not in self.__dict__ and len(keys) == 2:
+            k1 = keys[0] + ('|' + phase['phase'] if phase else '')
+            try:
+                out = self._cp.PropsSI(outputs, k1, values[0].ravel(), keys[1], values[1].ravel(), self.spec)
+                results = np.reshape(np.transpose(np.reshape(out, (values[0].size, len(outputs)))), results.shape)
+            except ValueError:
+                pass
+
+        # CoolProp returns inf for states in a vector that it could not calculate
+        for idx in np.ndindex(values[0].shape):
+            if not np.all(np.isfinite(results[(slice(None),) + idx])):
+                state = {key:val[idx] for key, val in zip(keys, values)}
+                results[(slice(None),) + idx] = self.PropsSI(outputs, **state, **phase)
+        return results[0] if isinstance(output, str) else list(results)
+
     def make_isentropic_interpolating_functions(self, fluid, P_min, P_max, npts_interp = 200, remove_points = True, rel_err = 1e-4):
         '''
         Generates dictionary of interpolating functions for other state parameters as functions of pressure for a given entropy
@@ -354,7 +639,7 @@ class CoolPropWrapper:
         '''
         S = self.get_property('S', P = fluid.P, D = fluid.rho)
         Ps = np.linspace(P_min, P_max, num=npts_interp)
-        H, D, U, T, Q, S_check = np.transpose([self.PropsSI(['H', 'D', 'U', 'T', 'Q', 'S'], P=P, S=S) for P in Ps])
+        H, D, U, T, Q, S_check = self.PropsSI(['H', 'D', 'U', 'T', 'Q', 'S'], P=Ps, S=S)
         good_pts = abs(S-S_check)/S < rel_err
         if remove_points and np.count_nonzero(good_pts) > 2:
             Ps, H, D, U, T, Q = [v[good_pts] for v in [Ps, H, D, U, T, Q]]
@@ -367,6 +652,162 @@ class CoolPropWrapper:
 
 
 
+class TabulatedWrapper(CoolPropWrapper):
+    def __init__(self, species, P_range=(101325., 1e8), T_range=(200., 600.), num_P=60, num_T=60, rtol=1e-4):
+        '''
+        Equation of state that interpolates properties from tables that are calculated once using CoolProp.
+
+        Bicubic splines of density (D), enthalpy (H), entropy (S), internal energy (U), speed of sound (A),
+        specific heat (C), and temperature (T) are fit over (log(P), T) and over (log(P), S).
+        Each table cell is checked against CoolProp at its center, and cells with an error above rtol
+        (e.g., those that span a phase change) are not used.  Errors are relative to the value for
+        D, A, C, and T, and relative to the range of values in the table for H, S, and U, which have
+        arbitrary reference states.  Properties that use other inputs or that are outside of the
+        valid table cells are calculated by CoolPropWrapper.
+
+        Only the (log(P), T) table is calculated for blends, as CoolProp does not solve
+        pressure-entropy inputs for blends.
+
+        Parameters
+        ----------
+        species : string
+            species (either formula or name - see CoolProp documentation)
+        P_range : tuple of floats
+            (minimum, maximum) pressure of the tables (Pa)
+        T_range : tuple of floats
+            (minimum, maximum) temperature of the tables (K)
+        num_P : int
+            number of pressures in the tables (logarithmically spaced)
+        num_T : int
+            number of temperatures (or entropies) in the tables
+        rtol : float
+            maximum relative error of interpolated properties
+        '''
+        super().__init__(species)
+        self.rtol = rtol
+        logP = np.linspace(np.log(P_range[0]), np.log(P_range[1]), num_P)
+        T = np.linspace(T_range[0], T_range[1], num_T)
+        self._tables = {'T':self._build_table(logP, T, 'T')}
+        if self._eos is None:
+            S_nodes = self._tables['T']['nodes']['S']
+            S = np.linspace(np.nanmin(S_nodes), np.nanmax(S_nodes), num_T)
+            self._tables['S'] = self._build_table(logP, S, 'S')
+
+    _table_outputs = ['D', 'H', 'S', 'U', 'A', 'C', 'T']
+
+    def _exact_properties(self, P, x, x_key):
+        '''
+        Calculates tabulated properties at pressure P and temperature or entropy x using CoolProp
+
+        Returns a dict of properties keyed by the labels in _table_outputs and 'phase'
+        (set to NaN where CoolProp did not converge)
+        '''
+        props = {k:np.full(np.shape(P), np.nan) for k in self._table_outputs + ['phase']}
+        if self._eos is None:
+            eos = self._cp.AbstractState('HEOS', self.spec)
+        inputs = {'T':self._cp.PT_INPUTS, 'S':self._cp.PSmass_INPUTS}[x_key]
+        for idx in np.ndindex(np.shape(P)):
+            try:
+                if self._eos is None:
+                    try:
+                        eos.update(inputs, P[idx], x[idx])
+                    except ValueError:
+                        # CoolProp's solvers depend on the previous state
+                        eos = self._cp.AbstractState('HEOS', self.spec)
+                        eos.update(inputs, P[idx], x[idx])
+                else:
+                    self._update_blend_PT(P[idx], x[idx])
+                    eos = self._eos
+                    if not np.isclose(eos.T(), x[idx]):
+                        continue
+                values = [eos.rhomass(), eos.hmass(), eos.smass(), eos.umass(), eos.speed_sound(), eos.cpmass(), eos.T(), eos.phase()]
+            except ValueError:
+                continue
+            for k, v in zip(self._table_outputs + ['phase'], values):
+                props[k][idx] = v
+        return props
+
+    def _build_table(self, logP, x, x_key):
+        '''
+        Calculates properties on the (logP, x) grid, fits splines to them, and determines which cells
+        are within the error tolerance.
+        '''
+        logP_grid, x_grid = np.meshgrid(logP, x, indexing='ij')
+        nodes = self._exact_properties(np.exp(logP_grid), x_grid, x_key)
+
+        splines = {}
+        for k in self._table_outputs:
+            values = nodes[k].copy()
+            for row in values: # fill unconverged points (whose cells are not used) so that splines can be fit
+                good = np.isfinite(row)
+                row[~good] = np.interp(x[~good], x[good], row[good]) if np.any(good) else 0
+            splines[k] = interpolate.RectBivariateSpline(logP, x, values)
+
+        # cells must have converged corners of the same phase (liquid-like, two-phase, or vapor-like)
+        phase = nodes['phase']
+        liquid = np.isin(phase, [self._cp.iphase_liquid, self._cp.iphase_supercritical_liquid])
+        vapor = np.isfinite(phase) & ~liquid & (phase != self._cp.iphase_twophase)
+        def corners_all(a):
+            return a[:-1, :-1] & a[1:, :-1] & a[:-1, 1:] & a[1:, 1:]
+        valid = corners_all(liquid) | corners_all(vapor)
+
+        logP_mid, x_mid = (logP[:-1] + logP[1:])/2, (x[:-1] + x[1:])/2
+        logP_mid_grid, x_mid_grid = np.meshgrid(logP_mid, x_mid, indexing='ij')
+        exact = self._exact_properties(np.exp(logP_mid_grid), x_mid_grid, x_key)
+        for k in self._table_outputs:
+            if k in ['H', 'S', 'U']:
+                scale = np.nanmax(nodes[k]) - np.nanmin(nodes[k])
+            else:
+                scale = np.abs(exact[k])
+            with np.errstate(invalid='ignore'):
+                err = np.abs(splines[k].ev(logP_mid_grid, x_mid_grid) - exact[k])/scale
+            valid &= err <= self.rtol
+        return {'logP':logP, 'x':x, 'nodes':nodes, 'splines':splines, 'valid':valid}
+
+    def PropsSI(self, output, **kwargs):
+        '''
+        Equation of state calculation that interpolates from the tables for pressure and temperature
+        or pressure and entropy inputs within the valid table cells and otherwise uses CoolPropWrapper.PropsSI
+
+        Parameters
+        ----------
+        output : list of strings
+            Same parameters accepted by CoolProp.PropsSI (e.g., T, P, S, D)
+
+        Returns
+        -------
+        Outputs listed within output (could be single value or list)
+        '''
+        if 'interp' not in self.__dict__ and len(kwargs) == 2 and 'P' in kwargs:
+            out = self._interpolate(output, kwargs)
+            if out is not None:
+                return out
+        return super().PropsSI(output, **kwargs)
+
+    def _interpolate(self, output, inputs):
+        '''returns interpolated outputs, or None if they cannot be calculated from the tables'''
+        keys = [output] if isinstance(output, str) else list(output)
+        x_key = [k for k in inputs if k != 'P'][0]
+        if x_key not in self._tables or any(k not in self._table_outputs for k in keys):
+            return None
+        table = self._tables[x_key]
+        logP, x = np.broadcast_arrays(np.log(np.asarray(inputs['P'], dtype=float)),
+                                      np.asarray(inputs[x_key], dtype=float))
+        i = np.searchsorted(table['logP'], logP, side='right') - 1
+        j = np.searchsorted(table['x'], x, side='right') - 1
+        n_P, n_x = table['valid'].shape
+        if np.any((i < 0) | (i > n_P) | (j < 0) | (j > n_x)):
+            return None
+        # upper edge of the table is part of the last cell
+        inside = np.where(i == n_P, logP == table['logP'][-1], True) & np.where(j == n_x, x == table['x'][-1], True)
+        if not np.all(inside) or not np.all(table['valid'][np.minimum(i, n_P - 1), np.minimum(j, n_x - 1)]):
+            return None
+        values = [table['splines'][k].ev(logP, x) for k in keys]
+        if logP.size == 1:
+            values = [float(v) for v in values]
+        return values[0] if isinstance(output, str) else values
+
+
 class Combustion:
     def __init__(self, fluid, #ambient, # TODO: add ambient object
                  numpoints = 100, verbose = False):
@@ -413,19 +854,39 @@ class Combustion:
         ifstoich = int(max(numpoints*self.fstoich, 5))
         fvals = np.append(np.linspace(0, self.fstoich, int(max(numpoints*self.fstoich, 5))),
                           np.linspace(self.fstoich, 1, int(max(numpoints*(1-self.fstoich), 5))))
-        T = self._T_combustion(self.Treac, fvals)
-        MWvals = self._MWmix(self._Yprod(fvals))
 
         # Creates some interpolating functions - only create them once during initialization to save computational time later
-        self.MW_prod = lambda f: self._MWmix(self._Yprod(f))
-        self.T_prod = interpolate.interp1d(fvals, T)
-        self.rho_prod = lambda f: self.Preac*self.MW_prod(f)/(const.R*self.T_prod(f))
-        self.drhodf = interpolate.interp1d(fvals,
-                                           self.Preac/(const.R*T)*(np.append(np.gradient(MWvals[:ifstoich], fvals[:ifstoich]),
-                                                                   np.gradient(MWvals[ifstoich:], fvals[ifstoich:])) -
-                                                                   np.append(np.gradient(T[:ifstoich], fvals[:ifstoich]),
-                                                                   np.gradient(T[ifstoich:], fvals[ifstoich:]))/T*MWvals))
-        self.absorption_coeff = self._plank_mean_absorption_coefficient_stoich()
+        tables = None
+        if combustion_cache.enabled:
+            cache_file = combustion_cache.filename(self.reac, self.Treac, self.Preac, numpoints)
+            tables = combustion_cache.load(cache_file)
+        if tables is not None:
+            T, drhodf = tables['T_prod'], tables['drhodf']
+            self.T_prod = interpolate.interp1d(fvals, T)
+            self.absorption_coeff = float(tables['absorption_coeff'])
+        else:
+            T = self._T_combustion(self.Treac, fvals)
+            MWvals = self._MWmix(self._Yprod(fvals))
+            drhodf = self.Preac/(const.R*T)*(np.append(np.gradient(MWvals[:ifstoich], fvals[:ifstoich]),
+                                                       np.gradient(MWvals[ifstoich:], fvals[ifstoich:])) -
+                                             np.append(np.gradient(T[:ifstoich], fvals[:ifstoich]),
+                                                       np.gradient(T[ifstoich:], fvals[ifstoich:]))/T*MWvals)
+            self.T_prod = interpolate.interp1d(fvals, T)
+            self.absorption_coeff = self._plank_mean_absorption_coefficient_stoich()
+            if combustion_cache.enabled:
+                combustion_cache.save(cache_file, fvals=fvals, T_prod=T, drhodf=drhodf,
+                                      MW_prod=self.MW_prod(fvals), absorption_coeff=self.absorption_coeff)
+        self.drhodf = interpolate.interp1d(fvals, drhodf)
+        self._fvals, self._T_vals, self._drhodf_vals = fvals, T, drhodf
+        # product moles and mass (per mole of fuel) are linear in eta on either side of stoichiometric,
+        # stored as [mass intercept, mass slope, moles intercept, moles slope] for rho_drhodf
+        MW, x = self.MW, self.xO2stoich
+        self._MW_rich = np.array([MW[self.reac],
+                                  -MW[self.reac] + self._nC*MW['CO2'] + self._nH/2*MW['H2O'] + 3.76*x*MW['N2'],
+                                  1., -1. + self._nC + self._nH/2 + 3.76*x])
+        self._MW_lean = np.array([self._nC*MW['CO2'] + self._nH/2*MW['H2O'] - x*MW['O2'],
+                                  x*(MW['O2'] + 3.76*MW['N2']),
+                                  self._nC + self._nH/2 - x, x*(1 + 3.76)])
         if verbose:
             print('done.')
 
@@ -435,6 +896,38 @@ class Combustion:
         than creating a new instance taking up additional memory.'''
         self.__init__(fluid, numpoints)
 
+    def MW_prod(self, f):
+        '''mixture averaged molecular weight of products (g/mol) at mixture fraction f'''
+        return self._MWmix(self._Yprod(f))
+
+    def rho_prod(self, f):
+        '''density of products (kg/m^3) at mixture fraction f'''
+        return self.Preac*self.MW_prod(f)/(const.R*self.T_prod(f))
+
+    def rho_drhodf(self, f):
+        '''
+        Density of products (kg/m^3) and its derivative with respect to mixture fraction at mixture fraction f.
+
+        Equivalent to (self.rho_prod(f), self.drhodf(f)), but both values share a single search of the
+        mixture fraction table and the molecular weight of the products is evaluated without building
+        the mass fraction dictionary, which makes this much faster for the repeated calls in Flame._govEqns.
+        '''
+        f = np.asarray(f, dtype=float)
+        fvals = self._fvals
+        if f.size and (f.min() < fvals[0] or f.max() > fvals[-1]):
+            raise ValueError('mixture fraction outside of interpolation range [%g, %g]' % (fvals[0], fvals[-1]))
+        # same interval selection as interpolate.interp1d (right-hand value at the repeated stoichiometric point)
+        hi = np.minimum(np.searchsorted(fvals, f, side='right'), len(fvals) - 1)
+        lo = hi - 1
+        w = (f - fvals[lo])/(fvals[hi] - fvals[lo])
+        T = self._T_vals[lo] + w*(self._T_vals[hi] - self._T_vals[lo])
+        drhodf = self._drhodf_vals[lo] + w*(self._drhodf_vals[hi] - self._drhodf_vals[lo])
+        eta = self._eta(f)
+        a0, a1, b0, b1 = np.where(eta > 1, self._MW_lean.reshape((4,) + (1,)*f.ndim),
+                                  self._MW_rich.reshape((4,) + (1,)*f.ndim))
+        MW = (a0 + a1*eta)/(b0 + b1*eta)
+        return self.Preac*MW/(const.R*T), drhodf
+
     def _MWmix(self, Y):
         '''returns the mixture averaged molecular weight, given a mass fraction'''
         MWmix = 0
@@ -500,24 +993,52 @@ class Combustion:
         '''returns dictionary of interpolating enthalpy functions from Tmin to Tmax'''
         Hdict = {}
         for spec in self.therm.keys():
-            T = np.linspace(np.max([Tmin, self.therm[spec]._cp.PropsSI('T_min', spec)+0.1]), Tmax, npoints)
-            try:
-                Hdict[spec] = interpolate.interp1d(T, self.therm[spec].get_property('H', T = T, P = self.Preac),
-                                                   fill_value = 'extrapolate')
-            except:
-                Hdict[spec] = interpolate.interp1d(T, [self.therm[spec].get_property('H', T = Tval, P = self.Preac) for Tval in T],
-                                                   fill_value = 'extrapolate')
+            T, H = _enthalpy_table(spec, Tmin, Tmax, self.Preac, npoints)
+            Hdict[spec] = interpolate.interp1d(T, H, fill_value = 'extrapolate', assume_sorted = True)
         return Hdict
 
-    def _T_combustion(self, T_reac, f, numpoints = 500):
-        '''combustion temperature (K)'''
-        DHc = self.DHc*self._Yprod(f)['H2O']/(self._nH/2)*self.MW[self.reac]/self.MW['H2O'] # heat of combustion [J/kg_total_products]
+    def _T_combustion(self, T_reac, f, numpoints = 500, rtol = 1e-10, maxiter = 100):
+        '''
+        combustion temperature (K)
+
+        Each mixture fraction is solved for independently: the temperature is bracketed between two points
+        of the enthalpy table of the products, which is monotonic in temperature, then found by alternating
+        false position and bisection steps for all mixture fractions at once.
+        '''
+        f = np.asarray(f, dtype=float)
+        Yprod = self._Yprod(f)
+        DHc = self.DHc*Yprod['H2O']/(self._nH/2)*self.MW[self.reac]/self.MW['H2O'] # heat of combustion [J/kg_total_products]
         Hdict = self._Hdict(T_reac, npoints = numpoints)
         H0 = self._H(T_reac, self._Yreac(f), Hdict)
-        H0 *= self._MWmix(self._Yreac(f))/self._MWmix(self._Yprod(f)) #J/kg
-        H = H0 + DHc
-        T = optimize.root(lambda T: self._H(T, self._Yprod(f), Hdict) - H, T_reac*np.ones_like(np.array(f)))['x']
-        return T
+        H0 *= self._MWmix(self._Yreac(f))/self._MWmix(Yprod) #J/kg
+        H = np.broadcast_to(H0 + DHc, f.shape).ravel()
+        Yprod = {spec: np.broadcast_to(Yval, f.shape).ravel() for spec, Yval in Yprod.items()}
+
+        # bracket using enthalpy of the products at the temperatures of the table
+        Tvals = Hdict[self.reac].x
+        Hvals = sum(np.outer(Yval, Hdict[spec](Tvals)) for spec, Yval in Yprod.items())
+        hi = np.clip(np.sum(Hvals < H[:, np.newaxis], axis=1), 1, len(Tvals) - 1)
+        rows = np.arange(len(H))
+        T_lo, T_hi = Tvals[hi - 1], Tvals[hi]
+        H_lo, H_hi = Hvals[rows, hi - 1] - H, Hvals[rows, hi] - H
+        H_tol = rtol*np.abs(H_hi - H_lo)
+        T = np.where(np.abs(H_lo) <= np.abs(H_hi), T_lo, T_hi)
+        unconverged = (np.abs(H_lo) > H_tol) & (np.abs(H_hi) > H_tol)
+        for i in range(maxiter):
+            if not np.any(unconverged):
+                break
+            if i % 2:
+                T_new = (T_lo + T_hi)/2
+            else:
+                T_new = np.where(H_hi != H_lo, T_lo - H_lo*(T_hi - T_lo)/(H_hi - H_lo), (T_lo + T_hi)/2)
+            H_new = self._H(T_new, Yprod, Hdict) - H
+            T = np.where(unconverged, T_new, T)
+            below = (H_new < 0) & unconverged
+            above = (H_new >= 0) & unconverged
+            T_lo, H_lo = np.where(below, T_new, T_lo), np.where(below, H_new, H_lo)
+            T_hi, H_hi = np.where(above, T_new, T_hi), np.where(above, H_new, H_hi)
+            unconverged &= (np.abs(H_new) > H_tol) & (T_hi - T_lo > rtol*T_hi)
+        return T.reshape(f.shape)
 
     def _mean_absorption_coefficient(self, species, temperature, pressure=const.atm):
         '''
@@ -625,3 +1146,95 @@ class Combustion:
 
         deltaP  = self.Preac*((((Vol_total+Vol_gas)/Vol_total)*((Vol_total+VolStoich*(sigma-1))/Vol_total))**gamma-1)
         return deltaP
+
+
+class CombustionRegistry:
+    def __init__(self, maxsize=16):
+        '''
+        Process-wide, size-bounded registry of Combustion objects.
+
+        Combustion objects are keyed on fuel species, reactant temperature and pressure,
+        and number of points, and shared by Flame, IndoorRelease, and the QRA so that the
+        chemistry is only initialized once for each ambient state.  The registry is disabled
+        by default and must be turned on using the enable method; when disabled, a new
+        Combustion object is created for every request.  While it is enabled, every request
+        for the same state returns the same object, so objects from the registry must not be
+        modified (e.g., using Combustion.reinitilize).
+
+        Parameters
+        ----------
+        maxsize : int
+            maximum number of Combustion objects to keep, least recently used objects are dropped first
+
+        Contents
+        --------
+        self.hits : int
+            number of requests returned from the registry
+        self.misses : int
+            number of requests that required a new Combustion object
+        '''
+        self.maxsize = maxsize
+        self.enabled = False
+        self._data = OrderedDict()
+        self.hits, self.misses = 0, 0
+
+    def enable(self, maxsize=None):
+        '''turns on the registry, optionally changing the maximum size'''
+        if maxsize is not None:
+            self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        self.enabled = True
+
+    def disable(self):
+        '''turns off the registry and clears any stored objects'''
+        self.enabled = False
+        self.clear()
+
+    def clear(self):
+        '''removes all stored objects and resets the hit/miss counters'''
+        self._data.clear()
+        self.hits, self.misses = 0, 0
+
+    def info(self):
+        '''returns dictionary of registry statistics'''
+        return {'enabled':self.enabled, 'hits':self.hits, 'misses':self.misses,
+                'size':len(self._data), 'maxsize':self.maxsize}
+
+    def get(self, fluid, numpoints = 100):
+        '''
+        returns the Combustion object for a fluid (fuel species at the reactant temperature and pressure),
+        creating it if it has not been registered
+        '''
+        if not self.enabled:
+            return Combustion(fluid, numpoints = numpoints)
+        key = (fluid.species, float(fluid.T), float(fluid.P), int(numpoints))
+        try:
+            chem = self._data[key]
+        except KeyError:
+            self.misses += 1
+            chem = Combustion(fluid, numpoints = numpoints)
+            self._data[key] = chem
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return chem
+
+
+combustion_registry = CombustionRegistry()
+
+
+@lru_cache(maxsize=64)
+def _enthalpy_table(species, Tmin, Tmax, P, npoints):
+    '''
+    Enthalpy (J/kg) of a species at temperatures from Tmin (or just above the minimum temperature of the equation
+    of state) to Tmax at pressure P, shared by all Combustion objects with the same reactant conditions
+    '''
+    therm = CoolPropWrapper(species)
+    T = np.linspace(np.max([Tmin, therm._cp.PropsSI('T_min', species)+0.1]), Tmax, npoints)
+    H = np.asarray(therm.get_property('H', T = T, P = P), dtype=float)
+    T.flags.writeable = False
+    H.flags.writeable = False
+    return T, H
@@ -75,10 +75,9 @@ class Generic_overpressure_method:
                                 self.jet_object.S[::-1])
 
             # Get x and y coordinates from jet based on streamline coordinate
-            jet_x = np.interp(s_coord, self.jet_object.S, self.jet_object.x)
-            jet_y = np.interp(s_coord, self.jet_object.S, self.jet_object.y)
+            jet_vars = self.jet_object.interpolate(s_coord)
 
-            self.origin = (jet_x, jet_y, 0)
+            self.origin = (float(jet_vars['x']), float(jet_vars['y']), 0)
 
     @staticmethod
     def calc_distance(locations:list, origin) -> list:
@@ -188,28 +187,33 @@ class Generic_overpressure_method:
         impulses = impulses.reshape(x_y_shape)
         return impulses
 
-    def calc_distance_to_overpressure(self, overpressure, direction='x', negative_direction=False):
+    def calc_distance_to_overpressure(self, overpressure, direction='x', negative_direction=False, method='interpolation'):
         """
         Calculate distance from leak point to a given overpressure in the direction specified
 
         Parameters
         ----------
-        overpressure : float
-            Overpressure in Pa
+        overpressure : float or array-like
+            Overpressure(s) in Pa
         direction : 'x', 'y', or 'z' (optional)
             Direction for which to calculate the distance
             (default is 'x')
         negative_direction : Boolean (optional)
             Whether or not to look in the negative direction instead of positive
             (default is False)
+        method : 'brent' or 'interpolation' (optional)
+            Method used to find the distance where it is solved for numerically (see get_distance_to_effect);
+            methods with tabulated curves interpolate them directly
+            (default is 'interpolation')
 
         Returns
         -------
-        distance : float
+        distance : float or array-like
             Real distance (m) to overpressure from leak-point
         """
         scaled_overpressure = self.calc_scaled_overpressure(overpressure=overpressure)  # unitless
-        scaled_distance = self.get_scaled_distance_from_scaled_overpressure(scaled_overpressure=scaled_overpressure)
+        scaled_distance = self.get_scaled_distance_from_scaled_overpressure(scaled_overpressure=scaled_overpressure,
+                                                                           method=method)
         distance_from_overpressure_origin = self.calc_unscaled_distance(scaled_distance=scaled_distance)  # m
         if direction == 'x':
             distance_from_leakpoint_to_overpressure_origin = self.origin[0]
@@ -229,7 +233,7 @@ class Generic_overpressure_method:
         scaled_overpressure = overpressure / self.ambient_pressure  # unitless
         return scaled_overpressure
 
-    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure, max_distance=500):
+    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure, max_distance=500, method='interpolation'):
         # May be re-written by sub-classes below to use single interpolation rather than solver;
         # currently calculates distance and scales it in order to match syntax of re-written methods below
         overpressure = self.calc_unscaled_overpressure(scaled_overpressure)
@@ -237,7 +241,8 @@ class Generic_overpressure_method:
                                           from_point=self.origin,
                                           direction='x',  # does not matter, since overpressure is omni-directional
                                           effect_func=self.calculate_overpressure_for_list_of_locations,
-                                          max_distance=max_distance)
+                                          max_distance=max_distance,
+                                          method=method)
         scaled_distance = self.calc_scaled_distance(distance)
         return scaled_distance
 
@@ -246,28 +251,32 @@ class Generic_overpressure_method:
         distance = scaled_distance
         return distance
 
-    def calc_distance_to_impulse(self, impulse, direction='x', negative_direction=False):
+    def calc_distance_to_impulse(self, impulse, direction='x', negative_direction=False, method='interpolation'):
         """
         Calculate distance from leak point to a given impulse in the direction specified
 
         Parameters
         ----------
-        impulse : float
-            Impulse in Pa*s
+        impulse : float or array-like
+            Impulse(s) in Pa*s
         direction : 'x', 'y', or 'z', optional
             Direction for which to calculate the distance
             (default is 'x')
         negative_direction : Boolean (optional)
             Whether or not to look in the negative direction instead of positive
             (default is False)
+        method : 'brent' or 'interpolation' (optional)
+            Method used to find the distance where it is solved for numerically (see get_distance_to_effect);
+            methods with tabulated curves interpolate them directly
+            (default is 'interpolation')
 
         Returns
         -------
-        distance : float
+        distance : float or array-like
             Real distance (m) to impulse from leak-point
         """
         scaled_impulse = self.calc_scaled_impulse(impulse=impulse)
-        scaled_distance = self.get_scaled_distance_from_scaled_impulse(scaled_impulse=scaled_impulse)
+        scaled_distance = self.get_scaled_distance_from_scaled_impulse(scaled_impulse=scaled_impulse, method=method)
         distance_from_overpressure_origin = self.calc_unscaled_distance(scaled_distance=scaled_distance)  # m
         if direction == 'x':
             distance_from_leakpoint_to_overpressure_origin = self.origin[0]
@@ -288,7 +297,7 @@ class Generic_overpressure_method:
         scaled_impulse = np.full_like(impulse, np.nan)
         return scaled_impulse
 
-    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse):
+    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse, method='interpolation'):
         # Placeholder method; this will be over-written by sub-classes below
         scaled_distance = np.full_like(scaled_impulse, np.nan)
         return scaled_distance
@@ -472,7 +481,7 @@ class BST_method(Generic_overpressure_method):
         unscaled_impulse = scaled_impulse * self.energy ** (1/3) * self.ambient_pressure ** (2/3) / self.speed_of_sound # Pa*s
         return unscaled_impulse
 
-    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
+    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure, method='interpolation'):
         scaled_distance_data = self.scaled_peak_overpressure_data['scaled_distance_Mf' + str(self.mach_flame_speed)]
         scaled_overpressure_data = self.scaled_peak_overpressure_data['scaled_overpressure_Mf' + str(self.mach_flame_speed)]
         scaled_distance = np.interp(x=scaled_overpressure,
@@ -489,7 +498,7 @@ class BST_method(Generic_overpressure_method):
         scaled_impulse = impulse * self.speed_of_sound / self.energy ** (1/3) / self.ambient_pressure ** (2/3)
         return scaled_impulse
 
-    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse):
+    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse, method='interpolation'):
         scaled_distance_data = self.all_scaled_impulse_data['scaled_distance_Mf' + str(self.mach_flame_speed)]
         scaled_impulse_data = self.all_scaled_impulse_data['scaled_impulse_Mf' + str(self.mach_flame_speed)]
         scaled_distance = np.interp(x=scaled_impulse,
@@ -567,7 +576,7 @@ class TNT_method(Generic_overpressure_method):
         unscaled_impulse = scaled_impulse * self.equiv_TNT_mass ** (1/3)  # Pa*s
         return unscaled_impulse
 
-    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure):
+    def get_scaled_distance_from_scaled_overpressure(self, scaled_overpressure, method='interpolation'):
         scaled_peak_overP_data = self.scaled_peak_overP_data
         scaled_distance = np.interp(x=scaled_overpressure,  # unitless
                                     xp=scaled_peak_overP_data['scaled_overpressure'][::-1],
@@ -583,7 +592,7 @@ class TNT_method(Generic_overpressure_method):
         scaled_impulse = impulse / self.equiv_TNT_mass ** (1/3)  # Pa*s
         return scaled_impulse
 
-    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse):
+    def get_scaled_distance_from_scaled_impulse(self, scaled_impulse, method='interpolation'):
         scaled_impulse_data = self.scaled_impulse_data
         scaled_distance = np.interp(x=scaled_impulse,
                                     xp=scaled_impulse_data['scaled_impulse'][::-1],
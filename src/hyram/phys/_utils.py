@@ -6,18 +6,22 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 import numpy as np
+from scipy import optimize
 
 
 def get_distance_to_effect(value, from_point, direction, effect_func, *args,
                            max_distance=500, interpolation_points=10000,
-                           negative_direction=False, **kwargs):
+                           negative_direction=False, method='interpolation', bracket_points=100, **kwargs):
     """
     Calculates the distance from some starting point to a physical effect value of interest
 
+    With method='brent', the distance returned is the farthest from the from_point at which the effect
+    equals the value, or the location of the maximum effect if the value is never reached.
+
     Parameters
     ----------
     value: float or array-like
-        effect value of interest
+        effect value of interest, or several values (e.g., contour levels) to find in a single call
     from_point: array-like of length 3
         (x, y, z) location of reference point
         from which distance will be measured
@@ -34,11 +38,20 @@ def get_distance_to_effect(value, from_point, direction, effect_func, *args,
         (default value is 500)
     interpolation_points: int (optional)
         number of distance-points at which to calculate effects
-        and use for interpolation
+        and use for interpolation, if method is 'interpolation'
         (default value is 10,000)
     negative_direction : Boolean (optional)
         whether or not to look in the negative direction instead of positive
         (default is False)
+    method : 'brent' or 'interpolation' (optional)
+        'brent' brackets the distance using effects calculated at log-spaced distances,
+        then solves for it using Brent's method;
+        'interpolation' interpolates effects calculated at interpolation_points linearly spaced distances,
+        which requires the effects to increase monotonically from max_distance to the maximum effect
+        (default is 'interpolation')
+    bracket_points : int (optional)
+        number of log-spaced distance-points used for bracketing, if method is 'brent'
+        (default value is 100)
     **kwargs: keyword arguments, optional
         if provided, passed to effect_func
 
@@ -49,26 +62,158 @@ def get_distance_to_effect(value, from_point, direction, effect_func, *args,
         calculated from the from_point
         along the direction axis specified
     """
-    # TODO: Should this be changed to a solver instead of interpolation? Does 10,000 calculations
+    if direction not in ['x', 'y', 'z']:
+        raise ValueError(f"Direction ('{direction}') must be 'x', 'y', or 'z'")
     if negative_direction:
         max_distance = -1 * max_distance
-    distances = np.linspace(max_distance, 0, interpolation_points)
-    if direction == 'x':
-        x_values = from_point[0] + distances
-        y_values = from_point[1] * np.ones_like(distances)
-        z_values = from_point[2] * np.ones_like(distances)
-    elif direction == 'y':
-        x_values = from_point[0] * np.ones_like(distances)
-        y_values = from_point[1] + distances
-        z_values = from_point[2] * np.ones_like(distances)
-    elif direction == 'z':
-        x_values = from_point[0] * np.ones_like(distances)
-        y_values = from_point[1] * np.ones_like(distances)
-        z_values = from_point[2] + distances
-    else:
-        raise ValueError(f"Direction ('{direction}') must be 'x', 'y', or 'z'")
-    effects = effect_func(x_values, y_values, z_values, *args, **kwargs)
-    # effect values must be monotonically increasing
+    axis = 'xyz'.index(direction)
+
+    def effects_at(distances):
+        xyz_values = [from_point[i] * np.ones_like(distances) for i in range(3)]
+        xyz_values[axis] = from_point[axis] + distances
+        return np.asarray(effect_func(*xyz_values, *args, **kwargs), dtype=float)
+
+    if method == 'interpolation':
+        distances = np.linspace(max_distance, 0, interpolation_points)
+        effects = effects_at(distances)
+        # effect values must be monotonically increasing
+        index_max_value = np.argmax(effects)
+        distance = np.interp(value, effects[:index_max_value], distances[:index_max_value])
+        return distance
+    elif method != 'brent':
+        raise ValueError(f"Method ('{method}') must be 'brent' or 'interpolation'")
+
+    # distances from max_distance to 0, spaced more finely near the from_point, where effects vary most
+    distances = np.append(np.geomspace(max_distance, max_distance * 1e-6, bracket_points - 1), 0)
+    effects = effects_at(distances)
+    effect_at = lambda distance: effects_at(np.array([distance]))[0]
+
     index_max_value = np.argmax(effects)
-    distance = np.interp(value, effects[:index_max_value], distances[:index_max_value])
-    return distance
+    distance_max_value = None
+    levels = np.asarray(value, dtype=float).ravel()
+    distance = np.empty(levels.shape)
+    for i, level in enumerate(levels):
+        reached = np.flatnonzero(effects >= level)
+        if len(reached) == 0:  # never reached - use location of maximum effect
+            if distance_max_value is None:
+                if index_max_value in [0, len(distances) - 1]:
+                    distance_max_value = distances[index_max_value]
+                else:
+                    neighbors = distances[index_max_value - 1], distances[index_max_value + 1]
+                    distance_max_value = optimize.minimize_scalar(lambda d: -effect_at(d), bounds=sorted(neighbors),
+                                                                  method='bounded').x
+            distance[i] = distance_max_value
+        elif reached[0] == 0:  # reached beyond max_distance
+            distance[i] = max_distance
+        else:
+            j = reached[0]
+            distance[i] = optimize.brentq(lambda d: effect_at(d) - level, distances[j - 1], distances[j])
+    if np.ndim(value) == 0:
+        return distance[0]
+    return distance.reshape(np.shape(value))
+
+
+def get_effect_field(effect_func, x, y, z, *args, levels=None, refinements=0, **kwargs):
+    """
+    Calculates physical effect values on a 2-D slice or 3-D box of a grid,
+    refining the grid only around effect levels of interest
+
+    The effects are first calculated on the coarse grid given by x, y, and z.
+    Each refinement halves the grid spacing; effects at the new grid points are calculated
+    only within cells whose corner values straddle one of the levels,
+    and are linearly interpolated elsewhere.
+    The coarse grid must be fine enough that each contour crosses at least one cell edge.
+
+    Parameters
+    ----------
+    effect_func: callable
+        function/method that will calculate the effect values
+        must accept (x_values, y_values, z_values) as arguments
+        followed by whatever other arguments are used
+    x, y, z: float or array-like
+        coordinates of the coarse grid along each axis;
+        a single coordinate makes a slice normal to that axis
+    *args: positional arguments (optional)
+        if provided, passed to effect_func
+    levels: float or array-like (optional)
+        effect values (e.g., contour levels) around which to refine the grid
+        (if None, the grid is refined everywhere)
+    refinements: int (optional)
+        number of times to halve the grid spacing
+        (default value is 0)
+    **kwargs: keyword arguments, optional
+        if provided, passed to effect_func
+
+    Returns
+    -------
+    x, y, z: ndarray
+        coordinates of the refined grid along each axis
+    effects: ndarray
+        effect values on the refined grid, of shape (len(x), len(y), len(z))
+    calculated: ndarray
+        boolean array, of the same shape as effects,
+        that is True where the effect was calculated rather than interpolated
+    """
+    coords = [np.atleast_1d(np.asarray(c, dtype=float)) for c in (x, y, z)]
+    if any(c.ndim != 1 for c in coords):
+        raise ValueError('Grid coordinates must be scalars or 1-D arrays')
+    if levels is not None:
+        levels = np.asarray(levels, dtype=float).reshape((-1, 1, 1, 1))
+    active_axes = [axis for axis, c in enumerate(coords) if len(c) > 1]
+
+    def effects_at(xyz_values):
+        return np.asarray(effect_func(*xyz_values, *args, **kwargs), dtype=float)
+
+    effects = effects_at(np.meshgrid(*coords, indexing='ij'))
+    calculated = np.ones(effects.shape, dtype=bool)
+    for _ in range(refinements if active_axes else 0):
+        if levels is None:
+            straddled = True
+        else:
+            # minimum and maximum effects over the corners of each cell
+            cell_min, cell_max = effects, effects
+            for axis in active_axes:
+                lower = [slice(None)] * 3
+                upper = [slice(None)] * 3
+                lower[axis], upper[axis] = slice(None, -1), slice(1, None)
+                cell_min = np.minimum(cell_min[tuple(lower)], cell_min[tuple(upper)])
+                cell_max = np.maximum(cell_max[tuple(lower)], cell_max[tuple(upper)])
+            straddled = np.any((cell_min < levels) & (levels <= cell_max), axis=0)
+
+        # bisect the cells, interpolating linearly one axis at a time
+        for axis in active_axes:
+            coords[axis] = np.insert(coords[axis], range(1, len(coords[axis])),
+                                     (coords[axis][:-1] + coords[axis][1:]) / 2)
+            effects = _bisect_axis(effects, axis, (np.take(effects, range(effects.shape[axis] - 1), axis)
+                                                   + np.take(effects, range(1, effects.shape[axis]), axis)) / 2)
+            calculated = _bisect_axis(calculated, axis, False)
+
+        # grid points within the straddled cells
+        refine = np.zeros(effects.shape, dtype=bool)
+        for offsets in np.ndindex(*(3,) * len(active_axes)):
+            points = [slice(None)] * 3
+            for axis, offset in zip(active_axes, offsets):
+                points[axis] = slice(offset, offset + effects.shape[axis] - 2, 2)
+            refine[tuple(points)] |= straddled
+        refine &= ~calculated
+
+        if np.any(refine):
+            xyz_values = [xyz[refine] for xyz in np.meshgrid(*coords, indexing='ij')]
+            effects[refine] = effects_at(xyz_values)
+            calculated |= refine
+    return coords[0], coords[1], coords[2], effects, calculated
+
+
+def _bisect_axis(values, axis, midpoint_values):
+    """
+    Interleaves values with values at the midpoints between them along an axis
+    """
+    shape = list(values.shape)
+    shape[axis] = 2 * shape[axis] - 1
+    bisected = np.empty(shape, dtype=values.dtype)
+    even = [slice(None)] * values.ndim
+    odd = [slice(None)] * values.ndim
+    even[axis], odd[axis] = slice(None, None, 2), slice(1, None, 2)
+    bisected[tuple(even)] = values
+    bisected[tuple(odd)] = midpoint_values
+    return bisected
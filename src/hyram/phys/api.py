@@ -901,6 +901,85 @@ def jet_flame_analysis(amb_fluid, rel_fluid, orif_diam, mass_flow=None, dis_coef
     return temp_plot_filepath, heatflux_filepath, pos_flux, mass_flow, srad, visible_length, radiant_frac
 
 
+def jet_flame_screening(amb_fluid, rel_fluid, orif_diam, mass_flow=None, dis_coeff=1,
+                        rel_angle=0,
+                        nozzle_key='yuce', rel_humid=0.89,
+                        flux_coordinates=None, verbose=False):
+    """
+    Quickly estimate jet flame behavior and flux data for screening, without integrating the flame.
+
+    The visible length, radiant fraction, and radiative power come from the same correlations as
+    jet_flame_analysis, and heat flux is calculated from point sources along a straight flame
+    (neglecting buoyant curvature), which is much faster than the full flame model.
+
+    Parameters
+    ----------
+    amb_fluid : Fluid
+        Ambient fluid object
+
+    rel_fluid : Fluid
+        Release fluid object
+
+    orif_diam : float
+        Orifice diameter (m)
+
+    mass_flow : float or None
+        fluid flow rate when unchoked [kg/s]
+
+    dis_coeff : float
+        Orifice discharge coeffecient [unitless]
+
+    rel_angle : float
+        Angle of release (0 is horizontal) (radians)
+
+    nozzle_key : {'yuce', 'ewan', 'birc', 'bir2', 'molk'}
+        Notional nozzle model identifier (i.e. for under-expanded jet zone)
+
+    rel_humid : float
+        Relative humidity between 0 and 1
+
+    flux_coordinates : list of locations or None
+        List of locations at which to estimate flux,
+        each location is a tuple of 3 coordinates (m):
+        [(x1, y1, z1), (x2, y2, z2), ...]
+
+    verbose : bool
+        Verbosity of logging and print statements
+
+    Returns
+    -------
+    pos_flux : ndarray or None
+        estimated positional flux data (W/m2), if flux_coordinates are given
+
+    mass_flow_rate : float
+        mass flow rate (kg/s) of the jet flame
+
+    srad : float
+        total emitted radiative power of the jet flame (W)
+
+    visible_length : float
+        length of visible flame (m)
+
+    radiant_frac : float
+        Radiant fraction of flame
+
+    """
+    orifice = Orifice(orif_diam, Cd=dis_coeff)
+
+    conserve_momentum, notional_nozzle_t = misc_utils.convert_nozzle_model_to_params(nozzle_key, rel_fluid)
+    flame_obj = Flame(rel_fluid, orifice, amb_fluid,
+                      theta0=rel_angle, y0=0, mdot=mass_flow,
+                      nn_conserve_momentum=conserve_momentum, nn_T=notional_nozzle_t,
+                      verbose=verbose, length_only=True)
+
+    if flux_coordinates is None:
+        pos_flux = None
+    else:
+        pos_flux = flame_obj.generate_positional_flux(flux_coordinates, rel_humid)
+    return (pos_flux, flame_obj.mass_flow_rate, flame_obj.get_srad(),
+            flame_obj.get_visible_length(), flame_obj.Xrad)
+
+
 def compute_overpressure(method: str, locations,
                          ambient_fluid, release_fluid,
                          orifice_diameter: float, mass_flow=None,
@@ -8,6 +8,7 @@ If not, see https://www.gnu.org/licenses/.
 
 from . import analysis
 from .component_failure import ComponentFailureSet, ComponentFailure
+from .release_physics import ReleasePhysics
 from . import component
 from . import consequence
 from . import defaults
@@ -16,5 +17,6 @@ from . import event_tree
 from . import ignition_probs
 from . import pipe_size
 from . import probits
+from . import release_physics
 from . import risk
 from . import uncertainty
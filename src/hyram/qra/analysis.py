@@ -10,10 +10,21 @@ import numpy as np
 
 from . import consequence, defaults, effects, event_tree, ignition_probs
 from . import pipe_size, risk
+from .release_physics import ReleasePhysics
 from .component import (get_leak_frequencies_at_size_for_set,
                         create_default_component_set)
-from ..phys import _comps, _jet, _therm
-from ..utilities import misc_utils
+from ..phys import _comps
+
+
+# Event tree end states and the type of consequence for each
+end_state_consequence_types = {'Shutdown': None,
+                               'No Ignition': None,
+                               'Jet Fire': 'thermal',
+                               'Explosion': 'overp'}
+end_state_keys = {'Shutdown': 'shut',
+                  'No Ignition': 'noig',
+                  'Jet Fire': 'jetf',
+                  'Explosion': 'expl'}
 
 
 def get_total_leak_frequency_at_size(random_leak_frequency_set,
@@ -33,6 +44,176 @@ def get_total_leak_frequency_at_size(random_leak_frequency_set,
     return total_random_leak_freq + other_leak_freqs
 
 
+def calc_scenario_frequencies(leak_freqs, discharge_rates, ign_probs, detection_credit=0.9):
+    """
+    Calculates the end state probabilities and frequencies of each leak size
+    from the event tree (detection/isolation, ignition, immediate ignition)
+
+    Parameters
+    ----------
+    leak_freqs : list of floats
+        [1/yr] Total leak frequency for each leak size
+
+    discharge_rates : list of floats
+        [kg/s] Discharge rate for each leak size
+
+    ign_probs : dict
+        Dictionary of ignition probabilities with keys of
+        'flow_thresholds', 'immed_ign_probs' and 'delayed_ign_probs'
+
+    detection_credit : float
+        Probability of detecting flame/release, as fraction
+
+    Returns
+    -------
+    end_state_probabilities : ndarray
+        Probability of each end state (columns, in the order of
+        `end_state_consequence_types`) for each leak size (rows)
+
+    scenario_freqs : ndarray
+        [1/yr] Frequency of each end state (columns) for each leak size (rows)
+    """
+    num_leak_sizes = len(leak_freqs)
+    end_state_probabilities = np.zeros((num_leak_sizes, len(end_state_consequence_types)))
+    scenario_freqs = np.zeros_like(end_state_probabilities)
+    for idx, (leak_freq, discharge_rate) in enumerate(zip(leak_freqs, discharge_rates)):
+        (immed_ign_prob, delayed_ign_prob) = (
+            ignition_probs.get_ignition_probability(discharge_rate, ign_probs))
+        total_ign_prob = ignition_probs.calc_total_ign_prob(immed_ign_prob, delayed_ign_prob)
+        no_ign_prob = event_tree.calc_probability_not_occur(total_ign_prob)
+        cond_immed_ign_prob = ignition_probs.calc_cond_immed_ign_prob(immed_ign_prob, total_ign_prob)
+
+        event_probabilities = [detection_credit, no_ign_prob, cond_immed_ign_prob]
+        end_state_probs_for_size = event_tree.calc_end_state_probabilities(event_probabilities)
+        end_state_probabilities[idx, :] = end_state_probs_for_size
+        scenario_freqs[idx, :] = event_tree.calc_end_state_frequencies(leak_freq, end_state_probs_for_size)
+    return end_state_probabilities, scenario_freqs
+
+
+def evaluate_risk(scenario_freqs, qrads, overpressures, impulses,
+                  probit_thermal_id='eise', exposure_time=30, probit_overp_id='head',
+                  occupant_hours=None, verbose=False):
+    """
+    Calculates the fatalities and risk metrics from the scenario frequencies
+    and the effects at each occupant location
+
+    Together with `calc_scenario_frequencies` and the effects
+    from a `ReleasePhysics` object, this is the part of `conduct_analysis`
+    that does not involve the release physics, so that it can be repeated
+    for other frequencies, probit models, or occupant hours
+    without solving the physics again.
+
+    Parameters
+    ----------
+    scenario_freqs : array
+        [1/yr] Frequency of each end state (columns) for each leak size (rows),
+        e.g., from `calc_scenario_frequencies`
+
+    qrads : array
+        [W/m2] Heat flux for each leak size (rows) at each occupant location (columns)
+
+    overpressures : array
+        [Pa] Peak overpressure for each leak size (rows) at each occupant location (columns)
+
+    impulses : array
+        [Pa*s] Impulse for each leak size (rows) at each occupant location (columns)
+
+    probit_thermal_id : {'eise', 'tsao', 'tno', 'lees'}
+        ID of thermal probit model to use
+
+    exposure_time : float
+        [s] Duration of exposure to heat source
+
+    probit_overp_id : {'leis', 'lhse', 'head', 'coll'}
+        ID of overpressure probit model to use
+
+    occupant_hours : [floats] or None
+        List of hours present for each occupant.
+        If None, then default of 2000 hours per occupant is used.
+
+    verbose : bool
+        If True, extra output will be printed (default False)
+
+    Returns
+    -------
+    results : dict
+        Compilation of risk results containing:
+
+            event_consequences : 2d array
+                Expected fatalities for each end state (columns) for each leak size (rows)
+
+            plls : 2d array
+                Potential loss of life for each end state (columns) for each leak size (rows)
+
+            pll_contributions : 2d array
+                Fractional contribution of each end state and leak size to total PLL
+
+            total_pll : float
+                Potential Loss of Life is expected # of fatalities per system year
+
+            far : float
+                Fatal Accident Rate is expected # of fatalities per 100 million exposed hours
+
+            air : float
+                Average Individual Risk is expected # of fatalities per exposed individual
+    """
+    scenario_freqs = np.asarray(scenario_freqs, dtype=float)
+    num_leak_sizes = scenario_freqs.shape[0]
+    qrads = np.asarray(qrads, dtype=float)
+    total_occupants = qrads.shape[1]
+
+    if verbose:
+        print("Calculating end state for each scenario...")
+
+    # Calculate end state event consequences and fatalities
+    # Flattened by leak size (all locations for leak size 1, then leak size 2, etc)
+    physical_responses = {'qrads': qrads.flatten(order='C'),
+                          'overpressures': np.asarray(overpressures, dtype=float).flatten(order='C'),
+                          'impulses': np.asarray(impulses, dtype=float).flatten(order='C')}
+    consequence_modeling_decisions = {'probit_thermal_id': probit_thermal_id,
+                                      'exposure_time': exposure_time,
+                                      'probit_overp_id': probit_overp_id}
+    event_consequences = np.zeros_like(scenario_freqs)
+    for j, end_state_name in enumerate(end_state_consequence_types):
+        event_consequences[:, j] = consequence.calculate_event_consequence(end_state_consequence_types[end_state_name],
+                                                                           num_leak_sizes,
+                                                                           total_occupants,
+                                                                           physical_responses,
+                                                                           consequence_modeling_decisions,
+                                                                           verbose)
+
+    if verbose:
+        print('Calculating risk for each scenario...')
+
+    if total_occupants == 0:
+        occupant_avg_hours = 0
+    else:
+        if occupant_hours is None:
+            occupant_hours = [defaults.default_occupant_hours] * total_occupants
+        total_occupant_hours = np.sum(occupant_hours)
+        occupant_avg_hours = total_occupant_hours / total_occupants
+        if verbose:
+            print(f'{total_occupants} Occupants for ' +
+                  f'{occupant_avg_hours} average hours')
+            print('')
+
+    # Calculate risk statistics
+    if verbose:
+        print('Calculating overall risk metrics and risk contributions ' +
+              'for each scenario...')
+    plls = risk.calc_all_plls(scenario_freqs, event_consequences)
+    total_pll, pll_contributions = risk.calc_risk_contributions(plls)
+    far = risk.calc_far(total_pll, total_occupants)
+    air = risk.calc_air(far, occupant_avg_hours)
+
+    return {'event_consequences': event_consequences,
+            'plls': plls,
+            'pll_contributions': pll_contributions,
+            'total_pll': total_pll,
+            'far': far,
+            'air': air}
+
+
 def conduct_analysis(pipe_inner_diam,
                      amb_temp, amb_pres,
                      rel_temp, rel_pres, rel_species,
@@ -54,7 +235,9 @@ def conduct_analysis(pipe_inner_diam,
                      rel_angle=0, rel_humid=0.89,
                      verbose=False,
                      output_dir=None,
-                     create_plots=True):
+                     create_plots=True,
+                     release_physics=None,
+                     n_workers=1):
     """
     Quantitative risk assessment including scenario calculations and harm modeling
 
@@ -179,6 +362,19 @@ def conduct_analysis(pipe_inner_diam,
     create_plots : bool
         Whether output plots should be created
 
+    release_physics : ReleasePhysics or None
+        Release physics for the default leak sizes, created from the same
+        fluids, pipe, discharge coefficient, mass flow rates, nozzle model,
+        release angle and overpressure model inputs as given here
+        (e.g., kept from an earlier analysis so that its flames and
+        overpressure models are not solved again), which are checked.
+        If None, it is created from the inputs. Default is None.
+
+    n_workers : int or None
+        Number of processes in which to solve the physics of the leak sizes
+        concurrently, where None uses all CPUs.
+        Default is 1, which solves them in this process.
+
     Returns
     -------
     results : dict
@@ -274,32 +470,35 @@ def conduct_analysis(pipe_inner_diam,
     if verbose:
         print(f"System pipe inner diameter {pipe_inner_diam:.3g} m, area {pipe_flow_area:.3g} m^2")
 
-    orifices = []
-    discharge_rates = []
-
-    end_state_consequence_types = {'Shutdown': None,
-                                   'No Ignition': None,
-                                   'Jet Fire': 'thermal',
-                                   'Explosion': 'overp'}
-    event_consequences = np.zeros([num_leak_sizes, len(end_state_consequence_types)], dtype=float)
-    scenario_freqs = np.zeros_like(event_consequences)
-    end_state_probabilities = np.zeros_like(event_consequences)
+    if release_physics is None:
+        release_physics = ReleasePhysics(rel_fluid, amb_fluid, pipe_inner_diam,
+                                         leak_sizes=leak_sizes,
+                                         discharge_coeff=discharge_coeff,
+                                         mass_flow_rates=mass_flow_rates,
+                                         nozzle_model=nozzle_model,
+                                         rel_angle=rel_angle,
+                                         overp_method=overp_method,
+                                         tnt_factor=tnt_factor,
+                                         bst_flame_speed=bst_flame_speed,
+                                         verbose=verbose)
+    else:
+        release_physics.check_inputs(rel_fluid, amb_fluid, pipe_inner_diam,
+                                     leak_sizes=leak_sizes,
+                                     discharge_coeff=discharge_coeff,
+                                     mass_flow_rates=mass_flow_rates,
+                                     nozzle_model=nozzle_model,
+                                     rel_angle=rel_angle,
+                                     overp_method=overp_method,
+                                     tnt_factor=tnt_factor,
+                                     bst_flame_speed=bst_flame_speed)
+    orifices = release_physics.orifices
+    discharge_rates = release_physics.discharge_rates
 
     total_occupants = len(locations)
     zero_occupants = (total_occupants == 0)
 
-    cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(nozzle_model, rel_fluid)
-
-    chem = _therm.Combustion(_comps.Fluid(species=rel_fluid.species, T=amb_temp, P=amb_pres))
-
     leak_freqs_by_component = {}
     total_leak_freqs = {}
-    all_qrads = np.zeros((num_leak_sizes, total_occupants))
-    all_overpressures = np.zeros((num_leak_sizes, total_occupants))
-    all_impulses = np.zeros((num_leak_sizes, total_occupants))
-    qrad_plot_files = []
-    overp_plot_files = []
-    impulse_plot_files = []
 
     for idx, leak_size in enumerate(leak_sizes):
         if verbose:
@@ -323,43 +522,42 @@ def conduct_analysis(pipe_inner_diam,
         if verbose:
             print(f"total leak frequency: {total_leak_freqs[leak_size]}")
             print('----------------------------')
-
-        orifice_leak_diam = pipe_size.calc_orifice_diameter(pipe_flow_area, leak_size/100)
-        orifice = _comps.Orifice(orifice_leak_diam, discharge_coeff)
-        orifices.append(orifice)
-        developing_flow = _jet.DevelopingFlow(rel_fluid, orifice, amb_fluid,
-                                              mdot=mass_flow_rates[idx], theta0=rel_angle,
-                                              nn_conserve_momentum=cons_momentum, nn_T=notional_noz_t, verbose=verbose)
-
-        discharge_rate = _comps.NozzleFlow(rel_fluid, orifice, amb_fluid.P, mdot=mass_flow_rates[idx]).mdot
-        discharge_rates.append(discharge_rate)
-        if verbose:
-            print(f'({orifice_leak_diam:.3g} m leak diameter)')
-            print(f'discharge rate: {discharge_rate:.3g} kg/s')
+            print(f'({orifices[idx].d:.3g} m leak diameter)')
+            print(f'discharge rate: {discharge_rates[idx]:.3g} kg/s')
             print('----------------------------')
-
-        (immed_ign_prob, delayed_ign_prob) = (
-            ignition_probs.get_ignition_probability(discharge_rate, ign_probs))
-        total_ign_prob = ignition_probs.calc_total_ign_prob(immed_ign_prob, delayed_ign_prob)
-        no_ign_prob = event_tree.calc_probability_not_occur(total_ign_prob)
-        cond_immed_ign_prob = ignition_probs.calc_cond_immed_ign_prob(immed_ign_prob, total_ign_prob)
-
-        event_probabilities = [detection_credit, no_ign_prob, cond_immed_ign_prob]
-        end_state_probs_for_size = event_tree.calc_end_state_probabilities(event_probabilities)
-        end_state_probabilities[idx, :] = end_state_probs_for_size
-        end_state_freqs = event_tree.calc_end_state_frequencies(total_leak_freqs[leak_size],
-                                                                end_state_probs_for_size)
-        scenario_freqs[idx, :] = end_state_freqs
-
-        if verbose:
+            (immed_ign_prob, delayed_ign_prob) = (
+                ignition_probs.get_ignition_probability(discharge_rates[idx], ign_probs))
+            total_ign_prob = ignition_probs.calc_total_ign_prob(immed_ign_prob, delayed_ign_prob)
+            no_ign_prob = event_tree.calc_probability_not_occur(total_ign_prob)
             print('OUTCOME PROBABILITIES:')
             print(f'detection/isolation: {detection_credit}')
             print(f'no ignition: {no_ign_prob}')
             print(f'immediate ignition: {immed_ign_prob}')
             print(f'delayed ignition: {delayed_ign_prob}')
             print('----------------------------')
+            print('============================')
+
+    end_state_probabilities, scenario_freqs = calc_scenario_frequencies(
+        [total_leak_freqs[leak_size] for leak_size in leak_sizes],
+        discharge_rates, ign_probs, detection_credit)
 
-        jetflame_freq = end_state_freqs[2]
+    if n_workers != 1 and not zero_occupants:
+        thermal_leaks = np.flatnonzero(scenario_freqs[:, 2] != 0)
+        overp_leaks = np.flatnonzero(scenario_freqs[:, 3] != 0)
+        release_physics.solve(thermal=len(thermal_leaks) > 0,
+                              overpressure=len(overp_leaks) > 0,
+                              leak_indices=np.union1d(thermal_leaks, overp_leaks),
+                              n_workers=n_workers)
+
+    all_qrads = np.zeros((num_leak_sizes, total_occupants))
+    all_overpressures = np.zeros((num_leak_sizes, total_occupants))
+    all_impulses = np.zeros((num_leak_sizes, total_occupants))
+    qrad_plot_files = []
+    overp_plot_files = []
+    impulse_plot_files = []
+
+    for idx, orifice in enumerate(orifices):
+        jetflame_freq = scenario_freqs[idx, 2]
         if jetflame_freq == 0 or zero_occupants:
             calculate_thermal_effects = False
         else:
@@ -375,18 +573,16 @@ def conduct_analysis(pipe_inner_diam,
                 notional_nozzle_model=nozzle_model,
                 locations=locations,
                 leak_idx=idx,
-                developing_flow=developing_flow,
-                chem=chem,
+                flame=release_physics.flame(idx),
                 create_plots=create_plots,
                 output_dir=output_dir,
                 verbose=verbose)
             all_qrads[idx, :] = qrads
             qrad_plot_files.append(qrad_plot_file)
         else:
-            all_qrads[idx, :] = np.zeros(total_occupants)
             qrad_plot_files.append("")
 
-        overp_freq = end_state_freqs[3]
+        overp_freq = scenario_freqs[idx, 3]
         if overp_freq == 0 or zero_occupants:
             calculate_overpressure_effects = False
         else:
@@ -406,7 +602,7 @@ def conduct_analysis(pipe_inner_diam,
                 leak_idx=idx,
                 BST_mach_flame_speed=bst_flame_speed,
                 TNT_equivalence_factor=tnt_factor,
-                developing_flow=developing_flow,
+                overpressure_model=release_physics.overpressure_model(idx),
                 create_plots=create_plots,
                 output_dir=output_dir,
                 verbose=verbose)
@@ -415,82 +611,33 @@ def conduct_analysis(pipe_inner_diam,
             overp_plot_files.append(overpressure_plot_filepath)
             impulse_plot_files.append(impulse_plot_filepath)
         else:
-            all_overpressures[idx, :] = np.zeros(total_occupants)
-            all_impulses[idx, :] = np.zeros(total_occupants)
             overp_plot_files.append("")
             impulse_plot_files.append("")
 
-        if verbose:
-            print('============================')
-
-    # Flatten results (all leaksize loc1, then all leaksize loc2, etc)
-    # Corresponds to flattening by row which is C-style ordering
-    qrads = all_qrads.flatten(order='C')
-    overpressures = all_overpressures.flatten(order='C')
-    impulses = all_impulses.flatten(order='C')
-
     if verbose:
         print("Heat flux results:")
-        print(qrads)
+        print(all_qrads)
         print("Overpressure results:")
-        print(overpressures)
+        print(all_overpressures)
         print("Impulse results:")
-        print(impulses)
+        print(all_impulses)
         print('')
 
-    if verbose:
-        print("Calculating end state for each scenario...")
+    if verbose and total_occupants > 0:
+        print(f"Locations: {locations}")
 
-    # Calculate end state event consequences and fatalities
-    physical_responses = {'qrads': qrads,
-                          'overpressures': overpressures,
-                          'impulses': impulses}
-    consequence_modeling_decisions = {'probit_thermal_id': probit_thermal_id,
-                                      'exposure_time': exposure_time,
-                                      'probit_overp_id': probit_overp_id}
-    for j, end_state_name in enumerate(end_state_consequence_types):
-        event_consequence = consequence.calculate_event_consequence(end_state_consequence_types[end_state_name],
-                                                                    num_leak_sizes,
-                                                                    total_occupants,
-                                                                    physical_responses,
-                                                                    consequence_modeling_decisions,
-                                                                    verbose)
-        event_consequences[:, j] = event_consequence
-
-    scenario_fatalities = np.zeros_like(event_consequences)
-    for i in range(num_leak_sizes):
-        scenario_fatalities[i, :] = event_consequences[i]
-
-    if verbose:
-        print('Calculating risk for each scenario...')
-
-    if total_occupants == 0:
-        occupant_avg_hours = 0
-    else:
-        if occupant_hours is None:
-            occupant_hours = [defaults.default_occupant_hours] * total_occupants
-        total_occupant_hours = np.sum(occupant_hours)
-        occupant_avg_hours = total_occupant_hours / total_occupants
-        if verbose:
-            print(f"Locations: {locations}")
-            print(f'{total_occupants} Occupants for ' +
-                  f'{occupant_avg_hours} average hours')
-            print('')
-
-    # Calculate risk statistics
-    if verbose:
-        print('Calculating overall risk metrics and risk contributions ' +
-              'for each scenario...')
-    plls = risk.calc_all_plls(scenario_freqs, scenario_fatalities)
-    total_pll, pll_contributions = risk.calc_risk_contributions(plls)
-    far = risk.calc_far(total_pll, total_occupants)
-    air = risk.calc_air(far, occupant_avg_hours)
+    risk_results = evaluate_risk(scenario_freqs, all_qrads, all_overpressures, all_impulses,
+                                 probit_thermal_id=probit_thermal_id,
+                                 exposure_time=exposure_time,
+                                 probit_overp_id=probit_overp_id,
+                                 occupant_hours=occupant_hours,
+                                 verbose=verbose)
+    total_pll = risk_results['total_pll']
+    far = risk_results['far']
+    air = risk_results['air']
+    pll_contributions = risk_results['pll_contributions']
 
     # Collect results for each leak size
-    end_state_keys = {'Shutdown': 'shut',
-                      'No Ignition': 'noig',
-                      'Jet Fire': 'jetf',
-                      'Explosion': 'expl'}
     leak_results = []
     for i in range(num_leak_sizes):
         event_results = consequence.generate_event_results(
@@ -522,9 +669,9 @@ def conduct_analysis(pipe_inner_diam,
         leak_results.append(leak_result)
 
     # Re-shape harm values into position table
-    position_qrads_reshape = (qrads.reshape((num_leak_sizes, total_occupants))).T
-    position_overps_reshape = (overpressures.reshape((num_leak_sizes, total_occupants))).T
-    position_impulses_reshape = (impulses.reshape((num_leak_sizes, total_occupants))).T
+    position_qrads_reshape = all_qrads.T
+    position_overps_reshape = all_overpressures.T
+    position_impulses_reshape = all_impulses.T
 
     results = {
         'total_pll': total_pll,
@@ -41,14 +41,10 @@ def thermal_consequence(physical_responses,
     thermal_fatality_probs : array
         Probability of fatality from thermal effects
     """
-    thermal_fatality_probs = []
-    for qrad in physical_responses['qrads']:
-        p_therm_fatal = probits.compute_thermal_fatality_prob(consequence_modeling_decisions['probit_thermal_id'],
-                                                              qrad,
-                                                              consequence_modeling_decisions['exposure_time'])
-        thermal_fatality_probs.append(p_therm_fatal)
-
-    return thermal_fatality_probs
+    thermal_fatality_probs = probits.compute_thermal_fatality_prob(consequence_modeling_decisions['probit_thermal_id'],
+                                                                   physical_responses['qrads'],
+                                                                   consequence_modeling_decisions['exposure_time'])
+    return np.atleast_1d(thermal_fatality_probs)
 
 def overpressure_consequence(physical_responses,
                              consequence_modeling_decisions):
@@ -83,14 +79,10 @@ def overpressure_consequence(physical_responses,
     overp_fatality_probs : array
         Probability of fatality from overpressure effects
     """
-    overp_fatality_probs = []
-    for overpressure, impulse in zip(physical_responses['overpressures'], physical_responses['impulses']):
-        p_overp_fatal = probits.compute_overpressure_fatality_prob(consequence_modeling_decisions['probit_overp_id'],
-                                                                   overpressure,
-                                                                   impulse)
-        overp_fatality_probs.append(p_overp_fatal)
-
-    return overp_fatality_probs
+    overp_fatality_probs = probits.compute_overpressure_fatality_prob(consequence_modeling_decisions['probit_overp_id'],
+                                                                      physical_responses['overpressures'],
+                                                                      physical_responses['impulses'])
+    return np.atleast_1d(overp_fatality_probs)
 
 def convert_consequence_to_per_leak_basis(consequences,
                                           num_leak_sizes,
@@ -20,7 +20,8 @@ def calc_thermal_effects(ambient_fluid, release_fluid, release_angle,
                          notional_nozzle_model,
                          locations, leak_idx,
                          developing_flow=None, chem=None,
-                         create_plots=True, output_dir=None, verbose=False):
+                         create_plots=True, output_dir=None, verbose=False,
+                         flame=None):
     """
     Calculates thermal effects for all positions in QRA
 
@@ -67,6 +68,10 @@ def calc_thermal_effects(ambient_fluid, release_fluid, release_angle,
     verbose : bool
         If True, extra output will be printed (default False)
 
+    flame : Flame object
+        Solved Flame for leak (e.g., from a ReleasePhysics object).
+        If given, no new flame is solved and `developing_flow` and `chem` are unused.
+
     Returns
     -------
     fluxes : ndarray
@@ -75,21 +80,22 @@ def calc_thermal_effects(ambient_fluid, release_fluid, release_angle,
     plot_filepath : str
         Position plot file path
     """
-    cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(
-        notional_nozzle_model, release_fluid)
-
-    if developing_flow is None:
-        flame = _flame.Flame(release_fluid, orifice, ambient_fluid,
-                             theta0=release_angle,
-                             nn_conserve_momentum=cons_momentum,
-                             nn_T=notional_noz_t,
-                             chem=chem,
-                             verbose=verbose)
-    else:
-        flame = _flame.Flame.from_developed_flow(
-            developing_flow=developing_flow,
-            chem = chem,
-            verbose=verbose)
+    if flame is None:
+        cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(
+            notional_nozzle_model, release_fluid)
+
+        if developing_flow is None:
+            flame = _flame.Flame(release_fluid, orifice, ambient_fluid,
+                                 theta0=release_angle,
+                                 nn_conserve_momentum=cons_momentum,
+                                 nn_T=notional_noz_t,
+                                 chem=chem,
+                                 verbose=verbose)
+        else:
+            flame = _flame.Flame.from_developed_flow(
+                developing_flow=developing_flow,
+                chem = chem,
+                verbose=verbose)
 
     fluxes = flame.generate_positional_flux(locations, rel_humid)
 
@@ -118,7 +124,7 @@ def calc_overp_effects(orifice, notional_nozzle_model,
                        BST_mach_flame_speed=None, TNT_equivalence_factor=None,
                        developing_flow=None,
                        create_plots=True, output_dir=None,
-                       verbose=False):
+                       verbose=False, overpressure_model=None):
     """
     Calculates overpressure effects for all positions in QRA
 
@@ -174,6 +180,11 @@ def calc_overp_effects(orifice, notional_nozzle_model,
     verbose : bool
         If True, extra output will be printed (default is False)
 
+    overpressure_model : BST_method, TNT_method or Bauwens_method object
+        Overpressure model for leak (e.g., from a ReleasePhysics object).
+        If given, no new jet is solved and `overp_method`, `developing_flow`,
+        `BST_mach_flame_speed` and `TNT_equivalence_factor` are unused.
+
     Returns
     -------
     overpressures : ndarray
@@ -189,30 +200,23 @@ def calc_overp_effects(orifice, notional_nozzle_model,
     impulse_plot_filepath : str
         Position plot file paths for impulse by position
     """
-    nozzle_cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(notional_nozzle_model, release_fluid)
+    if overpressure_model is None:
+        nozzle_cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(notional_nozzle_model, release_fluid)
 
-    if developing_flow is None:
-        jet = _jet.Jet(release_fluid, orifice, ambient_fluid,
-                    theta0=release_angle,
-                    nn_conserve_momentum=nozzle_cons_momentum, nn_T=notional_noz_t,
-                    verbose=verbose)
-    else:
-        jet = _jet.Jet.from_developed_flow(developing_flow=developing_flow, verbose=verbose)
+        if developing_flow is None:
+            jet = _jet.Jet(release_fluid, orifice, ambient_fluid,
+                        theta0=release_angle,
+                        nn_conserve_momentum=nozzle_cons_momentum, nn_T=notional_noz_t,
+                        verbose=verbose)
+        else:
+            jet = _jet.Jet.from_developed_flow(developing_flow=developing_flow, verbose=verbose)
 
-    method = overp_method.lower()
-    if method == 'bst':
-        over_pressure_model = _unconfined_overpressure.BST_method(jet_object=jet,
-                                                                    mach_flame_speed=BST_mach_flame_speed)
-    elif method == 'tnt':
-        over_pressure_model = _unconfined_overpressure.TNT_method(jet_object=jet,
-                                                                    equivalence_factor=TNT_equivalence_factor)
-    elif method == 'bauwens':
-        over_pressure_model = _unconfined_overpressure.Bauwens_method(jet_object=jet)
-    else:
-        raise ValueError('Invalid overpressure method name')
+        overpressure_model = create_overpressure_model(jet, overp_method,
+                                                       BST_mach_flame_speed=BST_mach_flame_speed,
+                                                       TNT_equivalence_factor=TNT_equivalence_factor)
 
-    overpressures = over_pressure_model.calc_overpressure(locations)
-    impulses = over_pressure_model.calc_impulse(locations)
+    overpressures = overpressure_model.calc_overpressure(locations)
+    impulses = overpressure_model.calc_impulse(locations)
 
     overpressure_plot_filepath = ""
     impulse_plot_filepath = ""
@@ -244,6 +248,42 @@ def calc_overp_effects(orifice, notional_nozzle_model,
     return overpressures, impulses, overpressure_plot_filepath, impulse_plot_filepath
 
 
+def create_overpressure_model(jet, overp_method,
+                              BST_mach_flame_speed=None, TNT_equivalence_factor=None):
+    """
+    Creates the unconfined overpressure model for a jet
+
+    Parameters
+    ----------
+    jet : Jet object
+        Solved jet for leak
+
+    overp_method : {'bst', 'tnt', 'bauwens'}
+        Overpressure harm model identifier
+
+    BST_mach_flame_speed : float
+        If overp_method is 'bst', this must be specified
+
+    TNT_equivalence_factor : float
+        If overp_method is 'tnt', this must be specified
+
+    Returns
+    -------
+    BST_method, TNT_method or Bauwens_method object
+    """
+    method = overp_method.lower()
+    if method == 'bst':
+        return _unconfined_overpressure.BST_method(jet_object=jet,
+                                                   mach_flame_speed=BST_mach_flame_speed)
+    elif method == 'tnt':
+        return _unconfined_overpressure.TNT_method(jet_object=jet,
+                                                   equivalence_factor=TNT_equivalence_factor)
+    elif method == 'bauwens':
+        return _unconfined_overpressure.Bauwens_method(jet_object=jet)
+    else:
+        raise ValueError('Invalid overpressure method name')
+
+
 def plot_effect_positions(effects, effect_label, filename, title,
                           x_locations, z_locations):
     """
@@ -44,26 +44,24 @@ def compute_thermal_fatality_prob(model_ref, heat_flux, exposure_time, mean=5):
     ----------
     model_ref : str
         reference to internal thermal probit model function to apply (see below)
-    heat_flux : float
-        heat flux intensity (W/m^2)
-    exposure_time : float
+    heat_flux : float or array-like
+        heat flux intensity (W/m^2), e.g., for all leak sizes and occupants at once
+    exposure_time : float or array-like
         duration of exposure (s)
     mean : int
         Default value of 5 avoids negative values, consistent with published models
 
     Returns
     -------
-    prob : float
-        Probability of fatality
+    prob : float or ndarray
+        Probability of fatality, of the same shape as heat_flux and exposure_time
     """
     cleaned_id = parse_thermal_model(model_ref)
     probit_model = PROBIT_THERMAL_CHOICES[cleaned_id]
 
-    thermal_dose = calculate_thermal_dose(heat_flux, exposure_time)
-    if thermal_dose == 0:
-        probit_value = -np.inf
-    else:
-        probit_value = probit_model(thermal_dose)
+    thermal_dose = calculate_thermal_dose(np.asarray(heat_flux, dtype=float), exposure_time)
+    with np.errstate(divide='ignore'):
+        probit_value = np.where(thermal_dose == 0, -np.inf, probit_model(thermal_dose))
 
     return calculate_fatality_probability(probit_value, mean)
 
@@ -170,9 +168,9 @@ def compute_overpressure_fatality_prob(model_ref, overp, impulse=None, mean=5):
     ----------
     model_ref : str
         reference to internal probit model function to use (from available functions)
-    overp : float
-        Peak overpressure (Pa)
-    impulse : float
+    overp : float or array-like
+        Peak overpressure (Pa), e.g., for all leak sizes and occupants at once
+    impulse : float or array-like
         Impulse of shock wave (Pa*s)
         Not used in Eisenberg - Lung hemorrhage or HSE - Lung Hemorrhage models
     mean : int
@@ -180,19 +178,23 @@ def compute_overpressure_fatality_prob(model_ref, overp, impulse=None, mean=5):
 
     Returns
     -------
-    prob : float
-        Probability of fatality
+    prob : float or ndarray
+        Probability of fatality, of the same shape as overp (and impulse)
     """
     cleaned_id = parse_overp_model(model_ref)
     probit_model = PROBIT_OVERP_CHOICES[cleaned_id]
 
-    if overp == 0 or impulse == 0:
-        probit_value = -np.inf
-    else:
+    overp = np.asarray(overp, dtype=float)
+    no_effect = (overp == 0)
+    if impulse is not None:
+        impulse = np.asarray(impulse, dtype=float)
+        no_effect = no_effect | (impulse == 0)
+    with np.errstate(divide='ignore'):
         if cleaned_id in ['leis', 'lhse']:
             probit_value = probit_model(overp=overp)
         else:
             probit_value = probit_model(overp=overp, impulse=impulse)
+        probit_value = np.where(no_effect, -np.inf, probit_value)
 
     return calculate_fatality_probability(probit_value, mean)
 
@@ -0,0 +1,313 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import multiprocessing as mp
+import warnings
+
+import numpy as np
+
+from . import defaults, effects, pipe_size
+from ..phys import _comps, _flame, _jet, _therm
+from ..utilities import misc_utils
+from ..utilities.custom_warnings import PhysicsWarning
+
+
+class ReleasePhysics:
+    """
+    Release physics for each leak size of a QRA
+
+    The developing flow, flame and overpressure model of each leak size are
+    solved the first time they are needed and then kept, so that effects can be
+    evaluated at any set of locations without re-solving the physics
+    (e.g., for every sample of an uncertainty study, in which only leak
+    frequencies and occupant locations change).
+
+    Parameters
+    ----------
+    rel_fluid : Fluid object
+        Release fluid
+
+    amb_fluid : Fluid object
+        Ambient fluid
+
+    pipe_inner_diam : float
+        [m] Inner diameter of system pipe
+
+    leak_sizes : list of floats or None
+        Leak sizes as percentage of pipe flow area.
+        If None, the default leak sizes are used.
+
+    discharge_coeff : float
+        [-] Discharge coefficient to account for non-plug flow
+
+    mass_flow_rates : [floats] or None
+        Mass flow rates [kg/s] for unchoked flow, one for each leak size.
+        If None, the mass flow rate is calculated for choked flow.
+
+    nozzle_model : {'yuce', 'ewan', 'birc', 'bir2', 'molk'}
+        Notional nozzle model identifier
+
+    rel_angle : float
+        [rad] Leak release angle, 0 is horizontal, pi/2 is vertical
+
+    overp_method : {'bst', 'tnt', 'bauwens'}
+        Overpressure model identifier
+
+    tnt_factor : float
+        TNT mass equivalence factor for the TNT overpressure model
+
+    bst_flame_speed : float
+        Mach flame speed for the BST overpressure model
+
+    verbose : bool
+        If True, extra output will be printed (default False)
+    """
+    def __init__(self, rel_fluid, amb_fluid, pipe_inner_diam,
+                 leak_sizes=None,
+                 discharge_coeff=1,
+                 mass_flow_rates=None,
+                 nozzle_model='yuce',
+                 rel_angle=0,
+                 overp_method='bst',
+                 tnt_factor=0.03,
+                 bst_flame_speed=0.35,
+                 verbose=False):
+        if leak_sizes is None:
+            leak_sizes = defaults.default_leak_sizes
+        if mass_flow_rates is None:
+            mass_flow_rates = [None] * len(leak_sizes)
+        self.rel_fluid = rel_fluid
+        self.amb_fluid = amb_fluid
+        self.pipe_inner_diam = pipe_inner_diam
+        self.leak_sizes = list(leak_sizes)
+        self.discharge_coeff = discharge_coeff
+        self.mass_flow_rates = list(mass_flow_rates)
+        self.nozzle_model = nozzle_model
+        self.rel_angle = rel_angle
+        self.overp_method = overp_method
+        self.tnt_factor = tnt_factor
+        self.bst_flame_speed = bst_flame_speed
+        self.verbose = verbose
+
+        self.pipe_flow_area = pipe_size.calc_pipe_flow_area(pipe_inner_diam)
+        self.orifices = []
+        self.discharge_rates = []
+        for leak_size, mdot in zip(self.leak_sizes, self.mass_flow_rates):
+            orifice_leak_diam = pipe_size.calc_orifice_diameter(self.pipe_flow_area, leak_size/100)
+            orifice = _comps.Orifice(orifice_leak_diam, discharge_coeff)
+            self.orifices.append(orifice)
+            self.discharge_rates.append(_comps.NozzleFlow(rel_fluid, orifice, amb_fluid.P, mdot=mdot).mdot)
+
+        self.chem = _therm.combustion_registry.get(_comps.Fluid(species=rel_fluid.species,
+                                                                T=amb_fluid.T, P=amb_fluid.P))
+        self._developing_flows = [None] * len(self.leak_sizes)
+        self._flames = [None] * len(self.leak_sizes)
+        self._overpressure_models = [None] * len(self.leak_sizes)
+
+    def developing_flow(self, leak_idx):
+        """Returns the DevelopingFlow object for the leak size at index `leak_idx`"""
+        if self._developing_flows[leak_idx] is None:
+            cons_momentum, notional_noz_t = misc_utils.convert_nozzle_model_to_params(self.nozzle_model,
+                                                                                      self.rel_fluid)
+            self._developing_flows[leak_idx] = _jet.DevelopingFlow(self.rel_fluid, self.orifices[leak_idx],
+                                                                   self.amb_fluid,
+                                                                   mdot=self.mass_flow_rates[leak_idx],
+                                                                   theta0=self.rel_angle,
+                                                                   nn_conserve_momentum=cons_momentum,
+                                                                   nn_T=notional_noz_t,
+                                                                   verbose=self.verbose)
+        return self._developing_flows[leak_idx]
+
+    def flame(self, leak_idx):
+        """Returns the solved Flame object for the leak size at index `leak_idx`"""
+        if self._flames[leak_idx] is None:
+            self._flames[leak_idx] = _flame.Flame.from_developed_flow(developing_flow=self.developing_flow(leak_idx),
+                                                                      chem=self.chem,
+                                                                      verbose=self.verbose)
+        return self._flames[leak_idx]
+
+    def overpressure_model(self, leak_idx):
+        """Returns the unconfined overpressure model for the leak size at index `leak_idx`"""
+        if self._overpressure_models[leak_idx] is None:
+            jet = _jet.Jet.from_developed_flow(developing_flow=self.developing_flow(leak_idx),
+                                               verbose=self.verbose)
+            self._overpressure_models[leak_idx] = effects.create_overpressure_model(
+                jet, self.overp_method,
+                BST_mach_flame_speed=self.bst_flame_speed,
+                TNT_equivalence_factor=self.tnt_factor)
+        return self._overpressure_models[leak_idx]
+
+    def check_inputs(self, rel_fluid, amb_fluid, pipe_inner_diam, leak_sizes,
+                     discharge_coeff=1, mass_flow_rates=None, nozzle_model='yuce', rel_angle=0,
+                     overp_method='bst', tnt_factor=0.03, bst_flame_speed=0.35):
+        """Checks that this release physics was created from the given inputs
+        (e.g., those of `conduct_analysis`), which are described in the class docstring.
+
+        Raises
+        ------
+        ValueError
+            If any of the inputs differ from those of this release physics
+        """
+        if mass_flow_rates is None:
+            mass_flow_rates = [None] * len(leak_sizes)
+        mismatched = []
+        if not _same_fluid(self.rel_fluid, rel_fluid):
+            mismatched.append('release fluid')
+        if not _same_fluid(self.amb_fluid, amb_fluid):
+            mismatched.append('ambient fluid')
+        if not _same_values([self.pipe_inner_diam], [pipe_inner_diam]):
+            mismatched.append('pipe_inner_diam')
+        if not _same_values(self.leak_sizes, leak_sizes):
+            mismatched.append('leak_sizes')
+        if not _same_values([self.discharge_coeff], [discharge_coeff]):
+            mismatched.append('discharge_coeff')
+        if not _same_values(self.mass_flow_rates, mass_flow_rates):
+            mismatched.append('mass_flow_rates')
+        if self.nozzle_model != nozzle_model:
+            mismatched.append('nozzle_model')
+        if not _same_values([self.rel_angle], [rel_angle]):
+            mismatched.append('rel_angle')
+        if self.overp_method != overp_method:
+            mismatched.append('overp_method')
+        elif overp_method == 'tnt' and not _same_values([self.tnt_factor], [tnt_factor]):
+            mismatched.append('tnt_factor')
+        elif overp_method == 'bst' and not _same_values([self.bst_flame_speed], [bst_flame_speed]):
+            mismatched.append('bst_flame_speed')
+        if mismatched:
+            raise ValueError('Release physics was not created from the analysis inputs; '
+                             + 'different inputs are: ' + ', '.join(mismatched))
+
+    def solve(self, thermal=True, overpressure=True, leak_indices=None, n_workers=1,
+              defer_errors=False):
+        """Solves the flame and/or overpressure model of the leak sizes,
+        so that copies of this object (e.g., sent to parallel workers)
+        do not each need to solve the physics.
+
+        Parameters
+        ----------
+        thermal : bool
+            Whether to solve the flames
+
+        overpressure : bool
+            Whether to solve the overpressure models
+
+        leak_indices : list of ints or None
+            Indices of the leak sizes to solve. If None, all leak sizes are solved.
+
+        n_workers : int or None
+            Number of processes in which to solve the leak sizes concurrently,
+            where None uses all CPUs and 1 (default) solves them in this process
+
+        defer_errors : bool
+            If True, a leak size whose physics fails to solve is left unsolved,
+            with a warning, so that the error is only raised if its physics is
+            later needed. If False (default), the error is raised here.
+
+        Returns
+        -------
+        self : ReleasePhysics object
+        """
+        if leak_indices is None:
+            leak_indices = range(len(self.leak_sizes))
+        unsolved = [leak_idx for leak_idx in leak_indices
+                    if (thermal and self._flames[leak_idx] is None)
+                    or (overpressure and self._overpressure_models[leak_idx] is None)]
+        if n_workers is None:
+            n_workers = mp.cpu_count()
+        n_workers = min(n_workers, len(unsolved))
+        inputs = [(self, leak_idx, thermal, overpressure, defer_errors) for leak_idx in unsolved]
+        if n_workers > 1:
+            with mp.Pool(n_workers) as pool:
+                results = pool.map(_solve_leak, inputs, chunksize=1)
+            for leak_idx, (developing_flow, flame, overpressure_model, _) in zip(unsolved, results):
+                if self._developing_flows[leak_idx] is None:
+                    self._developing_flows[leak_idx] = developing_flow
+                if self._flames[leak_idx] is None:
+                    self._flames[leak_idx] = flame
+                if self._overpressure_models[leak_idx] is None:
+                    self._overpressure_models[leak_idx] = overpressure_model
+        else:
+            results = [_solve_leak(leak_inputs) for leak_inputs in inputs]
+        for leak_idx, (_, _, _, error) in zip(unsolved, results):
+            if error is not None:
+                warnings.warn(f'Physics of {self.leak_sizes[leak_idx]}% leak size could not be solved '
+                              + f'({error}); it will be solved again if needed', category=PhysicsWarning)
+        return self
+
+    def heat_flux(self, locations, rel_humid=0.89):
+        """Returns the heat flux [W/m2] from the jet flame of each leak size (rows)
+        at each location (columns), given as (x, y, z) coordinates [m].
+        """
+        fluxes = np.zeros((len(self.leak_sizes), len(locations)))
+        if len(locations) > 0:
+            for leak_idx in range(len(self.leak_sizes)):
+                fluxes[leak_idx, :] = self.flame(leak_idx).generate_positional_flux(locations, rel_humid)
+        return fluxes
+
+    def overpressure(self, locations):
+        """Returns the peak overpressure [Pa] of each leak size (rows)
+        at each location (columns), given as (x, y, z) coordinates [m].
+        """
+        overpressures = np.zeros((len(self.leak_sizes), len(locations)))
+        if len(locations) > 0:
+            for leak_idx in range(len(self.leak_sizes)):
+                overpressures[leak_idx, :] = self.overpressure_model(leak_idx).calc_overpressure(locations)
+        return overpressures
+
+    def impulse(self, locations):
+        """Returns the impulse [Pa*s] of each leak size (rows)
+        at each location (columns), given as (x, y, z) coordinates [m].
+        Impulses are np.nan if the overpressure model does not give impulse.
+        """
+        impulses = np.zeros((len(self.leak_sizes), len(locations)))
+        if len(locations) > 0:
+            for leak_idx in range(len(self.leak_sizes)):
+                impulses[leak_idx, :] = self.overpressure_model(leak_idx).calc_impulse(locations)
+        return impulses
+
+
+def _solve_leak(args):
+    """Solves the physics of one leak size, for ReleasePhysics.solve.
+    Returns the developing flow, flame and overpressure model, where
+    those that were not (or could not be) solved are None,
+    and the error message if solving failed and errors are deferred.
+    """
+    release_physics, leak_idx, thermal, overpressure, defer_errors = args
+    error = None
+    try:
+        if thermal:
+            release_physics.flame(leak_idx)
+        if overpressure:
+            release_physics.overpressure_model(leak_idx)
+    except Exception as err:
+        if not defer_errors:
+            raise
+        error = str(err)
+    return (release_physics._developing_flows[leak_idx],
+            release_physics._flames[leak_idx] if thermal else None,
+            release_physics._overpressure_models[leak_idx] if overpressure else None,
+            error)
+
+
+def _same_fluid(fluid, other):
+    """Whether two fluids have the same species, phase, temperature and pressure"""
+    return (fluid.species == other.species and fluid.phase == other.phase
+            and _same_values([fluid.T, fluid.P], [other.T, other.P]))
+
+
+def _same_values(values, others):
+    """Whether two lists of floats (or Nones) are equal, to within round-off"""
+    if len(values) != len(others):
+        return False
+    for value, other in zip(values, others):
+        if value is None or other is None:
+            if value is not other:
+                return False
+        elif not np.isclose(value, other, rtol=1e-12, atol=0):
+            return False
+    return True
@@ -8,7 +8,7 @@ If not, see https://www.gnu.org/licenses/.
 
 from copy import deepcopy
 from re import search
-from typing import Optional, Iterable, Union
+from typing import Callable, Optional, Iterable, Union
 import warnings
 
 import numpy as np
@@ -17,11 +17,15 @@ from .uq.sampling import RandomStudy, LHSStudy
 from .uq.distributions import (
     specify_distribution, convert_distributions_to_deterministic)
 from .uq.parallel_evaluations import parallel_function_evaluations
+from .uq.results_store import UQResults, UQResultsWriter
 from .component_failure import ComponentFailureSet, ComponentFailure
 from .component import create_component_set
-from .analysis import conduct_analysis
+from .analysis import calc_scenario_frequencies, conduct_analysis
+from .release_physics import ReleasePhysics
+from ..phys import _comps, _therm
 from .defaults import (default_fueling_parameters,
-                       create_default_component_parameters)
+                       create_default_component_parameters,
+                       get_default_ignition_probs)
 
 
 def generate_uncertain_component_parameters(
@@ -509,8 +513,101 @@ def set_occupant_locations(uncertain_parameters):
     return stacked_locations
 
 
+def create_fluids(static_parameters:dict):
+    """Creates the release and ambient fluids for the QRA analysis
+    parameters not varied by sampling analysis.
+
+    Parameters
+    ----------
+    static_parameters : dict
+        Contains QRA analysis parameters not varied by sampling analysis
+
+    Returns
+    -------
+    rel_fluid : Fluid object
+        Release fluid
+
+    amb_fluid : Fluid object
+        Ambient fluid
+    """
+    amb_fluid = _comps.Fluid(species='AIR',
+                             T=static_parameters['amb_temp'],
+                             P=static_parameters['amb_pres'])
+    rel_fluid = _comps.Fluid(species=static_parameters['rel_species'],
+                             T=static_parameters['rel_temp'],
+                             P=static_parameters['rel_pres'],
+                             phase=static_parameters['rel_phase'])
+    return rel_fluid, amb_fluid
+
+
+def warm_worker_caches(static_parameters:dict):
+    """Initializer for the processes evaluating samples, which loads the
+    equation of state of the fluids and, if the combustion registry is enabled,
+    creates the combustion chemistry once per process, rather than in the
+    first sample each process evaluates.
+
+    Parameters
+    ----------
+    static_parameters : dict
+        Contains QRA analysis parameters not varied by sampling analysis
+    """
+    rel_fluid, amb_fluid = create_fluids(static_parameters)
+    if _therm.combustion_registry.enabled:
+        _therm.combustion_registry.get(_comps.Fluid(species=rel_fluid.species,
+                                                    T=amb_fluid.T, P=amb_fluid.P))
+
+
+def create_release_physics(static_parameters:dict):
+    """Creates the release physics for the QRA analysis parameters
+    not varied by sampling analysis, with the flames and overpressure
+    models solved for the leak sizes that can end in a jet fire
+    or explosion, respectively.
+
+    A leak size whose physics fails to solve is left unsolved, so that
+    the error is only raised if a sample needs that leak size.
+
+    Parameters
+    ----------
+    static_parameters : dict
+        Contains QRA analysis parameters not varied by sampling analysis
+
+    Returns
+    -------
+    ReleasePhysics object
+    """
+    rel_fluid, amb_fluid = create_fluids(static_parameters)
+    release_physics = ReleasePhysics(
+        rel_fluid, amb_fluid,
+        pipe_inner_diam=static_parameters['pipe_inner_diam'],
+        discharge_coeff=static_parameters['discharge_coeff'],
+        mass_flow_rates=static_parameters['mass_flow_rates'],
+        nozzle_model=static_parameters['nozzle_model'],
+        rel_angle=static_parameters['rel_angle'],
+        overp_method=static_parameters['overp_method'],
+        tnt_factor=static_parameters['tnt_factor'],
+        bst_flame_speed=static_parameters['bst_flame_speed'],
+        verbose=static_parameters['verbose'])
+
+    # The leak sizes needing each model do not depend on the sampled leak
+    # frequencies, as long as those are not zero
+    ign_probs = static_parameters['ign_probs']
+    if ign_probs is None:
+        ign_probs = get_default_ignition_probs(static_parameters['rel_species'])
+    end_state_probabilities, _ = calc_scenario_frequencies(
+        np.ones(len(release_physics.leak_sizes)), release_physics.discharge_rates,
+        ign_probs, static_parameters['detection_credit'])
+    release_physics.solve(thermal=True, overpressure=False,
+                          leak_indices=np.flatnonzero(end_state_probabilities[:, 2] != 0),
+                          defer_errors=True)
+    release_physics.solve(thermal=False, overpressure=True,
+                          leak_indices=np.flatnonzero(end_state_probabilities[:, 3] != 0),
+                          defer_errors=True)
+    return release_physics
+
+
 def calc_qra_at_distance(uncertain_parameters:dict,
-                         static_parameters:dict):
+                         static_parameters:dict,
+                         release_physics:Optional[Union[ReleasePhysics, None]]=None):
     """Takes a single set of uncertainty samples, maps the uncertain
      parameters to the QRA framework, and conducts the QRA.
 
@@ -522,6 +619,11 @@ def calc_qra_at_distance(uncertain_parameters:dict,
     static_parameters : dict
         Contains QRA analysis parameters not varied by sampling analysis
 
+    release_physics : ReleasePhysics or None, optional
+        Release physics for `static_parameters`, shared by all samples.
+        If `None`, the physics is solved for this sample.
+        Default is `None`.
+
     Returns
     -------
     results : dict
@@ -565,7 +667,8 @@ def calc_qra_at_distance(uncertain_parameters:dict,
         rel_humid=static_parameters['rel_humid'],
         verbose=static_parameters['verbose'],
         output_dir=static_parameters['output_dir'],
-        create_plots=static_parameters['create_plots'])
+        create_plots=static_parameters['create_plots'],
+        release_physics=release_physics)
 
     return results
 
@@ -654,7 +757,12 @@ def evaluate_qra_uq(species:Union[str, dict],
                     saturated_phase:Optional[Union[str, None]]=None,
                     include_defaults:Optional[bool]=True,
                     fix_to_mean:Optional[bool]=False,
-                    random_seed:Optional[Union[int, None]]=None):
+                    random_seed:Optional[Union[int, None]]=None,
+                    num_cpus:Optional[Union[int, None]]=None,
+                    chunksize:Optional[int]=1,
+                    callback:Optional[Union[Callable, None]]=None,
+                    results_dir:Optional[Union[str, None]]=None,
+                    shard_size:Optional[int]=1000):
     """Evaluates ensemble of parameter samples in QRA analysis
 
     Parameters
@@ -710,10 +818,37 @@ def evaluate_qra_uq(species:Union[str, dict],
         allow for reproducible results. If `None`, the state itself will
         be random. Default is `None`.
 
+    num_cpus : int or None, optional
+        Number of processes in which to evaluate the samples.
+        If `None`, the number of CPUs is used. Default is `None`.
+
+    chunksize : int, optional
+        Number of samples sent to a process at a time. Default is 1.
+
+    callback : Callable or None, optional
+        If given, called as `callback(sample_index, results)` as the
+        results of each sample complete, in any order, and the results
+        are not kept, so that memory use does not grow with the number
+        of samples. Default is `None`.
+
+    results_dir : str or None, optional
+        If given, the risk metrics, leak and end state frequencies,
+        PLL contributions, and effects at each position of each sample
+        are written to files in this directory as the samples complete
+        (see `UQResultsWriter`), along with the sampled parameter values,
+        rather than being kept in memory. If evaluating a sample fails,
+        the files written so far are removed. Default is `None`.
+
+    shard_size : int, optional
+        Number of samples kept in memory before being written,
+        if `results_dir` is given. Default is 1000.
+
     Returns
     -------
-    results_list : list
-        Result dictionaries for every parameter sample
+    results_list : list, UQResults, or None
+        Result dictionaries for every parameter sample,
+        the stored results if `results_dir` is given,
+        or None if `callback` is given
 
     uq_samples : dict
         Sampled values of all uncertain parameters
@@ -743,9 +878,42 @@ def evaluate_qra_uq(species:Union[str, dict],
     uq_samples = generate_uq_samples(study, study_distributions)
     inputs_per_sample = get_inputs_per_sample(uq_samples, num_samples)
 
-    results = \
-        parallel_function_evaluations(
-            calc_qra_at_distance, inputs_per_sample, additional_inputs={
-                'static_parameters': static_parameters})
+    # The release physics does not depend on the sampled parameters,
+    # so it is solved once and shared by all samples
+    release_physics = create_release_physics(static_parameters)
+
+    writer = None
+    if results_dir is not None:
+        writer = UQResultsWriter(results_dir, shard_size=shard_size)
+        user_callback = callback
+
+        def callback(index, sample_results):
+            writer(index, sample_results)
+            if user_callback is not None:
+                user_callback(index, sample_results)
+
+    try:
+        if writer is not None:
+            writer.write_samples(uq_samples)
+        results = \
+            parallel_function_evaluations(
+                calc_qra_at_distance, inputs_per_sample,
+                num_cpus=num_cpus,
+                additional_inputs={
+                    'static_parameters': static_parameters,
+                    'release_physics': release_physics},
+                chunksize=chunksize,
+                initializer=warm_worker_caches,
+                initargs=(static_parameters,),
+                callback=callback)
+    except BaseException:
+        # Partial results are not left behind to be mistaken for a study
+        if writer is not None:
+            writer.discard()
+        raise
+
+    if writer is not None:
+        writer.close()
+        results = UQResults(results_dir)
 
     return results, uq_samples
@@ -8,3 +8,4 @@ If not, see https://www.gnu.org/licenses/.
 
 from . import sampling
 from . import distributions
+from . import results_store
@@ -6,18 +6,239 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 
+import itertools
 import multiprocessing as mp
 import functools
-from typing import Callable, Union, Optional
+import queue
+from typing import Callable, Iterable, Union, Optional
 
 """Script to holder parallelization functions"""
 
 
+# Function (with its additional inputs) evaluated by a worker process,
+# set once per process by _initialize_worker
+_worker_function = None
+
+# Interval (s) at which to check that the worker processes are alive while waiting for results
+_POLL_INTERVAL = 0.5
+
+
+def _initialize_worker(function:Callable,
+                       initializer:Optional[Union[Callable, None]],
+                       initargs:tuple):
+    """Sets the function to evaluate in a worker process and runs the initializer"""
+    global _worker_function
+    _worker_function = function
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _evaluate_chunk(chunk:list) -> list:
+    """Evaluates the worker function for a chunk of (index, input) pairs"""
+    return [(index, _worker_function(inputs)) for index, inputs in chunk]
+
+
+class ParallelExecutor:
+    """
+    Evaluates a function with a dictionary input for many inputs
+    in a pool of processes.
+
+    Inputs are sent to the workers in chunks, with at most `max_in_flight`
+    chunks submitted and not yet collected at a time, and results are
+    returned as they complete, so that memory use does not grow with
+    the number of inputs. The function and its additional inputs are sent
+    to each worker once, when the worker starts.
+
+    The pool is started when first needed and is reused until `close`
+    is called (or the `with` block is exited). If a worker process dies
+    (e.g., is killed for using too much memory), the chunk it was evaluating
+    is lost, so the pool is terminated and a RuntimeError is raised.
+
+    Parameters
+    ----------
+    function : Callable
+        Function to evaluate, called as `function(inputs, **additional_inputs)`
+
+    num_cpus : int or None
+        Number of worker processes. If None, the number of CPUs is used.
+        If 1, the function is evaluated in this process.
+
+    additional_inputs : dict or None
+        Additional arguments to pass to function
+
+    chunksize : int
+        Number of inputs sent to a worker at a time. Default is 1.
+
+    max_in_flight : int or None
+        Maximum number of chunks submitted but not yet collected.
+        If None, twice the number of worker processes is used.
+
+    initializer : Callable or None
+        Function called once in each worker process when it starts
+        (e.g., to fill thermodynamic or combustion caches),
+        or once in this process if `num_cpus` is 1
+
+    initargs : tuple
+        Arguments for `initializer`
+    """
+    def __init__(self,
+                 function:Callable,
+                 num_cpus:Optional[Union[int, None]]=None,
+                 additional_inputs:Optional[Union[dict, None]]=None,
+                 chunksize:int=1,
+                 max_in_flight:Optional[Union[int, None]]=None,
+                 initializer:Optional[Union[Callable, None]]=None,
+                 initargs:tuple=()):
+        if num_cpus is None:
+            num_cpus = mp.cpu_count()
+        if additional_inputs is None:
+            additional_inputs = {}
+        if chunksize < 1:
+            raise ValueError('chunksize must be at least 1')
+        if max_in_flight is None:
+            max_in_flight = 2 * num_cpus
+        if max_in_flight < 1:
+            raise ValueError('max_in_flight must be at least 1')
+        self.function = functools.partial(function, **additional_inputs)
+        self.num_cpus = num_cpus
+        self.chunksize = chunksize
+        self.max_in_flight = max_in_flight
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool = None
+        self._worker_pids = None
+        self._initialized = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the worker processes once they finish their work"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def terminate(self):
+        """Stops the worker processes immediately"""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = mp.Pool(self.num_cpus, initializer=_initialize_worker,
+                                 initargs=(self.function, self.initializer, self.initargs))
+            self._worker_pids = {process.pid for process in self._pool._pool}
+        return self._pool
+
+    def _workers_alive(self):
+        """Whether all of the original worker processes are running;
+        the pool replaces workers that die, so a changed process ID also means one died"""
+        processes = list(self._pool._pool)
+        return (all(process.exitcode is None for process in processes)
+                and {process.pid for process in processes} == self._worker_pids)
+
+    def _get_completed(self, completed:queue.SimpleQueue):
+        """Waits for the results of a chunk,
+        terminating the pool and raising an error if a worker process died"""
+        while True:
+            try:
+                return completed.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._workers_alive():
+                    self.terminate()
+                    raise RuntimeError('A worker process exited unexpectedly, '
+                                       'losing the inputs it was evaluating')
+
+    def imap_unordered(self, inputs:Iterable):
+        """Evaluates the function for each of the inputs,
+        yielding (index of input, result) pairs as they complete.
+
+        Inputs may be any iterable (e.g., a generator), which is only read
+        as far as needed to keep `max_in_flight` chunks submitted.
+        """
+        indexed_inputs = enumerate(inputs)
+        if self.num_cpus <= 1:
+            if not self._initialized and self.initializer is not None:
+                self.initializer(*self.initargs)
+            self._initialized = True
+            for index, sample_inputs in indexed_inputs:
+                yield index, self.function(sample_inputs)
+            return
+
+        pool = self._get_pool()
+        completed = queue.SimpleQueue()
+        in_flight = 0
+        error = None
+        try:
+            while True:
+                # After an error, no more chunks are submitted and those in flight are collected
+                chunk = [] if error else list(itertools.islice(indexed_inputs, self.chunksize))
+                if chunk:
+                    pool.apply_async(_evaluate_chunk, (chunk,),
+                                     callback=completed.put, error_callback=completed.put)
+                    in_flight += 1
+                while in_flight >= self.max_in_flight or (in_flight > 0 and not chunk):
+                    results = self._get_completed(completed)
+                    in_flight -= 1
+                    if isinstance(results, BaseException):
+                        error = error or results
+                    elif error is None:
+                        yield from results
+                if not chunk:
+                    break
+        except (KeyboardInterrupt, RuntimeError):
+            self.terminate()
+            in_flight = 0
+            raise
+        finally:
+            # Collect chunks still in flight (e.g., if iteration stopped early),
+            # rather than terminating workers that may be part way through sending results
+            while in_flight > 0:
+                self._get_completed(completed)
+                in_flight -= 1
+        if error is not None:
+            raise error
+
+    def map(self, inputs:Iterable) -> list:
+        """Returns the results of the function for each of the inputs, in order"""
+        results = {}
+        for index, result in self.imap_unordered(inputs):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    def run(self, inputs:Iterable, callback:Callable):
+        """Evaluates the function for each of the inputs,
+        calling `callback(index, result)` as each result completes
+        rather than keeping the results.
+
+        Returns
+        -------
+        num_evaluations : int
+            Number of inputs evaluated
+        """
+        num_evaluations = 0
+        for index, result in self.imap_unordered(inputs):
+            callback(index, result)
+            num_evaluations += 1
+        return num_evaluations
+
+
 def parallel_function_evaluations(input_function:Callable,
                                   input_dictionary_list:list,
                                   num_cpus:Optional[Union[int, None]]=None,
-                                  additional_inputs:Optional[Union[dict, None]]=None
-                                  ) -> list:
+                                  additional_inputs:Optional[Union[dict, None]]=None,
+                                  chunksize:int=1,
+                                  max_in_flight:Optional[Union[int, None]]=None,
+                                  initializer:Optional[Union[Callable, None]]=None,
+                                  initargs:tuple=(),
+                                  callback:Optional[Union[Callable, None]]=None
+                                  ) -> Union[list, None]:
     """Function to evaluate a function with a dictionary input in a parallel fashion
         Parameters
     ----------
@@ -27,16 +248,32 @@ def parallel_function_evaluations(input_function:Callable,
         Defaults to None
     additional_input: dict
         Additional arguments to pass to function
+    chunksize: int
+        Number of inputs sent to a worker at a time. Defaults to 1
+    max_in_flight: int
+        Maximum number of chunks submitted but not yet collected.
+        Defaults to None, which is twice the number of processes
+    initializer: Callable
+        Function called once in each worker process when it starts
+    initargs: tuple
+        Arguments for initializer
+    callback: Callable
+        If given, called as callback(index, result) as each result completes,
+        and results are not kept (None is returned). Defaults to None
     """
     if num_cpus == None:
         num_cpus = mp.cpu_count()
 
-    if additional_inputs == None:
-        additional_inputs = {}
-
-    pool_size = min(num_cpus, len(input_dictionary_list))
-    f_partial = functools.partial(input_function, **additional_inputs)
-    pool = mp.Pool(pool_size)
-    with mp.Pool(pool_size) as pool:
-        results = pool.map(f_partial, input_dictionary_list)
+    pool_size = max(1, min(num_cpus, len(input_dictionary_list)))
+    with ParallelExecutor(input_function, num_cpus=pool_size,
+                          additional_inputs=additional_inputs,
+                          chunksize=chunksize,
+                          max_in_flight=max_in_flight,
+                          initializer=initializer,
+                          initargs=initargs) as executor:
+        if callback is None:
+            results = executor.map(input_dictionary_list)
+        else:
+            executor.run(input_dictionary_list, callback)
+            results = None
     return results
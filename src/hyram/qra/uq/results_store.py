@@ -0,0 +1,313 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import json
+import os
+from typing import Iterable, Optional, Union
+
+import numpy as np
+
+""" module for storing uncertainty study results in local files """
+
+
+METADATA_FILENAME = 'metadata.json'
+SAMPLES_FILENAME = 'samples.npy'
+SHARD_DIRNAME = 'shards'
+
+# Per-sample metrics of the QRA results (see `extract_qra_fields`)
+scalar_fields = ['total_pll', 'far', 'air']
+
+
+def extract_qra_fields(results:dict) -> dict:
+    """Returns the metrics of the QRA results of one sample as arrays
+
+    Parameters
+    ----------
+    results : dict
+        Results from `conduct_analysis`
+
+    Returns
+    -------
+    fields : dict
+        total_pll, far, air : float
+            Risk metrics
+
+        leak_frequencies : array
+            [1/yr] Frequency of each leak size
+
+        end_state_frequencies : array
+            [1/yr] Frequency of each end state (columns) for each leak size (rows)
+
+        pll_contributions : array
+            Fractional contribution to total PLL of each end state (columns)
+            for each leak size (rows)
+
+        positions : array
+            (x,y,z) coordinates of occupants (rows)
+
+        position_qrads, position_overps, position_impulses : array
+            Heat flux [W/m2], peak overpressure [Pa], and impulse [Pa s]
+            for each position (rows) for each leak size (columns)
+    """
+    leak_results = results['leak_results']
+    positions = np.asarray(results['positions'], dtype=float)
+    end_states = [leak_result['result_dicts'][:-1] for leak_result in leak_results]
+    return {
+        'total_pll': results['total_pll'],
+        'far': results['far'],
+        'air': results['air'],
+        'leak_frequencies': [leak_result['frequency'] for leak_result in leak_results],
+        'end_state_frequencies': [[end_state['events'] for end_state in leak] for leak in end_states],
+        'pll_contributions': [[end_state['pll'] for end_state in leak] for leak in end_states],
+        'positions': positions.T if positions.size > 0 else np.zeros((0, 3)),
+        'position_qrads': results['position_qrads'],
+        'position_overps': results['position_overps'],
+        'position_impulses': results['position_impulses'],
+    }
+
+
+class UQResultsWriter:
+    """
+    Writes the results of an uncertainty study to a directory
+    as they are calculated, with one array file per metric.
+
+    Samples may be written in any order. They are kept in memory
+    `shard_size` at a time and then written to shard files, which
+    `close` gathers into a single file for each metric, in sample order,
+    that `UQResults` memory-maps.
+
+    An object can be passed as the `callback` of
+    `evaluate_qra_uq` or `parallel_function_evaluations`.
+    Used as a context manager, it closes on success and discards
+    what it has written if an exception is raised.
+
+    Parameters
+    ----------
+    directory : str
+        Directory in which to write results, which is created if needed
+        and should not already hold results or shards of partial results
+
+    shard_size : int
+        Number of samples kept in memory before being written to a shard.
+        Default is 1000.
+
+    extract_fields : Callable
+        Function returning a dictionary of arrays (or floats)
+        for the results of one sample. Default is `extract_qra_fields`.
+    """
+    def __init__(self, directory:str, shard_size:int=1000, extract_fields=extract_qra_fields):
+        if shard_size < 1:
+            raise ValueError('shard_size must be at least 1')
+        if os.path.exists(os.path.join(directory, METADATA_FILENAME)):
+            raise FileExistsError(f'Results already exist in {directory}')
+        shard_dir = os.path.join(directory, SHARD_DIRNAME)
+        if os.path.isdir(shard_dir) and os.listdir(shard_dir):
+            raise FileExistsError(f'Partial results already exist in {shard_dir}')
+        self.directory = directory
+        self.shard_size = shard_size
+        self.extract_fields = extract_fields
+        self.num_samples = 0
+        self._created_directory = not os.path.isdir(directory)
+        self._shard_dir = shard_dir
+        os.makedirs(self._shard_dir, exist_ok=True)
+        self._shard_files = []
+        self._samples_file = None
+        self._indices = []
+        self._buffer = {}
+        self._sample_names = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def __call__(self, index:int, results:dict):
+        """Adds the results of the sample with the given index"""
+        fields = self.extract_fields(results)
+        if self._buffer and set(fields) != set(self._buffer):
+            raise ValueError('Results of every sample must have the same fields')
+        for name, value in fields.items():
+            self._buffer.setdefault(name, []).append(np.asarray(value, dtype=float))
+        self._indices.append(index)
+        self.num_samples += 1
+        if len(self._indices) >= self.shard_size:
+            self._write_shard()
+
+    def write_samples(self, samples:dict):
+        """Writes the sampled values of the uncertain parameters,
+        e.g., from `generate_uq_samples`
+        """
+        self._sample_names = list(samples)
+        values = np.column_stack([np.asarray(samples[name], dtype=float) for name in self._sample_names])
+        self._samples_file = os.path.join(self.directory, SAMPLES_FILENAME)
+        np.save(self._samples_file, values)
+
+    def _write_shard(self):
+        if not self._indices:
+            return
+        shard = {name: np.stack(values) for name, values in self._buffer.items()}
+        shard['sample_index'] = np.array(self._indices)
+        shard_file = os.path.join(self._shard_dir, f'shard_{len(self._shard_files):06d}.npz')
+        self._shard_files.append(shard_file)
+        np.savez(shard_file, **shard)
+        self._indices = []
+        self._buffer = {name: [] for name in self._buffer}
+
+    def close(self):
+        """Writes the remaining samples and gathers the shards into one file
+        for each metric, ordered by sample index
+        """
+        if self._shard_dir is None:
+            return
+        self._write_shard()
+        shard_files = self._shard_files
+        indices = [np.zeros(0, dtype=int)]
+        for shard_file in shard_files:
+            with np.load(shard_file) as shard:
+                indices.append(shard['sample_index'])
+        indices = np.concatenate(indices)
+        # Row of each sample in the gathered files
+        rows = np.empty(len(indices), dtype=int)
+        rows[np.argsort(indices, kind='stable')] = np.arange(len(indices))
+
+        shapes = {}
+        outputs = {}
+        start = 0
+        for shard_file in shard_files:
+            with np.load(shard_file) as shard:
+                num_rows = len(shard['sample_index'])
+                shard_rows = rows[start:start + num_rows]
+                for name in shard.files:
+                    if name == 'sample_index':
+                        continue
+                    if name not in outputs:
+                        shapes[name] = shard[name].shape[1:]
+                        outputs[name] = np.lib.format.open_memmap(
+                            os.path.join(self.directory, f'{name}.npy'), mode='w+',
+                            dtype=float, shape=(len(indices),) + shapes[name])
+                    outputs[name][shard_rows] = shard[name]
+            start += num_rows
+        for output in outputs.values():
+            output.flush()
+        del outputs
+        np.save(os.path.join(self.directory, 'sample_index.npy'), np.sort(indices))
+
+        metadata = {'num_samples': int(len(indices)),
+                    'fields': {name: list(shape) for name, shape in shapes.items()},
+                    'sample_names': self._sample_names}
+        with open(os.path.join(self.directory, METADATA_FILENAME), 'w') as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+        for shard_file in shard_files:
+            os.remove(shard_file)
+        os.rmdir(self._shard_dir)
+        self._shard_dir = None
+
+    def discard(self):
+        """Removes the shards and sampled values written so far,
+        e.g., if evaluating the samples failed, and the directory
+        if it was created by this writer and is left empty
+        """
+        if self._shard_dir is None:
+            return
+        for path in self._shard_files + [self._samples_file]:
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+        if not os.listdir(self._shard_dir):
+            os.rmdir(self._shard_dir)
+        if self._created_directory and not os.listdir(self.directory):
+            os.rmdir(self.directory)
+        self._shard_files = []
+        self._indices = []
+        self._buffer = {}
+        self._shard_dir = None
+
+
+class UQResults:
+    """
+    Results of an uncertainty study written by `UQResultsWriter`,
+    with each metric memory-mapped from its file rather than read into memory.
+
+    Metrics are accessed by name, e.g., `results['total_pll']`,
+    as arrays with one row per sample, in sample order.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the results
+    """
+    def __init__(self, directory:str):
+        metadata_path = os.path.join(directory, METADATA_FILENAME)
+        if not os.path.exists(metadata_path):
+            raise FileNotFoundError(f'No complete results in {directory}')
+        with open(metadata_path) as metadata_file:
+            metadata = json.load(metadata_file)
+        self.directory = directory
+        self.num_samples = metadata['num_samples']
+        self.fields = list(metadata['fields'])
+        self.sample_names = metadata['sample_names']
+        self._arrays = {}
+
+    def __len__(self):
+        return self.num_samples
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def __getitem__(self, name:str) -> np.ndarray:
+        if name not in self.fields:
+            raise KeyError(f'{name} is not a stored field; stored fields are {self.fields}')
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+        return self._arrays[name]
+
+    @property
+    def sample_index(self) -> np.ndarray:
+        """Index of each stored sample"""
+        return np.load(os.path.join(self.directory, 'sample_index.npy'))
+
+    def samples(self) -> dict:
+        """Returns the sampled values of each uncertain parameter,
+        if they were written"""
+        if self.sample_names is None:
+            return {}
+        values = np.load(os.path.join(self.directory, SAMPLES_FILENAME), mmap_mode='r')
+        return {name: values[:, i] for i, name in enumerate(self.sample_names)}
+
+    def percentiles(self, name:str,
+                    q:Union[float, Iterable[float]]=(5, 50, 95)) -> np.ndarray:
+        """Returns percentiles over all samples of a metric,
+        e.g., with `q` of (5, 50, 95), the first row (or element)
+        is the 5th percentile of the metric
+        """
+        return np.percentile(self[name], q, axis=0)
+
+    def summary(self, names:Optional[Union[Iterable[str], None]]=None,
+                q:Iterable[float]=(5, 50, 95)) -> dict:
+        """Returns the mean and percentiles over all samples of metrics
+        (by default, the risk metrics PLL, FAR, and AIR)
+
+        Returns
+        -------
+        summary : dict
+            For each metric, a dictionary with 'mean' and
+            each percentile (e.g., 'p5', 'p50', 'p95')
+        """
+        if names is None:
+            names = [name for name in scalar_fields if name in self.fields]
+        summary = {}
+        for name in names:
+            values = self[name]
+            summary[name] = {'mean': np.mean(values, axis=0)}
+            for percentile, value in zip(q, self.percentiles(name, q)):
+                summary[name][f'p{percentile:g}'] = value
+        return summary
@@ -0,0 +1,48 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+
+Timing of the flame governing equations, solution, and radiative heat flux.
+Run from the top-level directory using: python -m tests.hyram.benchmarks.bench_flame
+"""
+import timeit
+
+import numpy as np
+
+from hyram.phys import Fluid, Flame, Orifice
+
+
+def main(repeat=5):
+    release_fluid = Fluid('H2', T=288, P=35e6)
+    ambient_fluid = Fluid('AIR', T=288, P=101325)
+    flame = Flame(release_fluid, Orifice(d=0.00356), ambient_fluid, theta0=np.pi/4)
+    i = len(flame.S)//2
+    ind_vars = [flame.__dict__[k][i] for k in ['V_cl', 'B', 'theta', 'f_cl', 'x', 'y']]
+    f = flame.f_cl[i]*np.exp(-np.linspace(0, 5/flame.lamf, 100)**2)
+
+    n = 1000
+    t_rho = min(timeit.repeat(lambda: flame.chem.rho_drhodf(f), number=n, repeat=repeat))/n
+    t_rho_separate = min(timeit.repeat(lambda: (flame.chem.rho_prod(f), flame.chem.drhodf(f)),
+                                       number=n, repeat=repeat))/n
+    t_rhs = min(timeit.repeat(lambda: flame._govEqns(flame.S[i], ind_vars), number=n, repeat=repeat))/n
+    t_solve = min(timeit.repeat(lambda: flame.solve(), number=1, repeat=repeat))
+    x, y = np.meshgrid(np.linspace(-10, 20, 500), np.linspace(-5, 15, 200))  # 10^5 observers
+    t_qrad = min(timeit.repeat(lambda: flame.Qrad_multi(x, y, np.ones_like(x), 0.89), number=1, repeat=repeat))
+    field_args = (np.linspace(-10, 20, 61), np.linspace(-5, 15, 41), 1)  # refined to 481 x 321 points
+    t_field = min(timeit.repeat(lambda: flame.heat_flux_field(*field_args, refinements=3), number=1, repeat=repeat))
+    t_field_uniform = min(timeit.repeat(lambda: flame.heat_flux_field(*field_args, contours=[], refinements=0),
+                                        number=1, repeat=repeat))
+    print('Combustion.rho_drhodf             %9.1f us' % (t_rho*1e6))
+    print('Combustion.rho_prod and drhodf    %9.1f us' % (t_rho_separate*1e6))
+    print('Flame._govEqns                    %9.1f us' % (t_rhs*1e6))
+    print('Flame.solve                       %9.1f ms' % (t_solve*1e3))
+    print('Flame.Qrad_multi, 10^5 observers  %9.1f ms' % (t_qrad*1e3))
+    print('Flame.heat_flux_field, coarse     %9.1f ms' % (t_field_uniform*1e3))
+    print('Flame.heat_flux_field, refined x3 %9.1f ms' % (t_field*1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+
+Timing of the jet energy equation integration options.
+Run from the top-level directory using: python -m tests.hyram.benchmarks.bench_jet
+"""
+import timeit
+
+from hyram.phys import Fluid, Jet, Orifice
+
+
+def main(repeat=5):
+    release_fluid = Fluid('H2', T=298, P=35e6)
+    ambient_fluid = Fluid('AIR', T=298, P=101325)
+    jet = Jet(release_fluid, Orifice(d=0.003), ambient_fluid)
+    ind_vars = [jet.__dict__[k][len(jet.S)//2] for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y']]
+    S = jet.S[len(jet.S)//2]
+
+    print('%-32s %12s %12s' % ('energy integration', '_govEqns', 'Jet.solve'))
+    for label, kwargs in [('trapezoid, numpts=500', {}),
+                          ('Gauss-Laguerre, numquad=16', {'numquad':16}),
+                          ('Gauss-Laguerre, numquad=32', {'numquad':32})]:
+        n = 1000
+        t_rhs = min(timeit.repeat(lambda: jet._govEqns(S, ind_vars, **kwargs), number=n, repeat=repeat))/n
+        t_solve = min(timeit.repeat(lambda: jet.solve(**kwargs), number=1, repeat=repeat))
+        print('%-32s %9.1f us %10.1f ms' % (label, t_rhs*1e6, t_solve*1e3))
+
+
+if __name__ == '__main__':
+    main()
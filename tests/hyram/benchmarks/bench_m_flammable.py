@@ -0,0 +1,61 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+
+Timing of the flammable mass calculation on a 5000-node plume, compared to
+root-finding and quadrature at each node (the previous implementation).
+Run from the top-level directory using: python -m tests.hyram.benchmarks.bench_m_flammable
+"""
+import timeit
+
+import numpy as np
+from scipy import integrate, optimize
+import scipy.constants as const
+
+from hyram.phys import Fluid, Jet, Orifice
+
+
+def m_flammable_by_node(jet, Ylean, Yrich):
+    '''flammable mass using brentq for the radii and quad for the integral at each node'''
+    rho_amb = jet.ambient.rho
+    iend = np.argmax(jet.Y_cl <= Ylean)
+    S, Y_cl, B, rho_cl = jet.S[:iend], jet.Y_cl[:iend], jet.B[:iend], jet.rho_cl[:iend]
+    mass_per_len = []
+    for i in range(len(S)):
+        rho = lambda r: (rho_cl[i] - rho_amb)*np.exp(-r**2/(jet.lam*B[i]**2)) + rho_amb
+        Y = lambda r: rho_cl[i]*Y_cl[i]*np.exp(-r**2/(jet.lam*B[i])**2)/rho(r)
+        r_lean = 0 if Y(0) <= Ylean else optimize.brentq(lambda r: Y(r) - Ylean, 0, 100*B[i])
+        r_rich = 0 if Y(0) <= Yrich else optimize.brentq(lambda r: Y(r) - Yrich, 0, 100*B[i])
+        mass_per_len.append(integrate.quad(lambda r: Y(r)*rho(r)*2*const.pi*r, r_rich, r_lean)[0])
+    return integrate.trapezoid(mass_per_len, S)
+
+
+def main(repeat=3, nodes=5000):
+    release_fluid = Fluid('H2', T=298, P=35e6)
+    ambient_fluid = Fluid('AIR', T=298, P=101325)
+    jet = Jet(release_fluid, Orifice(d=0.003), ambient_fluid)
+    # resample the plume onto many nodes using the dense output of the integrator
+    S = np.geomspace(jet.S[0], jet.S[-1], nodes)
+    for k, v in jet.interpolate(S).items():
+        jet.__dict__[k] = v
+    jet.S = S
+    jet._dense_output = None
+
+    MW_fluid, MW_air = release_fluid.therm.MW, ambient_fluid.therm.MW
+    X_lean, X_rich = 0.04, 0.75
+    Ylean = X_lean*MW_fluid/(X_lean*MW_fluid + (1 - X_lean)*MW_air)
+    Yrich = X_rich*MW_fluid/(X_rich*MW_fluid + (1 - X_rich)*MW_air)
+
+    t_node = min(timeit.repeat(lambda: m_flammable_by_node(jet, Ylean, Yrich), number=1, repeat=repeat))
+    t_vector = min(timeit.repeat(lambda: jet.m_flammable(X_lean, X_rich), number=1, repeat=repeat))
+    print('%d-node plume' % nodes)
+    print('%-32s %10.1f ms  %.6e kg' % ('brentq and quad at each node', t_node*1e3,
+                                        m_flammable_by_node(jet, Ylean, Yrich)))
+    print('%-32s %10.1f ms  %.6e kg' % ('Jet.m_flammable (vectorized)', t_vector*1e3, jet.m_flammable(X_lean, X_rich)))
+
+
+if __name__ == '__main__':
+    main()
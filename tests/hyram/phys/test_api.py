@@ -560,6 +560,27 @@ class JetFlameAnalysisTestCase(unittest.TestCase):
         self.assertGreater(visible_length, 0)
         self.assertGreater(radiant_frac, 0)
 
+    def test_jet_flame_screening(self):
+        (_, _, pos_flux, mass_flow, srad, visible_length, radiant_frac
+         ) = api.jet_flame_analysis(self.amb_fluid, self.rel_fluid,
+                                    self.orif_diam, mass_flow=self.input_mass_flow,
+                                    dis_coeff=self.dis_coeff, rel_angle=self.rel_angle,
+                                    nozzle_key=self.nozzle_key, rel_humid=self.rel_humid,
+                                    create_temp_plot=False, create_flux_plot=False,
+                                    flux_coordinates=self.flux_coordinates,
+                                    output_dir=OUTPUT_DIR, verbose=VERBOSE)
+        screened = api.jet_flame_screening(self.amb_fluid, self.rel_fluid,
+                                           self.orif_diam, mass_flow=self.input_mass_flow,
+                                           dis_coeff=self.dis_coeff, rel_angle=self.rel_angle,
+                                           nozzle_key=self.nozzle_key, rel_humid=self.rel_humid,
+                                           flux_coordinates=self.flux_coordinates, verbose=VERBOSE)
+        np.testing.assert_allclose(screened[1:], [mass_flow, srad, visible_length, radiant_frac], rtol=1e-12)
+        np.testing.assert_allclose(screened[0], pos_flux, rtol=0.25)
+
+    def test_jet_flame_screening_without_flux(self):
+        pos_flux, *_ = api.jet_flame_screening(self.amb_fluid, self.rel_fluid, self.orif_diam)
+        self.assertIsNone(pos_flux)
+
 
 class OverpressureTestCase(unittest.TestCase):
     """
@@ -6,11 +6,19 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 """
 
+import dataclasses
+import pickle
 import unittest
+import warnings
+
+import numpy as np
+from scipy import constants as const
+from scipy import integrate
 
 import hyram.phys.api as phys_api
-from hyram.phys import Orifice, Flame
-from hyram.phys._flame import calc_transmissivity
+from hyram.phys import Orifice, Flame, Fluid, combustion_registry
+from hyram.phys import _flame
+from hyram.phys._flame import calc_transmissivity, transmissivity_coefficients
 
 
 VERBOSE = False
@@ -55,6 +63,19 @@ class TestAtmosphericTransmissivity(unittest.TestCase):
             tau_diff_pct = (calc_tau - paper_tau) / paper_tau * 100
             self.assertLessEqual(tau_diff_pct, 0.6)
 
+    def test_coefficients(self):
+        path_lengths = np.geomspace(1e-2, 1e4, 50)
+        for amb_temp in [253, 288, 303]:
+            for rel_humid in [0.1, 0.5, 0.89]:
+                tau0, tau1, tau2 = transmissivity_coefficients(amb_temp, rel_humid)
+                log_path_lengths = np.log10(path_lengths)
+                np.testing.assert_allclose(tau0 + tau1 * log_path_lengths + tau2 * log_path_lengths ** 2,
+                                           calc_transmissivity(path_lengths, amb_temp, rel_humid), rtol=1e-12)
+
+    def test_coefficients_array_inputs(self):
+        self.assertEqual(transmissivity_coefficients(np.array(288.), np.array([0.89])),
+                         transmissivity_coefficients(288, 0.89))
+
 
 class TestFlameObject(unittest.TestCase):
     """
@@ -81,3 +102,175 @@ class TestFlameObject(unittest.TestCase):
         rel_humid = 0.5
         fluxes = self.flame.generate_positional_flux(locations, rel_humid)
         self.assertEqual(len(fluxes), 0)
+
+    def test_Qrad_multi_shapes(self):
+        x, y = np.meshgrid(np.linspace(-2, 8, 7), np.linspace(-1, 5, 5))
+        z = 0.5 * np.ones_like(x)
+        flux_grid = self.flame.Qrad_multi(x, y, z, 0.89)
+        flux_points = self.flame.Qrad_multi(x.ravel(), y.ravel(), z.ravel(), 0.89)
+        self.assertEqual(flux_grid.shape, x.shape)
+        np.testing.assert_allclose(flux_grid.ravel(), flux_points, rtol=1e-12)
+        self.assertAlmostEqual(float(self.flame.Qrad_multi(x[2, 3], y[2, 3], z[2, 3], 0.89)), flux_grid[2, 3])
+        np.testing.assert_array_equal(self.flame.Qrad_multi(x, y, z, np.array([0.89])), flux_grid)
+
+    def test_Qrad_multi_humidity_at_each_point(self):
+        x, y = np.meshgrid(np.linspace(-2, 8, 7), np.linspace(-1, 5, 5))
+        z = 0.5 * np.ones_like(x)
+        RH = np.linspace(0.1, 0.9, x.size).reshape(x.shape)
+        expected = [self.flame.Qrad_multi(xi, yi, zi, RHi) for xi, yi, zi, RHi in zip(x.flat, y.flat, z.flat, RH.flat)]
+        np.testing.assert_allclose(self.flame.Qrad_multi(x, y, z, RH), np.reshape(expected, x.shape), rtol=1e-12)
+        locations = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=-1)
+        np.testing.assert_allclose(self.flame.generate_positional_flux(locations, RH.ravel()), expected, rtol=1e-12)
+
+    def test_Qrad_multi_chunks(self):
+        rng = np.random.default_rng(0)
+        x, y, z = rng.uniform(-5, 10, (3, 1000))
+        expected = self.flame.Qrad_multi(x, y, z, 0.89)
+        max_elements = _flame._QRAD_MAX_ELEMENTS
+        try:
+            _flame._QRAD_MAX_ELEMENTS = 50 * 64 + 7  # uneven chunks of observers
+            calculated = self.flame.Qrad_multi(x, y, z, 0.89)
+        finally:
+            _flame._QRAD_MAX_ELEMENTS = max_elements
+        np.testing.assert_allclose(calculated, expected, rtol=1e-12)
+
+    def test_distance_to_heatflux_methods_match(self):
+        levels = np.array([1577, 4732, 25237])  # W/m^2
+        for direction, negative_direction in [('x', False), ('x', True), ('y', False), ('z', False)]:
+            with self.subTest(direction=direction, negative_direction=negative_direction):
+                scanned = self.flame.calc_distance_to_heatflux(levels, direction=direction, max_distance=50,
+                                                               negative_direction=negative_direction)
+                solved = self.flame.calc_distance_to_heatflux(levels, direction=direction, max_distance=50,
+                                                              negative_direction=negative_direction, method='brent')
+                self.assertEqual(solved.shape, levels.shape)
+                # scan (10,000 points out to 50 m) ends one step short of where a level is never reached
+                np.testing.assert_allclose(solved, scanned, atol=2*50/1e4)
+
+    def test_radiation_source_flux(self):
+        source = self.flame.radiation_source()
+        points = [(1, 2, 0.5), (4, 0, -1), (-2, 1, 3)]
+        np.testing.assert_allclose(source.flux(points, 0.89),
+                                   self.flame.Qrad_multi(*np.transpose(points), 0.89), rtol=1e-12)
+        np.testing.assert_allclose(source.flux(points, 0.89), self.flame.generate_positional_flux(points, 0.89),
+                                   rtol=1e-12)
+
+    def test_radiation_source_reused(self):
+        source = self.flame.radiation_source()
+        self.assertIs(self.flame.radiation_source(), source)
+        self.assertIsNot(self.flame.radiation_source(N=20), source)
+        self.flame.solve()
+        self.assertIsNot(self.flame.radiation_source(), source)
+
+    def test_radiation_source_immutable(self):
+        source = self.flame.radiation_source()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            source.Srad = 0
+        with self.assertRaises(ValueError):
+            source.weights[0] = 0
+
+    def test_radiation_source_pickle(self):
+        source = self.flame.radiation_source()
+        unpickled = pickle.loads(pickle.dumps(source))
+        self.assertFalse(unpickled.positions.flags.writeable)
+        np.testing.assert_array_equal(unpickled.flux([(1, 2, 0.5)], 0.89), source.flux([(1, 2, 0.5)], 0.89))
+
+    def test_shared_chemistry(self):
+        combustion_registry.enable()
+        try:
+            chem = combustion_registry.get(Fluid('H2', T=288, P=101325))
+            flame = Flame(self.flame.fluid, Orifice(0.003), self.flame.ambient, verbose=VERBOSE)
+            self.assertIs(flame.chem, chem)
+            flame.solve()
+            flame.length()
+            self.assertIs(flame.chem, chem)
+        finally:
+            combustion_registry.disable()
+
+    def test_solve_batch(self):
+        release_fluid = self.flame.fluid
+        ambient_fluid = self.flame.ambient
+        orifices = [Orifice(0.002), Orifice(0.003)]
+        locations = [(1, 2, 0.5), (4, 0, -1), (-2, 1, 3)]
+        for n_workers in [1, 2]:
+            flames, fluxes = Flame.solve_batch(release_fluid, orifices, ambient_fluid, locations=locations,
+                                               n_workers=n_workers, verbose=VERBOSE)
+            self.assertEqual(fluxes.shape, (2, 3))
+            for orifice, flame, flux in zip(orifices, flames, fluxes):
+                expected = Flame(release_fluid, orifice, ambient_fluid, verbose=VERBOSE)
+                np.testing.assert_allclose(flame.x, expected.x, rtol=1e-12)
+                np.testing.assert_allclose(flux, expected.generate_positional_flux(locations, 0.89), rtol=1e-12)
+
+    def test_pickle(self):
+        unpickled = pickle.loads(pickle.dumps(self.flame))
+        self.assertEqual(unpickled.Qrad_multi(1, 2, 0.5, 0.89), self.flame.Qrad_multi(1, 2, 0.5, 0.89))
+        self.assertEqual(unpickled.chem.rho_prod(0.1), self.flame.chem.rho_prod(0.1))
+
+    def test_length_only(self):
+        flame = Flame(self.flame.fluid, Orifice(0.003), self.flame.ambient, verbose=VERBOSE, length_only=True)
+        self.assertEqual(len(flame.S), 2)
+        self.assertAlmostEqual(flame.S[-1], self.flame.Lvis)
+        self.assertAlmostEqual(flame.Lvis, self.flame.Lvis)
+        self.assertAlmostEqual(flame.Srad, self.flame.Srad)
+        points = [(1, 2, 0.5), (4, 0, -1), (-2, 1, 3), (10, 2, 1)]
+        np.testing.assert_allclose(flame.generate_positional_flux(points, 0.89),
+                                   self.flame.generate_positional_flux(points, 0.89), rtol=0.1)
+
+    def test_length_only_short_flame(self):
+        class ShortFlame(Flame):
+            """Flame whose visible length is within the developing flow"""
+            def length(self):
+                super().length()
+                self.Lvis = 0.5 * self.initial_node.S
+                return self.Lvis
+
+        flame = ShortFlame(self.flame.fluid, Orifice(0.003), self.flame.ambient, verbose=VERBOSE, length_only=True)
+        np.testing.assert_allclose(flame.S, [0, flame.Lvis])
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            fluxes = flame.generate_positional_flux([(1, 2, 0.5), (4, 0, -1)], 0.89)
+        self.assertEqual(len(flame.S), 2)
+        self.assertTrue(np.all(np.isfinite(fluxes)))
+
+    def test_heat_flux_field(self):
+        x, y, z, flux, calculated = self.flame.heat_flux_field(np.linspace(-2, 8, 11), np.linspace(-1, 5, 7), 0.5,
+                                                               refinements=2)
+        self.assertEqual(flux.shape, (41, 25, 1))
+        xx, yy, zz = np.meshgrid(x, y, z, indexing='ij')
+        np.testing.assert_allclose(flux[calculated],
+                                   self.flame.Qrad_multi(xx, yy, zz, 0.89)[calculated] / 1000, rtol=1e-12)
+        self.assertLess(np.count_nonzero(calculated), calculated.size)
+
+    def test_govEqns_matches_direct_integration(self):
+        """
+        Right-hand side on the grid normalized by B matches the governing equations integrated directly over r
+        """
+        flame = self.flame
+        numB, n_pts_integral = 5, 100
+        for i in [0, len(flame.S) // 2, -1]:
+            V_cl, B, theta, f_cl = flame.V_cl[i], flame.B[i], flame.theta[i], flame.f_cl[i]
+            r = np.zeros(n_pts_integral)
+            r[1:] = np.geomspace(0.003 * B, numB * B, n_pts_integral - 1)
+            f = f_cl * np.exp(-(r / (flame.lamf * B)) ** 2)
+            V = V_cl * np.exp(-(r / (flame.lamv * B)) ** 2)
+            rho, drhodf = flame.chem.rho_prod(f), flame.chem.drhodf(f)
+            rho_int = integrate.trapezoid(flame.ambient.rho - rho, r)
+            E = flame.Emom + (2 * np.pi * flame.alpha_buoy * np.sin(theta) * const.g * rho_int /
+                              (B * V_cl * flame.developing_flow.fluid_exp.rho))
+            RHS = np.array([flame.ambient.rho * E / (2 * const.pi),
+                            0,
+                            integrate.trapezoid((flame.ambient.rho - rho) * const.g * r, r),
+                            0])
+            zero = np.zeros_like(r)
+            dfdS = np.array([zero, 2 * r ** 2 / flame.lamf ** 2 / B ** 3 * f, zero, f / f_cl])
+            dVdS = np.array([V / V_cl, 2 * r ** 2 / flame.lamv ** 2 / B ** 3 * V, zero, zero])
+            drhodS = drhodf * dfdS
+            dthetadS = np.array([zero, zero, np.ones_like(r), zero])
+            LHS = integrate.trapezoid(np.array([
+                drhodS * V * r + rho * dVdS * r,
+                (drhodS * V ** 2 + 2 * rho * V * dVdS) * np.cos(theta) * r - rho * V ** 2 * np.sin(theta) * dthetadS * r,
+                (drhodS * V ** 2 + 2 * rho * V * dVdS) * np.sin(theta) * r + rho * V ** 2 * np.cos(theta) * dthetadS * r,
+                drhodS * V * f * r + rho * dVdS * f * r + rho * V * dfdS * r]), r)
+            expected = np.append(np.linalg.solve(LHS, RHS), [np.cos(theta), np.sin(theta)])
+            calculated = flame._govEqns(flame.S[i], [V_cl, B, theta, f_cl, flame.x[i], flame.y[i]],
+                                        numB, n_pts_integral)
+            np.testing.assert_allclose(calculated, expected, rtol=1e-10, atol=1e-12)
@@ -8,12 +8,25 @@ If not, see https://www.gnu.org/licenses/.
 
 import unittest
 
+import numpy as np
+from scipy import integrate, optimize
+import scipy.constants as const
+
 from hyram.phys import Fluid, Jet, Orifice
+from hyram.utilities.custom_warnings import PhysicsWarning
 
 
 VERBOSE = False
 
 
+class FailingJet(Jet):
+    """Jet whose governing equations cannot be evaluated beyond 1 m"""
+    def _govEqns(self, S, ind_vars, *args):
+        if S > 1:
+            return np.full(7, np.nan)
+        return super()._govEqns(S, ind_vars, *args)
+
+
 class TestJetObject(unittest.TestCase):
     """
     Tests of Jet class
@@ -67,3 +80,116 @@ class TestJetObject(unittest.TestCase):
                         distances[sorted_mole_fracs[1]][1][0])
         self.assertGreater(distances[sorted_mole_fracs[0]][1][1],
                            distances[sorted_mole_fracs[1]][1][1])
+
+
+class TestJetQuadrature(unittest.TestCase):
+    """
+    Tests of Gauss-Laguerre quadrature of the energy equation integral
+    """
+    def setUp(self):
+        self.release_fluid = Fluid('H2', T=298, P=35e6)
+        self.ambient_fluid = Fluid('AIR', T=298, P=101325)
+        self.orifice = Orifice(d=0.003)
+        self.jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, verbose=VERBOSE)
+
+    def test_governing_equations_match_fine_integration(self):
+        for i in [0, len(self.jet.S)//2, -1]:
+            ind_vars = [self.jet.__dict__[k][i] for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y']]
+            fine = self.jet._govEqns(self.jet.S[i], ind_vars, numpts=100000)
+            quad = self.jet._govEqns(self.jet.S[i], ind_vars, numquad=32)
+            np.testing.assert_allclose(quad, fine, rtol=1e-5, atol=1e-12)
+
+    def test_centerline_matches_trapezoid(self):
+        jet_quad = Jet(self.release_fluid, self.orifice, self.ambient_fluid, numquad=32, verbose=VERBOSE)
+        S = np.linspace(self.jet.S[0], self.jet.S[-1], 50)
+        for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'T_cl', 'x']:
+            np.testing.assert_allclose(np.interp(S, jet_quad.S, jet_quad.__dict__[k]),
+                                       np.interp(S, self.jet.S, self.jet.__dict__[k]), rtol=5e-3)
+
+
+class TestJetSolve(unittest.TestCase):
+    """
+    Tests of termination and dense output of the jet integration
+    """
+    def setUp(self):
+        self.release_fluid = Fluid('H2', T=298, P=35e6)
+        self.ambient_fluid = Fluid('AIR', T=298, P=101325)
+        self.orifice = Orifice(d=0.003)
+
+    def test_stops_at_lean_limit(self):
+        for Ymin in [7e-4, 1e-4]:
+            jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, Ymin=Ymin, verbose=VERBOSE)
+            self.assertAlmostEqual(jet.Y_cl[-1]/Ymin, 1, places=8)
+            self.assertTrue(np.all(jet.Y_cl[:-1] > Ymin))
+            self.assertAlmostEqual(jet.interpolate(jet.S[-1])['Y_cl']/Ymin, 1, places=8)
+
+    def test_stops_at_Smax(self):
+        jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, Smax=2, dS=0.5, verbose=VERBOSE)
+        self.assertAlmostEqual(jet.S[-1], 2, places=10)
+        self.assertLessEqual(np.max(np.diff(jet.S)), 0.5)
+        self.assertGreater(jet.Y_cl[-1], 7e-4)
+
+    def test_continues_past_lean_limit(self):
+        jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, Ymin=0.1, Smax=2, stop_at_Ymin=False,
+                  verbose=VERBOSE)
+        self.assertAlmostEqual(jet.S[-1], 2, places=10)
+        self.assertLess(jet.Y_cl[-1], 0.1)
+
+    def test_failed_integration(self):
+        with self.assertWarns(PhysicsWarning):
+            jet = FailingJet(self.release_fluid, self.orifice, self.ambient_fluid, verbose=VERBOSE)
+        self.assertLessEqual(jet.S[-1], 1)
+        self.assertTrue(np.all(np.isfinite(jet.Y_cl)))
+
+    def test_max_steps(self):
+        jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, dS=0.5, max_steps=3, verbose=VERBOSE)
+        # Integration stops after a distance of max_steps*dS
+        self.assertAlmostEqual(jet.S[-1], jet.S[0] + 3*0.5, places=10)
+
+    def test_interpolate(self):
+        jet = Jet(self.release_fluid, self.orifice, self.ambient_fluid, verbose=VERBOSE)
+        interpolated = jet.interpolate(jet.S)
+        for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y']:
+            np.testing.assert_allclose(interpolated[k], jet.__dict__[k], rtol=1e-10)
+        S = (jet.S[1:] + jet.S[:-1])/2
+        interpolated = jet.interpolate(S)
+        for k in ['Y_cl', 'x']:
+            np.testing.assert_allclose(interpolated[k], np.interp(S, jet.S, jet.__dict__[k]), rtol=2e-2)
+
+
+class TestJetFlammableMass(unittest.TestCase):
+    """
+    Tests of the analytic flammable mass calculation against root-finding and quadrature at each node
+    """
+    def m_flammable_by_node(self, jet, X_lean, X_rich):
+        MW_fluid, MW_air, rho_amb = jet.fluid.therm.MW, jet.ambient.therm.MW, jet.ambient.rho
+        Ylean = X_lean*MW_fluid/(X_lean*MW_fluid + (1 - X_lean)*MW_air)
+        Yrich = X_rich*MW_fluid/(X_rich*MW_fluid + (1 - X_rich)*MW_air)
+        Slean = np.interp(Ylean, jet.Y_cl[::-1], jet.S[::-1])
+        iend = np.argmax(jet.Y_cl <= Ylean)
+        S, Y_cl, B, rho_cl = [np.append(v[:iend], np.interp(Slean, jet.S, v))
+                              for v in [jet.S, jet.Y_cl, jet.B, jet.rho_cl]]
+        mass_per_len = []
+        for i in range(len(S)):
+            rho = lambda r: (rho_cl[i] - rho_amb)*np.exp(-r**2/(jet.lam*B[i]**2)) + rho_amb
+            Y = lambda r: rho_cl[i]*Y_cl[i]*np.exp(-r**2/(jet.lam*B[i])**2)/rho(r)
+            r_lean = 0 if Y(0) <= Ylean else optimize.brentq(lambda r: Y(r) - Ylean, 0, 100*B[i])
+            r_rich = 0 if Y(0) <= Yrich else optimize.brentq(lambda r: Y(r) - Yrich, 0, 100*B[i])
+            mass_per_len.append(integrate.quad(lambda r: Y(r)*rho(r)*2*const.pi*r, r_rich, r_lean)[0])
+        return integrate.trapezoid(mass_per_len, S)
+
+    def test_light_gas(self):
+        jet = Jet(Fluid('H2', T=298, P=35e6), Orifice(d=0.003), Fluid('AIR', T=298, P=101325), verbose=VERBOSE)
+        for X_lean, X_rich in [(0.04, 0.75), (0.08, 0.3)]:
+            self.assertAlmostEqual(jet.m_flammable(X_lean, X_rich) / self.m_flammable_by_node(jet, X_lean, X_rich), 1,
+                                   places=8)
+
+    def test_heavy_gas(self):
+        jet = Jet(Fluid('propane', T=298, P=1e6), Orifice(d=0.01), Fluid('AIR', T=298, P=101325), verbose=VERBOSE)
+        X_lean, X_rich = 0.021, 0.095
+        self.assertAlmostEqual(jet.m_flammable(X_lean, X_rich) / self.m_flammable_by_node(jet, X_lean, X_rich), 1,
+                               places=8)
+
+    def test_no_flammable_mass(self):
+        jet = Jet(Fluid('H2', T=298, P=35e6), Orifice(d=0.003), Fluid('AIR', T=298, P=101325), verbose=VERBOSE)
+        self.assertEqual(jet.m_flammable(Hmax=jet.y.min() - 1), 0)
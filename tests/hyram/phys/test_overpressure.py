@@ -351,6 +351,13 @@ class BauwensMethodTestCase(unittest.TestCase):
         for scaled_overpressure in scaled_overpressures:
             self.assertGreater(scaled_overpressure, 0)
 
+    def test_distance_to_overpressure_methods_match(self):
+        overpressures = np.array([5e3, 16e3, 70e3])  # Pa
+        scanned = self.Bauwens_calc.calc_distance_to_overpressure(overpressures)
+        solved = self.Bauwens_calc.calc_distance_to_overpressure(overpressures, method='brent')
+        self.assertEqual(solved.shape, overpressures.shape)
+        np.testing.assert_allclose(solved, scanned, atol=500/1e4)
+
 
 class TntMethodTestCase(unittest.TestCase):
     """
@@ -6,9 +6,16 @@ You should have received a copy of the GNU General Public License along with HyR
 If not, see https://www.gnu.org/licenses/.
 
 """
+import os
+import pickle
+import tempfile
 import unittest
 
-from hyram.phys._therm import CoolPropWrapper, Combustion
+import numpy as np
+from scipy import optimize
+
+from hyram.phys._therm import CoolPropWrapper, TabulatedWrapper, Combustion, PropertyCache, property_cache, combustion_cache
+from hyram.phys._therm import CombustionRegistry, _enthalpy_table
 from hyram.phys import Fluid
 
 
@@ -34,6 +41,155 @@ class TestPropsSI(unittest.TestCase):
         t = therm.PropsSI('T', P=self.pressure, S=self.entropy)
         self.assertTrue
 
+
+class TestArrayInputs(unittest.TestCase):
+    def setUp(self):
+        self.therm = CoolPropWrapper('H2')
+        self.T = np.array([[250., 300.], [350., 400.]])
+
+    def test_single_output(self):
+        rho = self.therm.get_property('D', T=self.T, P=1e6)
+        self.assertEqual(rho.shape, self.T.shape)
+        for rho_i, T_i in zip(rho.ravel(), self.T.ravel()):
+            self.assertAlmostEqual(rho_i, self.therm.get_property('D', T=T_i, P=1e6))
+
+    def test_multiple_outputs(self):
+        P = np.array([1e6, 2e6, 3e6])
+        h, rho = self.therm.get_property(['H', 'D'], T=300, P=P)
+        self.assertEqual(h.shape, (3,))
+        self.assertAlmostEqual(rho[1], self.therm.get_property('D', T=300, P=2e6))
+
+    def test_total_enthalpy(self):
+        rho = np.array([1., 2.])
+        v = np.array([0., 100.])
+        h0 = self.therm.get_property('H0', P=1e6, D=rho, v=v)
+        self.assertAlmostEqual(h0[1], self.therm.get_property('H0', P=1e6, D=2., v=100.))
+
+    def test_blend(self):
+        therm = CoolPropWrapper("METHANE[0.5]&HYDROGEN[0.5]")
+        T = np.array([300., 350.])
+        rho = therm.get_property('D', T=T, P=1e6)
+        self.assertAlmostEqual(rho[1], therm.get_property('D', T=350., P=1e6))
+
+
+class TestBlendState(unittest.TestCase):
+    def setUp(self):
+        self.spec = "METHANE[0.5]&HYDROGEN[0.5]"
+        self.therm = CoolPropWrapper(self.spec)
+
+    def test_state_reused(self):
+        eos = self.therm._eos
+        self.therm.PropsSI('D', P=1e6, T=300)
+        self.therm.PropsSI('D', P=1.05e6, T=305)
+        self.assertIs(self.therm._eos, eos)
+
+    def test_repeated_calls_match_new_wrapper(self):
+        for P, T in [(1e6, 300), (1.02e6, 302), (1e7, 250)]:
+            rho = self.therm.PropsSI('D', P=P, T=T)
+            self.assertAlmostEqual(rho, CoolPropWrapper(self.spec).PropsSI('D', P=P, T=T), places=8)
+
+    def test_pickle(self):
+        h = self.therm.PropsSI('H', P=1e6, T=300)
+        therm = pickle.loads(pickle.dumps(self.therm))
+        self.assertIsNotNone(therm._eos)
+        self.assertAlmostEqual(therm.PropsSI('H', P=1e6, T=300), h, places=6)
+
+
+class TestPropertyCache(unittest.TestCase):
+    def setUp(self):
+        self.pressure = 1286500
+        self.entropy = 10761.12726
+        self.therm = CoolPropWrapper('H2')
+        property_cache.enable()
+
+    def tearDown(self):
+        property_cache.disable()
+
+    def test_cached_values_match(self):
+        uncached = self.therm._PropsSI(['H', 'D'], P=self.pressure, S=self.entropy)
+        first = self.therm.PropsSI(['H', 'D'], P=self.pressure, S=self.entropy)
+        second = self.therm.PropsSI(['H', 'D'], P=self.pressure, S=self.entropy)
+        for u, f, s in zip(uncached, first, second):
+            self.assertEqual(u, f)
+            self.assertEqual(u, s)
+
+    def test_hit_miss_counters(self):
+        self.therm.PropsSI('T', P=self.pressure, S=self.entropy)
+        self.therm.PropsSI('T', P=self.pressure, S=self.entropy)
+        self.therm.PropsSI('D', P=self.pressure, S=self.entropy)
+        info = property_cache.info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['size'], 2)
+
+    def test_species_in_key(self):
+        h2 = self.therm.PropsSI('D', T=300, P=self.pressure)
+        ch4 = CoolPropWrapper('CH4').PropsSI('D', T=300, P=self.pressure)
+        self.assertNotEqual(h2, ch4)
+        self.assertEqual(property_cache.info()['misses'], 2)
+
+    def test_bounded_size(self):
+        cache = PropertyCache(maxsize=2)
+        cache.enable()
+        for val in [1, 2, 3]:
+            cache.lookup(cache.make_key('H2', 'D', {'T':val, 'P':1}), lambda: val)
+        self.assertEqual(cache.info()['size'], 2)
+        self.assertNotIn(cache.make_key('H2', 'D', {'T':1, 'P':1}), cache._data)
+
+    def test_array_inputs_not_cached(self):
+        self.assertIsNone(property_cache.make_key('H2', 'H', {'T':[300, 400], 'P':1e5}))
+
+    def test_disable_clears(self):
+        self.therm.PropsSI('T', P=self.pressure, S=self.entropy)
+        property_cache.disable()
+        self.therm.PropsSI('T', P=self.pressure, S=self.entropy)
+        info = property_cache.info()
+        self.assertFalse(info['enabled'])
+        self.assertEqual(info['size'], 0)
+        self.assertEqual(info['misses'], 0)
+
+
+class TestTabulatedWrapper(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.therm = TabulatedWrapper('Hydrogen', P_range=(1e5, 1e8), T_range=(150, 500), num_P=30, num_T=30, rtol=1e-4)
+        cls.coolprop = CoolPropWrapper('Hydrogen')
+
+    def test_PT_within_tolerance(self):
+        for P, T in [(2.5e5, 177), (3.3e6, 301.5), (7.1e7, 466)]:
+            for k in ['D', 'A', 'C']:
+                tab = self.therm.PropsSI(k, P=P, T=T)
+                exact = self.coolprop.PropsSI(k, P=P, T=T)
+                self.assertAlmostEqual(tab/exact, 1, delta=1e-4)
+
+    def test_PS_within_tolerance(self):
+        S = self.coolprop.PropsSI('S', P=1e7, T=300)
+        T, rho = self.therm.PropsSI(['T', 'D'], P=3.3e6, S=S)
+        T_exact, rho_exact = self.coolprop.PropsSI(['T', 'D'], P=3.3e6, S=S)
+        self.assertAlmostEqual(T/T_exact, 1, delta=1e-4)
+        self.assertAlmostEqual(rho/rho_exact, 1, delta=1e-4)
+
+    def test_array_inputs(self):
+        T = np.array([200., 300., 400.])
+        rho = self.therm.PropsSI('D', P=1e6, T=T)
+        self.assertEqual(rho.shape, (3,))
+        for rho_i, T_i in zip(rho, T):
+            self.assertAlmostEqual(rho_i, self.therm.PropsSI('D', P=1e6, T=T_i))
+
+    def test_fallback_outside_table(self):
+        self.assertIsNone(self.therm._interpolate('D', {'P':1e6, 'T':700}))
+        self.assertEqual(self.therm.PropsSI('D', P=1e6, T=700), self.coolprop.PropsSI('D', P=1e6, T=700))
+
+    def test_fallback_other_inputs(self):
+        rho = self.coolprop.PropsSI('D', P=1e6, T=300)
+        self.assertEqual(self.therm.get_property('T', P=1e6, D=rho), self.coolprop.get_property('T', P=1e6, D=rho))
+
+    def test_fluid(self):
+        fluid = Fluid('H2', T=300, P=1e7, therm=self.therm)
+        self.assertIs(fluid.therm, self.therm)
+        self.assertAlmostEqual(fluid.rho, Fluid('H2', T=300, P=1e7).rho)
+
+
 class TestCombustion(unittest.TestCase):
     def setUp(self):
         H2 = Fluid('H2', P = 101325, T = 298)
@@ -46,3 +202,140 @@ class TestCombustion(unittest.TestCase):
 
     def test_CH4_absorption_coeff(self):
         self.assertAlmostEqual(self.comb_CH4.absorption_coeff, 0.5, None, "CH4 absorption coefficient not 0.5", 0.02)
+
+    def test_rho_drhodf(self):
+        for comb in [self.comb_H2, self.comb_CH4]:
+            f = np.append(np.linspace(0, 1, 1001), comb.fstoich)
+            rho, drhodf = comb.rho_drhodf(f)
+            np.testing.assert_allclose(rho, comb.rho_prod(f), rtol=1e-12)
+            np.testing.assert_allclose(drhodf, comb.drhodf(f), rtol=1e-12)
+
+    def test_rho_drhodf_out_of_range(self):
+        with self.assertRaises(ValueError):
+            self.comb_H2.rho_drhodf(np.array([0.5, 1.1]))
+
+    def test_T_combustion_matches_scalar_solves(self):
+        for comb in [self.comb_H2, self.comb_CH4]:
+            Hdict = comb._Hdict(comb.Treac)
+            for f, T in zip(comb._fvals[::7], comb._T_vals[::7]):
+                Yprod, Yreac = comb._Yprod(f), comb._Yreac(f)
+                H = (comb._H(comb.Treac, Yreac, Hdict)*comb._MWmix(Yreac)/comb._MWmix(Yprod)
+                     + comb.DHc*Yprod['H2O']/(comb._nH/2)*comb.MW[comb.reac]/comb.MW['H2O'])
+                expected = optimize.brentq(lambda T: comb._H(T, Yprod, Hdict) - H, comb.Treac - 10, 6000, xtol=1e-9)
+                self.assertAlmostEqual(T, expected, places=5)
+
+    def test_T_combustion_reactants(self):
+        for comb in [self.comb_H2, self.comb_CH4]:
+            self.assertAlmostEqual(comb.T_prod(1), comb.Treac, places=5)
+            self.assertAlmostEqual(comb.T_prod(0), comb.Treac, places=5)
+
+    def test_enthalpy_tables_shared(self):
+        hits = _enthalpy_table.cache_info().hits
+        comb = Combustion(Fluid('H2', P = 101325, T = 298))
+        self.assertEqual(_enthalpy_table.cache_info().hits, hits + 5)
+        np.testing.assert_array_equal(comb._T_vals, self.comb_H2._T_vals)
+        T, H = _enthalpy_table('H2', 298, 6000, 101325, 500)
+        self.assertFalse(T.flags.writeable or H.flags.writeable)
+
+
+class TestCombustionCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        combustion_cache.enable(self.directory.name)
+        self.fluid = Fluid('H2', P = 101325, T = 298)
+
+    def tearDown(self):
+        combustion_cache.clear()
+        combustion_cache.disable()
+        self.directory.cleanup()
+
+    def test_loaded_tables_match(self):
+        calculated = Combustion(self.fluid)
+        loaded = Combustion(self.fluid)
+        info = combustion_cache.info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['size'], 1)
+        for f in [0.01, 0.0285, 0.5]:
+            self.assertEqual(loaded.T_prod(f), calculated.T_prod(f))
+            self.assertEqual(loaded.drhodf(f), calculated.drhodf(f))
+            self.assertEqual(loaded.rho_prod(f), calculated.rho_prod(f))
+        self.assertEqual(loaded.absorption_coeff, calculated.absorption_coeff)
+
+    def test_key_includes_state(self):
+        Combustion(self.fluid)
+        Combustion(Fluid('H2', P = 101325, T = 310))
+        Combustion(self.fluid, numpoints = 50)
+        self.assertEqual(combustion_cache.info()['size'], 3)
+
+    def test_key_includes_format_version(self):
+        filename = combustion_cache.filename('H2', 298, 101325, 500)
+        format_version = combustion_cache.format_version
+        try:
+            combustion_cache.format_version += 1
+            self.assertNotEqual(combustion_cache.filename('H2', 298, 101325, 500), filename)
+        finally:
+            combustion_cache.format_version = format_version
+
+    def test_unreadable_file(self):
+        calculated = Combustion(self.fluid)
+        filename = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        for corrupted in [contents[:len(contents)//2], b'not a numpy file', contents.replace(b'drhodf', b'xxxxxx')]:
+            with open(filename, 'wb') as f:
+                f.write(corrupted)
+            misses = combustion_cache.info()['misses']
+            recalculated = Combustion(self.fluid)
+            self.assertEqual(combustion_cache.info()['misses'], misses + 1)
+            self.assertEqual(recalculated.T_prod(0.0285), calculated.T_prod(0.0285))
+            # the unreadable file is replaced by the recalculated tables
+            self.assertIsNotNone(combustion_cache.load(filename))
+
+    def test_clear(self):
+        Combustion(self.fluid)
+        combustion_cache.clear()
+        self.assertEqual(combustion_cache.info()['size'], 0)
+
+
+class TestCombustionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = CombustionRegistry(maxsize=2)
+        self.registry.enable()
+        self.fluid = Fluid('H2', P = 101325, T = 298)
+
+    def test_not_shared_by_default(self):
+        registry = CombustionRegistry()
+        self.assertFalse(registry.info()['enabled'])
+        chem = registry.get(self.fluid)
+        chem.reinitilize(Fluid('H2', P = 101325, T = 310))
+        other = registry.get(self.fluid)
+        self.assertIsNot(other, chem)
+        self.assertEqual(other.Treac, 298)
+
+    def test_shared(self):
+        chem = self.registry.get(self.fluid)
+        self.assertIs(self.registry.get(Fluid('H2', P = 101325, T = 298)), chem)
+        info = self.registry.info()
+        self.assertEqual(info['misses'], 1)
+        self.assertEqual(info['hits'], 1)
+
+    def test_key_includes_state(self):
+        chem = self.registry.get(self.fluid)
+        self.assertIsNot(self.registry.get(Fluid('H2', P = 101325, T = 310)), chem)
+        self.assertIsNot(self.registry.get(self.fluid, numpoints = 50), chem)
+        self.assertEqual(self.registry.get(Fluid('H2', P = 2e5, T = 298)).Preac, 2e5)
+
+    def test_bounded_size(self):
+        chem = self.registry.get(self.fluid)
+        for T in [300, 310]:
+            self.registry.get(Fluid('H2', P = 101325, T = T))
+        self.assertEqual(self.registry.info()['size'], 2)
+        self.assertIsNot(self.registry.get(self.fluid), chem)
+
+    def test_disable(self):
+        chem = self.registry.get(self.fluid)
+        self.registry.disable()
+        self.assertEqual(self.registry.info()['size'], 0)
+        self.assertIsNot(self.registry.get(self.fluid), chem)
+        self.assertIsNot(self.registry.get(self.fluid), self.registry.get(self.fluid))
@@ -7,6 +7,8 @@ If not, see https://www.gnu.org/licenses/.
 """
 import unittest
 
+import numpy as np
+
 import hyram.phys._utils as hpu
 
 
@@ -62,3 +64,84 @@ class TestGetDistanceToEffect(unittest.TestCase):
         effect_scaling = 0.5
         distance = hpu.get_distance_to_effect(effect_value, from_point, direction, effect_func, effect_val=effect_scaling)
         self.assertAlmostEqual(distance, 2, places=4)
+
+    def test_get_distance_to_effect_methods_match(self):
+        from_point = (0, 1, 0)
+        for effect_value in [0.01, 0.1, 0.5, 0.9]:
+            for negative_direction in [False, True]:
+                interpolated = hpu.get_distance_to_effect(effect_value, from_point, 'x', self.effect_function,
+                                                          negative_direction=negative_direction,
+                                                          method='interpolation')
+                solved = hpu.get_distance_to_effect(effect_value, from_point, 'x', self.effect_function,
+                                                    negative_direction=negative_direction, method='brent')
+                self.assertAlmostEqual(solved, interpolated, places=3)
+
+    def test_get_distance_to_effect_multiple_values(self):
+        effect_values = [0.5, 1, 0.1]
+        distances = hpu.get_distance_to_effect(effect_values, (0, 1, 0), 'x', self.effect_function, method='brent')
+        np.testing.assert_allclose(distances, [3, 2, 11], rtol=1e-8)
+
+    def test_get_distance_to_effect_non_monotonic(self):
+        """
+        Finds the farthest distance at which the effect is reached
+        """
+        def effect_function(x_vals, y_vals, z_vals):
+            x_vals = np.asarray(x_vals)
+            return np.exp(-(x_vals - 20) ** 2) + 2 * np.exp(-(x_vals - 5) ** 2)
+        distance = hpu.get_distance_to_effect(0.5, (0, 0, 0), 'x', effect_function, method='brent')
+        self.assertAlmostEqual(distance, 20 + np.sqrt(np.log(2)), places=6)
+        distance = hpu.get_distance_to_effect(1.5, (0, 0, 0), 'x', effect_function, method='brent')
+        self.assertAlmostEqual(distance, 5 + np.sqrt(np.log(4 / 3)), places=6)
+
+    def test_get_distance_to_effect_not_reached(self):
+        distance = hpu.get_distance_to_effect(1e100, (0, 1, 0), 'x', self.effect_function, method='brent')
+        self.assertAlmostEqual(distance, 1, places=4)
+
+    def test_get_distance_to_effect_bad_method(self):
+        with self.assertRaises(ValueError):
+            hpu.get_distance_to_effect(1, (0, 1, 0), 'x', self.effect_function, method='newton')
+
+
+class TestGetEffectField(unittest.TestCase):
+    """
+    Test of function to get a physical effect on a refined grid
+    """
+    @staticmethod
+    def effect_function(x_vals, y_vals, z_vals, effect_val=1):
+        """
+        Dummy effect function that returns values for
+        a 1/r decaying sphere centered at (0.3, 0.2, 0.1)
+        """
+        return effect_val / np.sqrt((x_vals - 0.3) ** 2 + (y_vals - 0.2) ** 2 + (z_vals - 0.1) ** 2)
+
+    def test_slice_shape(self):
+        x, y, z, effects, calculated = hpu.get_effect_field(self.effect_function, np.linspace(-5, 5, 11),
+                                                            np.linspace(-4, 4, 9), 0, levels=1, refinements=2)
+        self.assertEqual(effects.shape, (41, 33, 1))
+        self.assertEqual(calculated.shape, effects.shape)
+        np.testing.assert_allclose(x, np.linspace(-5, 5, 41))
+        np.testing.assert_allclose(y, np.linspace(-4, 4, 33))
+        np.testing.assert_array_equal(z, [0])
+
+    def test_calculated_values(self):
+        x, y, z, effects, calculated = hpu.get_effect_field(self.effect_function, np.linspace(-5, 5, 11),
+                                                            np.linspace(-4, 4, 9), np.linspace(-1, 1, 3),
+                                                            levels=[0.5, 1], refinements=2, effect_val=2)
+        xx, yy, zz = np.meshgrid(x, y, z, indexing='ij')
+        np.testing.assert_allclose(effects[calculated],
+                                   self.effect_function(xx, yy, zz, effect_val=2)[calculated], rtol=1e-12)
+        self.assertTrue(np.all(calculated[::4, ::4, ::4]))
+        self.assertLess(np.count_nonzero(calculated), calculated.size / 2)
+
+    def test_contours_match_uniform_grid(self):
+        args = (self.effect_function, np.linspace(-5, 5, 21), np.linspace(-5, 5, 21), 0)
+        _, _, _, effects, _ = hpu.get_effect_field(*args, levels=[0.5, 1], refinements=3)
+        _, _, _, expected, _ = hpu.get_effect_field(*args, refinements=3)
+        for level in [0.5, 1]:
+            np.testing.assert_array_equal(effects >= level, expected >= level)
+
+    def test_no_refinement_everywhere(self):
+        _, _, _, effects, calculated = hpu.get_effect_field(self.effect_function, np.linspace(-5, 5, 6), 1, 2,
+                                                            refinements=1)
+        self.assertEqual(effects.shape, (11, 1, 1))
+        self.assertTrue(np.all(calculated))
@@ -10,10 +10,12 @@ import unittest
 import scipy.constants as spc
 import numpy as np
 
+from hyram.phys import Fluid
 from hyram.qra import analysis
 from hyram.qra.component_failure import create_failure_set
 from hyram.qra.component import create_component_set
-from hyram.qra.defaults import default_failure_set
+from hyram.qra.defaults import default_failure_set, get_default_ignition_probs
+from hyram.qra.release_physics import ReleasePhysics
 
 
 VERBOSE = False
@@ -145,10 +147,76 @@ class ConductAnalysisHydrogenTestCase(unittest.TestCase):
     def test_conduct_analysis_regression(self):
         results = analysis.conduct_analysis(**self.params)
         test_risk_value = results['total_pll']
-        # regression test value based on existing develop branch
-        exp_risk_value = 3.494e-6
+        # regression test value based on existing develop branch,
+        # updated for the flame integration grid normalized by the half-width
+        exp_risk_value = 3.4934e-6
         self.assertAlmostEqual(test_risk_value, exp_risk_value, places=9)
 
+    def test_reuse_release_physics(self):
+        release_physics = ReleasePhysics(
+            Fluid(species=self.params['rel_species'], T=self.params['rel_temp'], P=self.params['rel_pres']),
+            Fluid(species='AIR', T=self.params['amb_temp'], P=self.params['amb_pres']),
+            self.params['pipe_inner_diam'])
+        for locations in [self.params['locations'], self.params['locations'][::2]]:
+            self.params['locations'] = locations
+            self.params['occupant_hours'] = [2000] * len(locations)
+            expected = analysis.conduct_analysis(**self.params)
+            calculated = analysis.conduct_analysis(**self.params, release_physics=release_physics)
+            self.assertAlmostEqual(calculated['total_pll'], expected['total_pll'], places=12)
+            for key in ['position_qrads', 'position_overps', 'position_impulses']:
+                np.testing.assert_allclose(calculated[key], expected[key], rtol=1e-10)
+        self.assertIs(release_physics.flame(4), release_physics.flame(4))
+
+    def test_mismatched_release_physics(self):
+        release_physics = ReleasePhysics(
+            Fluid(species=self.params['rel_species'], T=self.params['rel_temp'], P=self.params['rel_pres']),
+            Fluid(species='AIR', T=self.params['amb_temp'], P=self.params['amb_pres']),
+            2 * self.params['pipe_inner_diam'])
+        with self.assertRaises(ValueError):
+            analysis.conduct_analysis(**self.params, release_physics=release_physics)
+
+    def test_two_stage_analysis(self):
+        release_physics = ReleasePhysics(
+            Fluid(species=self.params['rel_species'], T=self.params['rel_temp'], P=self.params['rel_pres']),
+            Fluid(species='AIR', T=self.params['amb_temp'], P=self.params['amb_pres']),
+            self.params['pipe_inner_diam']).solve()
+        locations = self.params['locations']
+        qrads = release_physics.heat_flux(locations, self.params['rel_humid'])
+        overpressures = release_physics.overpressure(locations)
+        impulses = release_physics.impulse(locations)
+        ign_probs = get_default_ignition_probs(self.params['rel_species'])
+        for detection_credit, exposure_time in [(0.9, 30), (0.5, 60)]:
+            self.params['detection_credit'] = detection_credit
+            self.params['exposure_time'] = exposure_time
+            expected = analysis.conduct_analysis(**self.params, release_physics=release_physics)
+            leak_freqs = [leak_result['frequency'] for leak_result in expected['leak_results']]
+            end_state_probabilities, scenario_freqs = analysis.calc_scenario_frequencies(
+                leak_freqs, release_physics.discharge_rates, ign_probs, detection_credit)
+            results = analysis.evaluate_risk(scenario_freqs, qrads, overpressures, impulses,
+                                             exposure_time=exposure_time,
+                                             occupant_hours=self.params['occupant_hours'])
+            self.assertAlmostEqual(results['total_pll'], expected['total_pll'], places=12)
+            self.assertAlmostEqual(results['far'], expected['far'], places=9)
+            self.assertAlmostEqual(results['air'], expected['air'], places=12)
+            for i, leak_result in enumerate(expected['leak_results']):
+                np.testing.assert_allclose(end_state_probabilities[i],
+                                           [event['prob'] for event in leak_result['result_dicts'][:-1]])
+
+    def test_n_workers(self):
+        expected = analysis.conduct_analysis(**self.params)
+        calculated = analysis.conduct_analysis(**self.params, n_workers=2)
+        self.assertEqual(calculated['total_pll'], expected['total_pll'])
+        for key in ['position_qrads', 'position_overps', 'position_impulses']:
+            np.testing.assert_array_equal(calculated[key], expected[key])
+
+    def test_evaluate_risk_zero_occupants(self):
+        scenario_freqs = np.ones((5, 4))
+        empty = np.zeros((5, 0))
+        results = analysis.evaluate_risk(scenario_freqs, empty, empty, empty)
+        self.assertEqual(results['total_pll'], 0)
+        self.assertEqual(results['far'], 0)
+        self.assertEqual(results['air'], 0)
+
     def test_sat_vapor(self):
         self.params['rel_phase'] = 'gas'
         self.params['rel_temp'] = None
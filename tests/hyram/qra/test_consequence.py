@@ -8,7 +8,9 @@ If not, see https://www.gnu.org/licenses/.
 
 import unittest
 
-from hyram.qra import consequence
+import numpy as np
+
+from hyram.qra import consequence, probits
 
 
 class TestThermalFatalitiesCalc(unittest.TestCase):
@@ -31,6 +33,14 @@ class TestThermalFatalitiesCalc(unittest.TestCase):
         self.assertEqual(len(thermal_fatality_probs_per_leak),
                          num_leak_sizes)
 
+    def test_thermal_consequence_matches_probits(self):
+        physical_responses = {'qrads': np.array([0, 2000, 8000, 20000])}  # W/m2
+        consequence_modeling_decisions = {'probit_thermal_id': 'eise',  # Eisenberg thermal probit
+                                          'exposure_time': 60}  # seconds
+        probs = consequence.thermal_consequence(physical_responses, consequence_modeling_decisions)
+        expected = [probits.compute_thermal_fatality_prob('eise', qrad, 60) for qrad in physical_responses['qrads']]
+        np.testing.assert_array_equal(probs, expected)
+
     def test_zero_fatalities_for_zero_occupants(self):
         consequence_type = 'thermal'
         num_leak_sizes = 5
@@ -69,6 +79,16 @@ class TestOverpressureFatalitiesCalc(unittest.TestCase):
         self.assertEqual(len(overpressure_fatality_probs_per_leak),
                          num_leak_sizes)
 
+    def test_overpressure_consequence_matches_probits(self):
+        physical_responses = {'overpressures': np.array([0, 2e4, 8e4, 2e5]),  # Pa
+                              'impulses': np.array([100, 1000, 0, 5000])}  # Pa*s
+        consequence_modeling_decisions = {'probit_overp_id': 'head'}  # TNO Heat Impact overpressure probit
+        probs = consequence.overpressure_consequence(physical_responses, consequence_modeling_decisions)
+        expected = [probits.compute_overpressure_fatality_prob('head', overpressure, impulse)
+                    for overpressure, impulse in zip(physical_responses['overpressures'],
+                                                     physical_responses['impulses'])]
+        np.testing.assert_array_equal(probs, expected)
+
 
 class TestGenerateEventResults(unittest.TestCase):
     """
@@ -7,6 +7,9 @@ If not, see https://www.gnu.org/licenses/.
 """
 
 import unittest
+import warnings
+
+import numpy as np
 
 from hyram.qra import probits
 
@@ -76,6 +79,15 @@ class TestThermalProbits(unittest.TestCase):
         exposure_time = 60  # seconds
         self.assertAlmostEqual(probits.compute_thermal_fatality_prob(model_ref, heat_flux, exposure_time), 0)
 
+    def test_thermal_fatality_prob_arrays(self):
+        heat_fluxes = np.array([[0, 1000, 5000], [10000, 15796.170691, 50000]])  # W/m^2
+        exposure_time = 60  # seconds
+        for model_ref in ['eise', 'tsao', 'tno', 'lees']:
+            probs = probits.compute_thermal_fatality_prob(model_ref, heat_fluxes, exposure_time)
+            self.assertEqual(probs.shape, heat_fluxes.shape)
+            for heat_flux, prob in zip(heat_fluxes.ravel(), probs.ravel()):
+                self.assertEqual(prob, probits.compute_thermal_fatality_prob(model_ref, heat_flux, exposure_time))
+
 
 class TestOverpressureProbits(unittest.TestCase):
     """
@@ -113,3 +125,25 @@ class TestOverpressureProbits(unittest.TestCase):
         model_ref = 'leis'  # Reference string for Eisenburg Lung Hemmorrhage overpressure probit model
         peak_overpressure = 0
         self.assertAlmostEqual(probits.compute_overpressure_fatality_prob(model_ref, peak_overpressure), 0)
+
+    def test_overpressure_fatality_prob_arrays(self):
+        overpressures = np.array([0, 1e4, 5e4, 144542.867547, 3e5])  # Pa
+        impulses = np.array([1e3, 0, 2e3, 1e4, 5e4])  # Pa*s
+        for model_ref in ['leis', 'lhse', 'head', 'coll']:
+            probs = probits.compute_overpressure_fatality_prob(model_ref, overpressures, impulses)
+            self.assertEqual(probs.shape, overpressures.shape)
+            for overpressure, impulse, prob in zip(overpressures, impulses, probs):
+                self.assertEqual(prob, probits.compute_overpressure_fatality_prob(model_ref, overpressure, impulse))
+            self.assertEqual(probs[0], 0)
+            self.assertEqual(probs[1], 0)
+
+    def test_zero_overpressure_does_not_warn(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            for model_ref in ['leis', 'lhse', 'head', 'coll']:
+                probits.compute_overpressure_fatality_prob(model_ref, np.array([0, 1e4, 0]), np.array([1e3, 0, 0]))
+
+    def test_invalid_overpressure_warns(self):
+        for model_ref in ['leis', 'lhse', 'head', 'coll']:
+            with self.assertWarns(RuntimeWarning):
+                probits.compute_overpressure_fatality_prob(model_ref, np.array([-1e4, 1e4]), np.array([1e3, 1e3]))
@@ -0,0 +1,131 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+import pickle
+import unittest
+import warnings
+
+import numpy as np
+import scipy.constants as spc
+
+from hyram.phys import Fluid
+from hyram.qra import effects
+from hyram.qra.release_physics import ReleasePhysics
+from hyram.utilities.custom_warnings import PhysicsWarning
+
+
+class FailingReleasePhysics(ReleasePhysics):
+    """Release physics whose flame cannot be solved for the first leak size"""
+    def flame(self, leak_idx):
+        if leak_idx == 0:
+            raise ValueError('flame failed')
+        return super().flame(leak_idx)
+
+
+class ReleasePhysicsTestCase(unittest.TestCase):
+    """
+    Test release physics kept for each leak size
+    """
+    def setUp(self):
+        self.rel_fluid = Fluid(species='h2', T=15 + spc.zero_Celsius, P=35 * spc.mega)
+        self.amb_fluid = Fluid(species='AIR', T=15 + spc.zero_Celsius, P=101325)
+        self.locations = [(2.4, 0.0, 2.1), (14.9, 0.0, 2.0), (6.5, 0.0, 5.3)]
+        self.release_physics = ReleasePhysics(self.rel_fluid, self.amb_fluid, 0.245 * spc.inch,
+                                              leak_sizes=[1, 100])
+
+    def test_orifices(self):
+        self.assertEqual(len(self.release_physics.orifices), 2)
+        self.assertAlmostEqual(self.release_physics.orifices[1].d, 0.245 * spc.inch)
+        self.assertLess(self.release_physics.discharge_rates[0], self.release_physics.discharge_rates[1])
+
+    def test_physics_kept(self):
+        self.assertIsNone(self.release_physics._flames[1])
+        flame = self.release_physics.flame(1)
+        self.assertIs(self.release_physics.flame(1), flame)
+        self.assertIs(self.release_physics.overpressure_model(1), self.release_physics.overpressure_model(1))
+        self.assertIsNone(self.release_physics._flames[0])
+        self.release_physics.solve()
+        self.assertIsNotNone(self.release_physics._flames[0])
+        self.assertIsNotNone(self.release_physics._overpressure_models[0])
+
+    def test_matches_effects(self):
+        for idx, orifice in enumerate(self.release_physics.orifices):
+            expected_fluxes, _ = effects.calc_thermal_effects(self.amb_fluid, self.rel_fluid, 0, orifice, 0.89,
+                                                              'yuce', self.locations, idx, create_plots=False)
+            fluxes, _ = effects.calc_thermal_effects(self.amb_fluid, self.rel_fluid, 0, orifice, 0.89,
+                                                     'yuce', self.locations, idx,
+                                                     flame=self.release_physics.flame(idx), create_plots=False)
+            np.testing.assert_allclose(fluxes, expected_fluxes, rtol=1e-8)
+            expected_overps, expected_impulses, _, _ = effects.calc_overp_effects(
+                orifice, 'yuce', self.rel_fluid, self.amb_fluid, 0, self.locations, 'bst', idx,
+                BST_mach_flame_speed=0.35, create_plots=False)
+            overps, impulses, _, _ = effects.calc_overp_effects(
+                orifice, 'yuce', self.rel_fluid, self.amb_fluid, 0, self.locations, 'bst', idx,
+                overpressure_model=self.release_physics.overpressure_model(idx), create_plots=False)
+            np.testing.assert_allclose(overps, expected_overps, rtol=1e-8)
+            np.testing.assert_allclose(impulses, expected_impulses, rtol=1e-8)
+
+    def test_effects_at_locations(self):
+        fluxes = self.release_physics.heat_flux(self.locations)
+        overpressures = self.release_physics.overpressure(self.locations)
+        impulses = self.release_physics.impulse(self.locations)
+        for values in [fluxes, overpressures, impulses]:
+            self.assertEqual(values.shape, (2, 3))
+        np.testing.assert_allclose(fluxes[1], self.release_physics.flame(1).generate_positional_flux(self.locations,
+                                                                                                    0.89))
+        np.testing.assert_allclose(impulses[0], self.release_physics.overpressure_model(0).calc_impulse(self.locations))
+        self.assertTrue(np.all(fluxes[1] > fluxes[0]))
+        self.assertEqual(self.release_physics.heat_flux([]).shape, (2, 0))
+
+    def test_solve_in_processes(self):
+        parallel = ReleasePhysics(self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, leak_sizes=[1, 100])
+        parallel.solve(overpressure=False, n_workers=2)
+        self.assertIsNone(parallel._overpressure_models[0])
+        parallel.solve(leak_indices=[1], n_workers=2)
+        self.assertIsNone(parallel._overpressure_models[0])
+        self.assertIsNotNone(parallel._overpressure_models[1])
+        self.release_physics.solve()
+        np.testing.assert_array_equal(parallel.heat_flux(self.locations), self.release_physics.heat_flux(self.locations))
+        np.testing.assert_array_equal(parallel.overpressure(self.locations)[1],
+                                      self.release_physics.overpressure(self.locations)[1])
+
+    def test_check_inputs(self):
+        self.release_physics.check_inputs(self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, [1, 100])
+        other_fluid = Fluid(species='h2', T=15 + spc.zero_Celsius, P=70 * spc.mega)
+        bad_inputs = [((other_fluid, self.amb_fluid, 0.245 * spc.inch, [1, 100]), {}),
+                      ((self.rel_fluid, self.amb_fluid, 0.5 * spc.inch, [1, 100]), {}),
+                      ((self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, [1, 10]), {}),
+                      ((self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, [1, 100]), {'discharge_coeff': 0.9}),
+                      ((self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, [1, 100]), {'overp_method': 'tnt'})]
+        for args, kwargs in bad_inputs:
+            with self.assertRaises(ValueError):
+                self.release_physics.check_inputs(*args, **kwargs)
+
+    def test_defer_errors(self):
+        failing = FailingReleasePhysics(self.rel_fluid, self.amb_fluid, 0.245 * spc.inch, leak_sizes=[1, 100])
+        with self.assertRaises(ValueError):
+            failing.solve()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            failing.solve(overpressure=False, defer_errors=True)
+        self.assertTrue(any(issubclass(warning.category, PhysicsWarning) for warning in caught))
+        self.assertIsNone(failing._flames[0])
+        self.assertIsNotNone(failing._flames[1])
+        with self.assertRaises(ValueError):
+            failing.heat_flux(self.locations)
+
+    def test_pickle(self):
+        self.release_physics.solve()
+        copied = pickle.loads(pickle.dumps(self.release_physics))
+        np.testing.assert_allclose(copied.flame(1).generate_positional_flux(self.locations, 0.89),
+                                   self.release_physics.flame(1).generate_positional_flux(self.locations, 0.89))
+        np.testing.assert_allclose(copied.overpressure_model(1).calc_overpressure(self.locations),
+                                   self.release_physics.overpressure_model(1).calc_overpressure(self.locations))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,8 @@ Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains
 You should have received a copy of the GNU General Public License along with HyRAM+.
 If not, see https://www.gnu.org/licenses/.
 """
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -146,6 +148,25 @@ class HydrogenTestCase(unittest.TestCase):
             }
         }
 
+        # Inputs of sampling studies with a single uncertain component
+        self.compressor_parameters = {
+            'Compressor': {
+                'leak_sizes': self.leak_sizes,
+                'quantity': 2,
+                'distribution_type': self.leak_mixed_dists,
+                'distribution_parameters': self.leak_mixed_dist_params
+            }
+        }
+        self.study_inputs = dict(species=self.rel_species,
+                                 study_type=self.study_type,
+                                 num_samples=self.num_samples,
+                                 fueling_parameters={},
+                                 component_parameters=self.compressor_parameters,
+                                 location_parameters=self.occupant_location_parameters,
+                                 static_parameters=self.static_parameters,
+                                 uncertainty_type=self.uncertainty_type,
+                                 random_seed=2)
+
     def test_substitute_defaults(self):
         """Check that defaults are properly overwritten"""
         default_dict = {'a': 1, 'b': 2, 'c': 3}
@@ -498,14 +519,6 @@ class HydrogenTestCase(unittest.TestCase):
 
     def test_evaluate_qra_uq(self):
         """Check to ensure sampling study runs successfully"""
-        component_parameters = {
-            'Compressor': {
-                'leak_sizes': self.leak_sizes,
-                'quantity': 2,
-                'distribution_type': self.leak_mixed_dists,
-                'distribution_parameters': self.leak_mixed_dist_params
-            }
-        }
         fueling_parameters = {
             'Nozzle': {
                 'mode': ['Pop-off', 'Failure to close'],
@@ -522,7 +535,7 @@ class HydrogenTestCase(unittest.TestCase):
             study_type=self.study_type,
             num_samples=self.num_samples,
             fueling_parameters=fueling_parameters,
-            component_parameters=component_parameters,
+            component_parameters=self.compressor_parameters,
             location_parameters=location_parameters,
             static_parameters=self.static_parameters,
             uncertainty_type=self.uncertainty_type,
@@ -536,3 +549,60 @@ class HydrogenTestCase(unittest.TestCase):
                          len(all_total_pll_values))
         self.assertEqual(self.num_samples,
                          len(np.unique(all_total_pll_values)))
+
+    def test_create_release_physics(self):
+        """Check that only the models of leak sizes that can end in a jet fire or explosion are solved"""
+        self.static_parameters['ign_probs'] = {'flow_thresholds': [0.125, 6.25],
+                                               'immed_ign_probs': [0, 0, 0],
+                                               'delayed_ign_probs': [0.004, 0.027, 0.12]}
+        release_physics = uncertainty.create_release_physics(self.static_parameters)
+        self.assertTrue(all(flame is None for flame in release_physics._flames))
+        self.assertTrue(all(model is not None for model in release_physics._overpressure_models))
+
+    def test_evaluate_qra_uq_shared_release_physics(self):
+        """Check that sharing the release physics across samples gives the same results"""
+        results, uq_samples = uncertainty.evaluate_qra_uq(**dict(self.study_inputs, num_samples=2, random_seed=1))
+        inputs_per_sample = uncertainty.get_inputs_per_sample(uq_samples, 2)
+        for result, inputs in zip(results, inputs_per_sample):
+            expected = uncertainty.calc_qra_at_distance(inputs, self.static_parameters)
+            self.assertAlmostEqual(result['total_pll'], expected['total_pll'], places=12)
+            np.testing.assert_allclose(result['position_qrads'], expected['position_qrads'], rtol=1e-10)
+            np.testing.assert_allclose(result['position_overps'], expected['position_overps'], rtol=1e-10)
+
+    def test_evaluate_qra_uq_callback(self):
+        """Check that results can be collected as they complete rather than returned"""
+        expected, _ = uncertainty.evaluate_qra_uq(**self.study_inputs, num_cpus=1)
+        total_plls = {}
+        results, _ = uncertainty.evaluate_qra_uq(
+            **self.study_inputs, num_cpus=2, chunksize=2,
+            callback=lambda index, result: total_plls.update({index: result['total_pll']}))
+        self.assertIsNone(results)
+        np.testing.assert_allclose([total_plls[i] for i in range(self.num_samples)],
+                                   [result['total_pll'] for result in expected], rtol=1e-12)
+
+    def test_evaluate_qra_uq_results_dir(self):
+        """Check that results can be written to and read from a directory rather than kept in memory"""
+        expected, samples = uncertainty.evaluate_qra_uq(**self.study_inputs, num_cpus=1)
+        with tempfile.TemporaryDirectory() as results_dir:
+            results, _ = uncertainty.evaluate_qra_uq(**self.study_inputs, num_cpus=2, chunksize=2,
+                                                     results_dir=results_dir, shard_size=3)
+            self.assertEqual(len(results), self.num_samples)
+            np.testing.assert_allclose(results['total_pll'],
+                                       [result['total_pll'] for result in expected], rtol=1e-12)
+            np.testing.assert_allclose(results['position_qrads'],
+                                       [result['position_qrads'] for result in expected], rtol=1e-12)
+            for name, values in results.samples().items():
+                np.testing.assert_allclose(values, samples[name])
+            del results
+
+    def test_evaluate_qra_uq_results_dir_failure(self):
+        """Check that partial results are removed if evaluating the samples fails"""
+        def callback(index, results):
+            if index == 1:
+                raise RuntimeError('sample failed')
+
+        with tempfile.TemporaryDirectory() as results_dir:
+            with self.assertRaises(RuntimeError):
+                uncertainty.evaluate_qra_uq(**self.study_inputs, num_cpus=1, callback=callback,
+                                            results_dir=results_dir, shard_size=1)
+            self.assertEqual(os.listdir(results_dir), [])
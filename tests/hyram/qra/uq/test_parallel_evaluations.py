@@ -0,0 +1,119 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import os
+import unittest
+
+from hyram.qra.uq.parallel_evaluations import ParallelExecutor, parallel_function_evaluations
+
+
+initialized = []
+
+
+def scaled_value(inputs, scale=1):
+    if inputs['value'] < 0:
+        raise ValueError('negative value')
+    return {'value': inputs['value'] * scale, 'pid': os.getpid()}
+
+
+def exit_worker(inputs):
+    if inputs['value'] == 3:
+        os._exit(1)  # as if killed, without reporting an error
+    return inputs['value']
+
+
+def initialize(label):
+    initialized.append(label)
+
+
+class ParallelExecutorTestCase(unittest.TestCase):
+    """Class for unit tests of parallel evaluations"""
+
+    def setUp(self):
+        self.inputs = [{'value': i} for i in range(25)]
+        initialized.clear()
+
+    def test_parallel_function_evaluations(self):
+        for num_cpus in [1, 2]:
+            results = parallel_function_evaluations(scaled_value, self.inputs, num_cpus=num_cpus,
+                                                    additional_inputs={'scale': 2}, chunksize=3)
+            self.assertEqual([result['value'] for result in results], [2 * i for i in range(25)])
+
+    def test_empty(self):
+        self.assertEqual(parallel_function_evaluations(scaled_value, []), [])
+
+    def test_callback(self):
+        collected = {}
+        results = parallel_function_evaluations(scaled_value, self.inputs, num_cpus=2, chunksize=4,
+                                                callback=lambda i, result: collected.update({i: result['value']}))
+        self.assertIsNone(results)
+        self.assertEqual(collected, {i: i for i in range(25)})
+
+    def test_bounded_in_flight(self):
+        consumed = []
+
+        def generate_inputs():
+            for inputs in self.inputs:
+                consumed.append(inputs['value'])
+                yield inputs
+
+        num_completed = 0
+        with ParallelExecutor(scaled_value, num_cpus=2, chunksize=2, max_in_flight=3) as executor:
+            for _ in executor.imap_unordered(generate_inputs()):
+                num_completed += 1
+                self.assertLessEqual(len(consumed) - num_completed, 3 * 2)
+        self.assertEqual(num_completed, 25)
+
+    def test_reuse(self):
+        with ParallelExecutor(scaled_value, num_cpus=2) as executor:
+            first = executor.map(self.inputs)
+            second = executor.map(self.inputs[:5])
+        self.assertEqual([result['value'] for result in second], [result['value'] for result in first[:5]])
+        self.assertLessEqual(len({result['pid'] for result in first + second}), 2)
+        self.assertIsNone(executor._pool)
+
+    def test_stop_early(self):
+        with ParallelExecutor(scaled_value, num_cpus=2, chunksize=2) as executor:
+            results = executor.imap_unordered(self.inputs)
+            next(results)
+            results.close()
+            self.assertEqual(len(executor.map(self.inputs[:3])), 3)
+
+    def test_error(self):
+        inputs = self.inputs + [{'value': -1}]
+        for num_cpus in [1, 2]:
+            with self.assertRaises(ValueError):
+                parallel_function_evaluations(scaled_value, inputs, num_cpus=num_cpus)
+
+    def test_worker_died(self):
+        with ParallelExecutor(exit_worker, num_cpus=2) as executor:
+            with self.assertRaises(RuntimeError):
+                executor.map(self.inputs)
+            self.assertIsNone(executor._pool)
+            # A new pool is started for later evaluations
+            self.assertEqual(executor.map(self.inputs[:3]), [0, 1, 2])
+
+    def test_initializer(self):
+        with ParallelExecutor(scaled_value, num_cpus=1, initializer=initialize, initargs=('warm',)) as executor:
+            executor.map(self.inputs)
+            executor.map(self.inputs)
+        self.assertEqual(initialized, ['warm'])
+        with ParallelExecutor(scaled_value, num_cpus=2, initializer=initialize, initargs=('warm',)) as executor:
+            executor.map(self.inputs)
+        # The initializer runs in the worker processes, not in this one
+        self.assertEqual(initialized, ['warm'])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ParallelExecutor(scaled_value, chunksize=0)
+        with self.assertRaises(ValueError):
+            ParallelExecutor(scaled_value, max_in_flight=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
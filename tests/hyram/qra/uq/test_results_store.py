@@ -0,0 +1,140 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from hyram.qra.uq.results_store import UQResults, UQResultsWriter, extract_qra_fields
+
+
+def make_results(index, num_positions=3, num_leaks=5):
+    """Returns results shaped like those of conduct_analysis, with values based on the sample index"""
+    positions = np.array([(index + i, 0., 1.) for i in range(num_positions)]).T
+    leak_results = []
+    for leak in range(num_leaks):
+        result_dicts = [{'events': index * leak * j, 'pll': 0.1 * j, 'prob': 0.25} for j in range(4)]
+        result_dicts.append({'events': 0, 'pll': 0, 'prob': 1})
+        leak_results.append({'frequency': index + leak, 'result_dicts': result_dicts})
+    return {'total_pll': float(index),
+            'far': 2. * index,
+            'air': 3. * index,
+            'leak_results': leak_results,
+            'positions': positions,
+            'position_qrads': np.full((num_positions, num_leaks), index, dtype=float),
+            'position_overps': np.full((num_positions, num_leaks), -index, dtype=float),
+            'position_impulses': np.full((num_positions, num_leaks), np.nan)}
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+    """Class for unit tests of results store module"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.num_samples = 23
+        # Samples complete out of order, as from parallel evaluations
+        self.order = np.random.default_rng(0).permutation(self.num_samples)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, shard_size=5, samples=None):
+        with UQResultsWriter(self.directory, shard_size=shard_size) as writer:
+            if samples is not None:
+                writer.write_samples(samples)
+            for index in self.order:
+                writer(index, make_results(index))
+        return UQResults(self.directory)
+
+    def test_extract_qra_fields(self):
+        fields = extract_qra_fields(make_results(2))
+        self.assertEqual(fields['total_pll'], 2)
+        np.testing.assert_array_equal(fields['positions'][:, 0], [2, 3, 4])
+        self.assertEqual(np.shape(fields['end_state_frequencies']), (5, 4))
+        self.assertEqual(np.shape(fields['pll_contributions']), (5, 4))
+        no_positions = make_results(2, num_positions=0)
+        self.assertEqual(extract_qra_fields(no_positions)['positions'].shape, (0, 3))
+
+    def test_write_and_read(self):
+        results = self.write()
+        self.assertEqual(len(results), self.num_samples)
+        self.assertIn('position_qrads', results)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'shards')))
+        np.testing.assert_array_equal(results.sample_index, np.arange(self.num_samples))
+        np.testing.assert_array_equal(results['total_pll'], np.arange(self.num_samples))
+        np.testing.assert_array_equal(results['air'], 3 * np.arange(self.num_samples))
+        self.assertIsInstance(results['far'], np.memmap)
+        self.assertEqual(results['position_qrads'].shape, (self.num_samples, 3, 5))
+        np.testing.assert_array_equal(results['position_overps'][7], -7)
+        self.assertTrue(np.all(np.isnan(results['position_impulses'])))
+        np.testing.assert_array_equal(results['leak_frequencies'][4], [4, 5, 6, 7, 8])
+        np.testing.assert_array_equal(results['end_state_frequencies'][3, 2], [0, 6, 12, 18])
+        with self.assertRaises(KeyError):
+            results['not_a_field']
+
+    def test_summary(self):
+        results = self.write(shard_size=100)
+        np.testing.assert_allclose(results.percentiles('far', [0, 50, 100]), [0, 22, 44])
+        self.assertEqual(results.percentiles('position_qrads', 50).shape, (3, 5))
+        summary = results.summary()
+        self.assertEqual(set(summary), {'total_pll', 'far', 'air'})
+        self.assertAlmostEqual(summary['total_pll']['mean'], 11)
+        self.assertAlmostEqual(summary['total_pll']['p50'], 11)
+        self.assertIn('p95', summary['air'])
+
+    def test_samples(self):
+        samples = {'a': np.arange(self.num_samples), 'b': np.ones(self.num_samples)}
+        results = self.write(samples=samples)
+        self.assertEqual(results.sample_names, ['a', 'b'])
+        read_samples = results.samples()
+        np.testing.assert_array_equal(read_samples['a'], samples['a'])
+        np.testing.assert_array_equal(read_samples['b'], samples['b'])
+
+    def test_existing_results(self):
+        self.write()
+        with self.assertRaises(FileExistsError):
+            UQResultsWriter(self.directory)
+
+    def test_existing_shards(self):
+        shard_dir = os.path.join(self.directory, 'shards')
+        os.makedirs(shard_dir)
+        np.savez(os.path.join(shard_dir, 'shard_000000.npz'), sample_index=np.arange(3))
+        with self.assertRaises(FileExistsError):
+            UQResultsWriter(self.directory)
+
+    def test_discard_on_error(self):
+        samples = {'a': np.arange(self.num_samples)}
+        with self.assertRaises(RuntimeError):
+            with UQResultsWriter(self.directory, shard_size=5) as writer:
+                writer.write_samples(samples)
+                for index in self.order[:12]:
+                    writer(index, make_results(index))
+                raise RuntimeError('sample failed')
+        self.assertEqual(os.listdir(self.directory), [])
+        # A new study can then be written to the same directory
+        results = self.write()
+        self.assertEqual(len(results), self.num_samples)
+
+    def test_discard_created_directory(self):
+        directory = os.path.join(self.directory, 'results')
+        writer = UQResultsWriter(directory, shard_size=5)
+        for index in self.order[:7]:
+            writer(index, make_results(index))
+        writer.discard()
+        self.assertFalse(os.path.exists(directory))
+
+    def test_incomplete_results(self):
+        with self.assertRaises(FileNotFoundError):
+            UQResults(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
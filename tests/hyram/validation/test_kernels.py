@@ -0,0 +1,167 @@
+"""
+Copyright 2015-2025 National Technology & Engineering Solutions of Sandia, LLC (NTESS).
+Under the terms of Contract DE-NA0003525 with NTESS, the U.S. Government retains certain rights in this software.
+
+You should have received a copy of the GNU General Public License along with HyRAM+.
+If not, see https://www.gnu.org/licenses/.
+"""
+
+import unittest
+
+import numpy as np
+from scipy.constants import milli, kilo, bar, pi
+
+from hyram.phys import Fluid, Orifice, Jet, Flame, Source, Vent, Enclosure, IndoorRelease
+from hyram.phys._kernels import compiled_kernels
+
+
+def both_backends(func, *args, **kwargs):
+    """
+    Returns func(*args, **kwargs) evaluated using the NumPy governing equations and using the kernels.
+    Without numba, the kernels are run as plain Python, which checks the same code that would be compiled.
+    """
+    enabled = compiled_kernels.enabled
+    try:
+        compiled_kernels.enabled = False
+        expected = func(*args, **kwargs)
+        compiled_kernels.enabled = True
+        calculated = func(*args, **kwargs)
+    finally:
+        compiled_kernels.enabled = enabled
+    return expected, calculated
+
+
+class TestCompiledKernelSwitch(unittest.TestCase):
+    def setUp(self):
+        self.enabled = compiled_kernels.enabled
+
+    def tearDown(self):
+        compiled_kernels.enabled = self.enabled
+
+    def test_default(self):
+        self.assertFalse(compiled_kernels.enabled)
+
+    def test_disable(self):
+        compiled_kernels.disable()
+        self.assertFalse(compiled_kernels.enabled)
+
+    def test_enable(self):
+        if compiled_kernels.available:
+            compiled_kernels.enable()
+            self.assertTrue(compiled_kernels.enabled)
+        else:
+            with self.assertRaises(ImportError):
+                compiled_kernels.enable()
+
+
+class TestJetKernel(unittest.TestCase):
+    """
+    Parity of the jet kernel with Jet._govEqns for the Ruggles and Ekoto (2012) and Han et al. (2013) jets
+    """
+    def setUp(self):
+        self.enabled = compiled_kernels.enabled
+        compiled_kernels.disable()
+        ruggles_air = Fluid(T=296, P=98.37*kilo, species='air')
+        ruggles_gas = Fluid(T=295.4, P=983.2*kilo, species='h2')
+        han_air = Fluid(T=293, P=101325, species='air')
+        self.cases = [(ruggles_gas, Orifice(d=1.5*milli, Cd=0.979), ruggles_air, dict(theta0=pi/2))]
+        for pressure in [100*bar, 400*bar]:
+            self.cases.append((Fluid(T=293, P=pressure, species='h2'), Orifice(d=1*milli), han_air,
+                               dict(theta0=0, Ymin=1e-4)))
+        self.jets = [Jet(gas, orifice, air, **kwargs) for gas, orifice, air, kwargs in self.cases]
+
+    def tearDown(self):
+        compiled_kernels.enabled = self.enabled
+
+    def test_govEqns(self):
+        for jet in self.jets:
+            for i in [0, len(jet.S)//4, len(jet.S)//2, -1]:
+                ind_vars = [jet.__dict__[k][i] for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'theta', 'x', 'y']]
+                for kwargs in [{}, {'numquad':32}]:
+                    expected, calculated = both_backends(jet._govEqns, jet.S[i], ind_vars, **kwargs)
+                    np.testing.assert_allclose(calculated, expected, rtol=1e-8, atol=1e-12)
+
+    @unittest.skipUnless(compiled_kernels.available, 'numba is not installed')
+    def test_solve(self):
+        for (gas, orifice, air, kwargs), expected in zip(self.cases, self.jets):
+            compiled_kernels.enable()
+            calculated = Jet(gas, orifice, air, **kwargs)
+            for k in ['V_cl', 'B', 'rho_cl', 'Y_cl', 'x', 'y']:
+                np.testing.assert_allclose(np.interp(expected.S, calculated.S, calculated.__dict__[k]),
+                                           expected.__dict__[k], rtol=1e-4)
+
+
+class TestFlameKernel(unittest.TestCase):
+    """
+    Parity of the flame kernel with Flame._govEqns for the Ekoto et al. (2014) flames
+    """
+    def setUp(self):
+        self.enabled = compiled_kernels.enabled
+        compiled_kernels.disable()
+        self.cases = []
+        for amb_pressure, diameter, pressure, temp in zip(np.array([1.022, 1.011])*bar,
+                                                          np.array([20.9, 52.5])*milli,
+                                                          np.array([59.8, 62.1])*bar,
+                                                          [308.7, 287.8]):
+            air = Fluid(species='air', T=280, P=amb_pressure)
+            gas = Fluid(species='H2', T=temp, P=pressure + amb_pressure)
+            self.cases.append((gas, Orifice(d=diameter), air))
+        self.flames = [Flame(gas, orifice, air, y0=3.25) for gas, orifice, air in self.cases]
+
+    def tearDown(self):
+        compiled_kernels.enabled = self.enabled
+
+    def test_govEqns(self):
+        for flame in self.flames:
+            for i in [0, len(flame.S)//4, len(flame.S)//2, -1]:
+                ind_vars = [flame.__dict__[k][i] for k in ['V_cl', 'B', 'theta', 'f_cl', 'x', 'y']]
+                expected, calculated = both_backends(flame._govEqns, flame.S[i], ind_vars)
+                np.testing.assert_allclose(calculated, expected, rtol=1e-8, atol=1e-12)
+
+    @unittest.skipUnless(compiled_kernels.available, 'numba is not installed')
+    def test_solve(self):
+        for (gas, orifice, air), expected in zip(self.cases, self.flames):
+            compiled_kernels.enable()
+            calculated = Flame(gas, orifice, air, y0=3.25)
+            for k in ['V_cl', 'B', 'f_cl', 'x', 'y']:
+                np.testing.assert_allclose(np.interp(expected.S, calculated.S, calculated.__dict__[k]),
+                                           expected.__dict__[k], rtol=1e-3)
+            np.testing.assert_allclose(calculated.Qrad_multi(26, 1.75, 0, 0.943),
+                                       expected.Qrad_multi(26, 1.75, 0, 0.943), rtol=1e-5)
+
+
+class TestLayerKernel(unittest.TestCase):
+    """
+    Parity of the layer kernel with LayeringJet._gov_eqns for the vented Ekoto et al. (2012) release
+    """
+    def setUp(self):
+        self.enabled = compiled_kernels.enabled
+        compiled_kernels.disable()
+        ambient = Fluid(species='air', T=297, P=101325)
+        source = Source(.00363, Fluid(species='H2', P=13450000, T=297))
+        ceil_vent = Vent(0.1, 2.42, 1, 6.5/60)
+        floor_vent = Vent(0.0, 0.0, 1, 6.5/60)
+        self.enclosure = Enclosure(2.72, 16.722, .2495, ceil_vent, floor_vent, 2.1255)
+        self.args = (source, Orifice(.00356, Cd=0.75), ambient, self.enclosure)
+        self.kwargs = dict(tmax=20.5, release_area=0.0171, theta0=0, verbose=False)
+        self.release = IndoorRelease(*self.args, **self.kwargs)
+
+    def tearDown(self):
+        compiled_kernels.enabled = self.enabled
+
+    def test_gov_eqns(self):
+        for plume in self.release.plumes[::5]:
+            for Vol, c in zip(self.release.Vol_layer[1::10], self.release.x_layer[1::10]):
+                expected, calculated = both_backends(plume._gov_eqns, 0, [Vol, c], self.enclosure)
+                np.testing.assert_allclose(calculated, expected, rtol=1e-10, atol=1e-15)
+
+    @unittest.skipUnless(compiled_kernels.available, 'numba is not installed')
+    def test_layer_accumulation(self):
+        compiled_kernels.enable()
+        release = IndoorRelease(*self.args, **self.kwargs)
+        np.testing.assert_allclose(release.x_layer, self.release.x_layer, rtol=1e-4, atol=1e-8)
+        np.testing.assert_allclose(release.dP_tot, self.release.dP_tot, rtol=1e-4, atol=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()